@@ -0,0 +1,379 @@
+"""Dataset admin (Kelola Excel) dengan jalur tambah baris O(1) dan log perubahan editor
+
+Baris baru ditampung di buffer dan NIM dicek lewat hash set, sehingga menambah
+mahasiswa tidak menyalin maupun menggabungkan seluruh DataFrame. Tampilan per
+halaman, opsi filter, statistik, dan pencarian membaca data dasar + buffer tanpa
+menggabungkannya; buffer baru digabung saat data editor, export, atau simpan
+membutuhkan DataFrame lengkap. Perubahan dari
+st.data_editor disimpan sebagai log (sel yang diedit, baris tambahan, baris
+terhapus) yang diambil dari edit state editor; DataFrame dasar tidak diubah dan
+log baru diterapkan sekaligus saat DataFrame lengkap dibutuhkan (export, simpan).
+Pencarian Nama/NIM memakai indeks trigram (search_index.py) yang dibuat sekali
+per dataset lalu diperbarui saat baris ditambah atau log edit diterapkan.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from frame_dtypes import append_rows, fits_float32, widen_column
+from search_index import SearchIndex, normalize_query, search_text, search_texts
+from user_directory import normalize_id
+
+# Setiap generasi dataset mendapat key editor baru, sehingga edit state lama
+# (posisi baris terhadap frame sebelumnya) tidak pernah terbaca ulang
+_generations = itertools.count()
+
+# Kolom yang dicari kotak "Cari berdasarkan Nama/NIM"
+SEARCH_COLUMNS = ('Nama Lengkap', 'NIM')
+
+
+def _set_cells(column, positions, values):
+    """Salinan kolom dengan nilai baru di posisi tertentu"""
+    column = column.copy()
+    if column.dtype == np.float32 and not fits_float32(values):
+        # float32 menerima nilai apa pun tanpa error, jadi nilai yang tidak muat dilebarkan dulu
+        column = widen_column(column)
+    try:
+        column.iloc[positions] = values
+        return column
+    except (TypeError, ValueError):
+        # Nilai tidak cocok dengan dtype (mis. sel int dikosongkan, prodi baru di kolom kategori):
+        # lebarkan dtype hemat tanpa mengubah nilai, lalu naikkan dtype seperti concat
+        column = widen_column(column)
+        updates = pd.Series([np.nan if value is None else value for value in values],
+                            index=column.index[positions])
+        return column.where(~column.index.isin(updates.index), updates.reindex(column.index))
+
+
+class AdminDataset:
+    """DataFrame dasar (tidak pernah diubah di tempat) + buffer baris baru + log edit + set NIM
+
+    DataFrame dasar boleh berasal dari cache upload bersama; penggabungan
+    dengan buffer maupun log edit selalu membuat frame baru.
+    """
+
+    def __init__(self, df, id_column='NIM'):
+        self.id_column = id_column
+        self._original = df
+        self._load(df)
+
+    def _load(self, df):
+        self._set_base(df)
+        self._buffer = []
+        self._ids = self._collect_ids(df)
+        # Indeks pencarian dibuat saat pencarian pertama; _row_ids = ID indeks per posisi
+        # _base lalu buffer, _indexed_buffer = jumlah baris buffer yang sudah masuk indeks
+        self._search = None
+        self._row_ids = None
+        self._indexed_buffer = 0
+        self._clear_edits()
+
+    def _set_base(self, df):
+        self._base = df
+        # Agregat per kolom atas data dasar (unique, value_counts, ringkasan numerik)
+        self._base_stats = {}
+
+    def _clear_edits(self):
+        self._edited = {}
+        self._added = []
+        self._deleted = []
+        self._edit_ids = set()
+        self._removed_ids = set()
+        self._frame = None
+        self.generation = next(_generations)
+
+    def _collect_ids(self, df):
+        if self.id_column not in df.columns:
+            return set()
+        # Sama seperti pengecekan lama: NIM dibandingkan sebagai string (lihat normalize_id)
+        return set(df[self.id_column].dropna().astype(str).str.strip().tolist())
+
+    def __len__(self):
+        return len(self._base) + len(self._buffer) + len(self._added) - len(self._deleted)
+
+    @property
+    def columns(self):
+        return self._base.columns
+
+    @property
+    def is_merged(self):
+        """Data lengkap bisa dibaca tanpa menggabungkan buffer (buffer kosong atau ada log edit)"""
+        return not self._buffer or self.has_edits
+
+    @property
+    def has_edits(self):
+        """Ada perubahan dari data editor yang belum diterapkan ke DataFrame dasar"""
+        return bool(self._edited or self._added or self._deleted)
+
+    @property
+    def is_modified(self):
+        """Data berbeda dari data yang dimuat (edit, baris baru, atau log yang sudah diterapkan)"""
+        return self.has_edits or bool(self._buffer) or self._base is not self._original
+
+    def edit_summary(self):
+        """Jumlah sel diedit, baris ditambah, dan baris dihapus di log edit"""
+        return {
+            'edited_cells': sum(len(cells) for cells in self._edited.values()),
+            'added_rows': len(self._added),
+            'deleted_rows': len(self._deleted),
+        }
+
+    def contains_id(self, id_value):
+        """NIM sudah ada di dataset (O(1))"""
+        id_value = normalize_id(id_value)
+        if id_value in self._edit_ids:
+            return True
+        return id_value in self._ids and id_value not in self._removed_ids
+
+    def append(self, record):
+        """Tambah satu baris (dict kolom -> nilai) tanpa menyalin data yang sudah ada
+
+        ValueError jika NIM sudah ada di dataset.
+        """
+        id_value = record.get(self.id_column)
+        if id_value is not None and self.contains_id(id_value):
+            raise ValueError(f"{self.id_column} {normalize_id(id_value)} sudah ada dalam data")
+        # Log edit mengacu ke posisi baris frame editor saat ini, jadi diterapkan dulu
+        if self.has_edits:
+            self.commit_edits()
+        if id_value is not None:
+            self._ids.add(normalize_id(id_value))
+        self._buffer.append(dict(record))
+
+    def _buffer_frame(self, records, start):
+        return pd.DataFrame(records, index=pd.RangeIndex(start, start + len(records)))
+
+    def editor_frame(self):
+        """Frame untuk st.data_editor: data dasar + buffer, tanpa log edit
+
+        Edit state editor dihitung terhadap frame ini, jadi frame harus tetap sama
+        selama log edit masih dipakai.
+        """
+        if self._buffer:
+            self._sync_search()
+            self._set_base(append_rows(self._base, pd.DataFrame(self._buffer)))
+            self._buffer = []
+            self._indexed_buffer = 0
+        return self._base
+
+    def track_edits(self, editor_state):
+        """Catat edit state st.data_editor (edited_rows, added_rows, deleted_rows)
+
+        Hanya menyalin perubahannya, jadi biayanya sebanding dengan jumlah
+        perubahan, bukan jumlah baris.
+        """
+        edited = {int(pos): dict(cells) for pos, cells in editor_state.get("edited_rows", {}).items()}
+        added = [dict(row) for row in editor_state.get("added_rows", [])]
+        deleted = sorted(int(pos) for pos in editor_state.get("deleted_rows", []))
+        if edited == self._edited and added == self._added and deleted == self._deleted:
+            return False
+
+        self._edited, self._added, self._deleted = edited, added, deleted
+        self._frame = None
+        # NIM yang hilang (baris dihapus / NIM diganti) dan NIM baru dari editor
+        self._removed_ids = set()
+        self._edit_ids = set()
+        if self.id_column in self._base.columns:
+            base_ids = self._base[self.id_column]
+            changed = set(deleted) | {pos for pos, cells in edited.items() if self.id_column in cells}
+            for pos in changed:
+                if pos < len(base_ids) and not pd.isna(base_ids.iat[pos]):
+                    self._removed_ids.add(normalize_id(base_ids.iat[pos]))
+            for pos, cells in edited.items():
+                if cells.get(self.id_column) is not None and pos not in deleted:
+                    self._edit_ids.add(normalize_id(cells[self.id_column]))
+            for row in added:
+                if row.get(self.id_column) is not None:
+                    self._edit_ids.add(normalize_id(row[self.id_column]))
+        return True
+
+    def _apply_edits(self):
+        df = self._base.copy(deep=False)
+        by_column = {}
+        for pos, cells in self._edited.items():
+            for column, value in cells.items():
+                if column in df.columns:
+                    by_column.setdefault(column, {})[pos] = value
+        for column, cells in by_column.items():
+            df[column] = _set_cells(df[column], list(cells), list(cells.values()))
+        if self._deleted:
+            df = df.drop(df.index[self._deleted])
+        if self._added:
+            return append_rows(df, pd.DataFrame(self._added, columns=df.columns))
+        return df.reset_index(drop=True) if self._deleted else df
+
+    def to_frame(self):
+        """DataFrame lengkap; buffer dan log edit diterapkan sekali lalu hasilnya dipakai ulang"""
+        if not self.has_edits:
+            return self.editor_frame()
+        if self._frame is None:
+            self._frame = self._apply_edits()
+        return self._frame
+
+    def commit_edits(self):
+        """Terapkan log edit ke DataFrame dasar dan mulai generasi editor baru"""
+        if self.has_edits:
+            df = self.to_frame()
+            if self._search is not None:
+                self._commit_search()
+            self._set_base(df)
+            self._ids = self._collect_ids(df)
+            self._clear_edits()
+
+    def take(self, positions):
+        """Baris to_frame() di posisi tertentu tanpa menggabungkan buffer ke seluruh data"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if self.is_merged:
+            return self.to_frame().iloc[positions]
+        n_base = len(self._base)
+        in_base = positions[positions < n_base]
+        base_rows = self._base.iloc[in_base]
+        buffered = [self._buffer[pos - n_base] for pos in positions[positions >= n_base]]
+        if not buffered:
+            return base_rows
+        # Posisi diminta urut naik (halaman/hasil filter), jadi baris buffer selalu di akhir
+        return append_rows(base_rows, pd.DataFrame(buffered)).set_axis(pd.Index(positions))
+
+    def match(self, column, value):
+        """Posisi baris (urut naik) yang nilai kolomnya sama dengan value, tanpa menggabungkan buffer"""
+        if self.is_merged:
+            return np.flatnonzero((self.to_frame()[column] == value).to_numpy())
+        n_base = len(self._base)
+        buffered = [n_base + i for i, record in enumerate(self._buffer) if record.get(column) == value]
+        return np.concatenate([np.flatnonzero((self._base[column] == value).to_numpy()),
+                               np.array(buffered, dtype=np.int64)])
+
+    def _base_stat(self, key, compute):
+        if key not in self._base_stats:
+            self._base_stats[key] = compute(self._base)
+        return self._base_stats[key]
+
+    def _buffer_column(self, column):
+        return pd.Series([record.get(column) for record in self._buffer], dtype=object)
+
+    def unique(self, column):
+        """Nilai unik kolom (urut kemunculan) atas data lengkap; hasil data dasar di-cache"""
+        if self.is_merged:
+            return list(self.to_frame()[column].unique())
+        values = self._base_stat(('unique', column), lambda df: list(df[column].unique()))
+        seen = set(values)
+        extra = [value for value in dict.fromkeys(self._buffer_column(column).tolist()) if value not in seen]
+        return values + extra
+
+    def value_counts(self, column):
+        """Jumlah baris per nilai kolom atas data lengkap; hasil data dasar di-cache"""
+        if self.is_merged:
+            return self.to_frame()[column].value_counts()
+        counts = dict(self._base_stat(('value_counts', column), lambda df: df[column].value_counts()))
+        for value in self._buffer_column(column).dropna():
+            counts[value] = counts.get(value, 0) + 1
+        return pd.Series(counts, dtype=np.int64, name='count').sort_values(ascending=False, kind='stable')
+
+    def numeric_summary(self, column):
+        """(rata-rata, minimum, maksimum) kolom numerik atas data lengkap; hasil data dasar di-cache"""
+        def summarize(values):
+            values = widen_column(pd.to_numeric(values, errors='coerce')).dropna()
+            return len(values), float(values.sum()), values.min(), values.max()
+
+        if self.is_merged:
+            count, total, minimum, maximum = summarize(self.to_frame()[column])
+        else:
+            parts = [self._base_stat(('numeric', column), lambda df: summarize(df[column])),
+                     summarize(self._buffer_column(column))]
+            parts = [part for part in parts if part[0]]
+            count = sum(part[0] for part in parts)
+            total = sum(part[1] for part in parts)
+            minimum = min((part[2] for part in parts), default=np.nan)
+            maximum = max((part[3] for part in parts), default=np.nan)
+        return (total / count if count else np.nan), minimum, maximum
+
+    @property
+    def search_columns(self):
+        return [column for column in SEARCH_COLUMNS if column in self._base.columns]
+
+    def _record_text(self, record):
+        return search_text(*(record.get(column) if column in self.search_columns else None
+                             for column in SEARCH_COLUMNS))
+
+    def _edited_text(self, pos, cells):
+        """Teks pencarian baris dasar di posisi pos setelah edit cells, atau None jika kolom cari tidak diedit"""
+        if not any(column in cells for column in self.search_columns):
+            return None
+        record = {column: cells[column] if column in cells else self._base[column].iat[pos]
+                  for column in self.search_columns}
+        return self._record_text(record)
+
+    def _search_index(self):
+        if self._search is None:
+            base = self._base
+            self._search = SearchIndex(search_texts(*(base[column] if column in self.search_columns else None
+                                                      for column in SEARCH_COLUMNS)))
+            self._row_ids = np.arange(len(base), dtype=np.int64)
+            self._indexed_buffer = 0
+        self._sync_search()
+        return self._search
+
+    def _sync_search(self):
+        """Masukkan baris buffer yang belum terindeks; posisinya mengikuti data dasar"""
+        if self._search is None or self._indexed_buffer == len(self._buffer):
+            return
+        records = self._buffer[self._indexed_buffer:]
+        new_ids = self._search.add(self._record_text(record) for record in records)
+        self._row_ids = np.concatenate([self._row_ids, new_ids])
+        self._indexed_buffer = len(self._buffer)
+
+    def _commit_search(self):
+        """Perbarui indeks pencarian dengan log edit yang sedang diterapkan ke data dasar"""
+        for pos, cells in self._edited.items():
+            text = self._edited_text(pos, cells)
+            if text is not None and pos not in self._deleted:
+                self._search.update(int(self._row_ids[pos]), text)
+        self._search.remove(self._row_ids[self._deleted])
+        new_ids = self._search.add(self._record_text(row) for row in self._added)
+        self._row_ids = np.concatenate([np.delete(self._row_ids, self._deleted), new_ids])
+
+    def search(self, query):
+        """Posisi baris to_frame() (urut naik) yang Nama Lengkap/NIM-nya mengandung query
+
+        None jika dataset tidak punya kolom Nama Lengkap maupun NIM.
+        """
+        if not self.search_columns:
+            return None
+        index = self._search_index()
+        # ID hasil indeks -> posisi di data dasar + buffer (_row_ids selalu urut naik)
+        positions = np.searchsorted(self._row_ids, index.search(query))
+        if not self.has_edits:
+            return positions
+
+        # Log edit yang belum diterapkan: baris terhapus/diedit dicek ulang, baris tambahan dicek langsung
+        query = normalize_query(query)
+        deleted = np.array(self._deleted, dtype=np.int64)
+        changed = {pos: text for pos, cells in self._edited.items()
+                   if (text := self._edited_text(pos, cells)) is not None}
+        positions = positions[~np.isin(positions, np.concatenate([deleted, np.array(list(changed), dtype=np.int64)]))]
+        edited_hits = [pos for pos, text in changed.items() if query in text and pos not in self._deleted]
+        positions = np.sort(np.concatenate([positions, np.array(edited_hits, dtype=np.int64)]))
+        positions = positions - np.searchsorted(deleted, positions)
+
+        start = len(self._base) - len(self._deleted)
+        added_hits = [start + i for i, row in enumerate(self._added) if query in self._record_text(row)]
+        return np.concatenate([positions, np.array(added_hits, dtype=np.int64)])
+
+    def tail(self, n=5):
+        """n baris terakhir tanpa menggabungkan seluruh dataset"""
+        if self.has_edits:
+            return self.to_frame().tail(n)
+        if n <= 0:
+            return self._base.iloc[:0]
+        if len(self._buffer) >= n:
+            return self._buffer_frame(self._buffer[-n:], len(self) - n)
+        base_tail = self._base.iloc[max(len(self._base) - (n - len(self._buffer)), 0):]
+        if not self._buffer:
+            return base_tail
+        start = len(self._base) - len(base_tail)
+        return append_rows(base_tail, pd.DataFrame(self._buffer)).set_axis(pd.RangeIndex(start, len(self)))
+
+    def reset(self):
+        """Buang semua perubahan (log edit dan baris baru) dan kembali ke data yang dimuat"""
+        self._load(self._original)
@@ -1,12 +1,84 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import io
+import os
+import time
 from datetime import datetime
+from excel_io import (
+    UPLOAD_EXTENSIONS, UPLOAD_SCHEMA, XLSX_MIME, iter_upload_chunks, read_upload, upload_format,
+    upload_row_count, write_xlsx
+)
+from tree_inference import compile_forest
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache, input_hash, prediction_key
+from admin_dataset import AdminDataset
+from chart_data import box_figure, histogram_figure, scatter_figure
+from datastore import Datastore
+from export_cache import ExportCache, frame_version
+from frame_dtypes import STUDENT_DTYPES, compact_frame, memory_report
+from precompute_predictions import (
+    INPUT_COLUMNS as PRECOMPUTED_INPUT_COLUMNS,
+    PRECOMPUTED_PATH,
+    load_table,
+)
+from sidecar_cache import read_excel_cached
+from result_index import BatchResultIndex
+from upload_cache import UploadCache
+from user_directory import UserDirectory, file_version
+from prediction_engine import (
+    PARALLEL_MIN_ROWS,
+    BatchResultStore,
+    BatchSummary,
+    SharedBatchScorer,
+    default_worker_count,
+    predict_batch_frame,
+    predict_graduation_batch,
+)
+
+# Manifest versi model (model, encoder, fitur, mapping); lihat model_registry.py
+MODEL_MANIFEST_PATH = 'model_registry.json'
+
+# File data login per role: (nama file, kolom ID)
+USER_FILES = {
+    "mahasiswa": ("login_mahasiswa.xlsx", "NIM"),
+    "dosen": ("login_dosen.xlsx", "NIDN"),
+    "prodi": ("login_prodi.xlsx", "Kode_Prodi"),
+}
+
+# Backend inferensi prediksi individual: 'sklearn' (default) atau 'compiled'
+PREDICTION_BACKEND = os.environ.get('PREDICTION_BACKEND', 'sklearn')
+
+# Cache hasil prediksi individual: jumlah entri maksimum dan umur entri (detik)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', '10000'))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', '3600'))
+
+# Batas titik per chart scatter/box yang dikirim ke browser (lihat chart_data.py)
+CHART_MAX_POINTS = int(os.environ.get('CHART_MAX_POINTS', '5000'))
+
+# Pilihan jumlah baris per halaman pada tabel hasil batch dan hasil pencarian Kelola Excel
+BATCH_PAGE_SIZES = [25, 50, 100, 500]
+SEARCH_PAGE_SIZES = BATCH_PAGE_SIZES
+
+# Cache upload hasil parsing (berdasarkan hash isi file): batas memori dalam MB
+UPLOAD_CACHE_MB = int(os.environ.get('UPLOAD_CACHE_MB', '512'))
+# Kunci df.attrs untuk laporan memori upload (dihitung sekali saat parsing)
+UPLOAD_MEMORY_ATTR = 'upload_memory_report'
+
+# Jumlah baris preview di tab Export Data (data lengkap hanya dibentuk saat export)
+EXPORT_PREVIEW_ROWS = 100
+
+# Export Excel dengan jumlah baris di atas batas ini ditulis ke file sementara, bukan memori
+EXPORT_SPOOL_ROWS = int(os.environ.get('EXPORT_SPOOL_ROWS', '50000'))
+
+# Cache file export yang sudah dibuat (dibuat saat download diklik): batas memori dalam MB
+EXPORT_CACHE_MB = int(os.environ.get('EXPORT_CACHE_MB', '64'))
+
+# Database SQLite untuk data pengguna, mahasiswa, prediksi, CPL/CPMK, transkrip, dan kehadiran
+DATASTORE_PATH = os.environ.get('DATASTORE_PATH', 'akademik.db')
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -16,43 +88,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-if 'cpmk_data' not in st.session_state:
-    st.session_state.cpmk_data = {
-        'Kode_MK': ['MK101', 'MK101', 'MK101', 'MK102', 'MK102', 'MK103', 'MK103'],
-        'Nama_MK': ['Pemrograman Dasar', 'Pemrograman Dasar', 'Pemrograman Dasar',
-                   'Struktur Data', 'Struktur Data', 'Basis Data', 'Basis Data'],
-        'Kode_CPMK': ['CPMK1', 'CPMK2', 'CPMK3', 'CPMK1', 'CPMK2', 'CPMK1', 'CPMK2'],
-        'Deskripsi_CPMK': [
-            'Mampu membuat program sederhana', 
-            'Mampu memahami struktur kontrol',
-            'Mampu menggunakan fungsi',
-            'Mampu mengimplementasikan struktur data linear',
-            'Mampu menganalisis kompleksitas algoritma',
-            'Mampu merancang basis data',
-            'Mampu mengimplementasikan query SQL'
-        ],
-        'Pencapaian_Rata2': [85, 78, 82, 75, 70, 88, 85],
-        'Target': [80, 80, 80, 75, 75, 85, 85]
-    }
-
-if 'cpl_data' not in st.session_state:
-    st.session_state.cpl_data = {
-        'Kode_CPL': ['CPL1', 'CPL2', 'CPL3', 'CPL4'],
-        'Deskripsi_CPL': [
-            'Mampu mengembangkan perangkat lunak',
-            'Mampu menganalisis kebutuhan sistem',
-            'Mampu bekerja dalam tim',
-            'Mampu berkomunikasi efektif'
-        ],
-        'Kontribusi_CPMK': [
-            'CPMK1 (MK101), CPMK1 (MK102), CPMK1 (MK103)',
-            'CPMK2 (MK101), CPMK2 (MK102)',
-            'CPMK3 (MK101)',
-            'CPMK2 (MK103)'
-        ],
-        'Tingkat_Pencapaian': [82, 76, 85, 83]
-    }
-
 # Initialize session state
 if "logged_in" not in st.session_state:
     st.session_state["logged_in"] = False
@@ -160,28 +195,18 @@ def login(nama_user, id_user, selected_role):
         st.session_state["user_id"] = "00000"
         return True
 
-    # Mahasiswa
-    if selected_role == "mahasiswa":
-        df_users = load_login_user_data("login_mahasiswa.xlsx", id_column="NIM")
-    elif selected_role == "dosen":
-        df_users = load_login_user_data("login_dosen.xlsx", id_column="NIDN")
-    elif selected_role == "prodi":
-        df_users = load_login_user_data("login_prodi.xlsx", id_column="Kode_Prodi")
-    else:
+    if selected_role not in USER_FILES:
         return False
     
-    # Cari user di file
-    user_row = df_users[
-        (df_users["Nama Lengkap"].str.strip().str.lower() == nama_user) &
-        (df_users[df_users.columns[1]].astype(str) == id_user)  # Kolom ke-2 = NIM atau NIDN
-    ]
+    # Cari user melalui indeks (nama, ID) tanpa query atau pemindaian tabel
+    user_record = get_user_directory(selected_role).lookup(nama_user, id_user)
     
-    if not user_row.empty:
+    if user_record is not None:
         st.session_state["logged_in"] = True
-        st.session_state["user_name"] = user_row.iloc[0]["Nama Lengkap"]
+        st.session_state["user_name"] = user_record["Nama Lengkap"]
         st.session_state["user_role"] = selected_role.capitalize()
+        # Sesi hanya menyimpan kunci pengguna; tabel pengguna tetap di UserDirectory bersama
         st.session_state["user_nim"] = id_user
-        st.session_state["df_users"] = df_users  
         return True
     else:
         return False
@@ -191,40 +216,86 @@ def logout():
     st.session_state["logged_in"] = False
     st.session_state["user_name"] = ""
     st.session_state["user_role"] = ""
-    st.session_state["batch_results"] = None
+    st.session_state.pop("user_nim", None)
+    clear_batch_results()
+
+# Artefak model dimuat sekali per proses (cache_resource), tanpa pickle ulang per pemanggil
+@st.cache_resource
+def get_model_registry():
+    """Registry versi model bersama untuk seluruh sesi"""
+    return ModelRegistry(MODEL_MANIFEST_PATH)
+
+@st.cache_resource
+def get_prediction_cache():
+    """Cache hasil prediksi individual, dipakai bersama antar sesi"""
+    return PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+
+@st.cache_resource
+def get_upload_cache():
+    """Cache DataFrame upload berdasarkan hash isi file, dipakai bersama antar sesi"""
+    return UploadCache(max_bytes=UPLOAD_CACHE_MB * 2**20)
+
+def read_upload_cached(uploaded_file):
+    """Baca file upload sekali per isi file; rerun dan pengguna lain memakai hasil yang sama
+
+    Mengembalikan (df, dari_cache). df dibagikan antar sesi sehingga tidak boleh diubah di tempat,
+    dan sudah memakai dtype hemat memori (STUDENT_DTYPES) sehingga cache memuat lebih banyak file.
+    """
+    return get_upload_cache().get_or_parse(uploaded_file, parse_upload, upload_format(uploaded_file))
+
+def parse_upload(file):
+    """Parse file upload ke dtype hemat memori; laporan memorinya dihitung sekali di sini
+    dan disimpan di df.attrs[UPLOAD_MEMORY_ATTR] bersama frame yang di-cache"""
+    df = read_upload(file, dtypes=STUDENT_DTYPES)
+    df.attrs[UPLOAD_MEMORY_ATTR] = memory_report({"upload": df}).iloc[0].to_dict()
+    return df
+
+@st.cache_resource
+def get_export_cache():
+    """Cache isi file export berdasarkan versi data dan opsi, dipakai bersama antar sesi"""
+    return ExportCache(max_bytes=EXPORT_CACHE_MB * 2**20)
+
+def deferred_xlsx(key, build_sheets, n_rows=0):
+    """Data st.download_button yang membuat XLSX hanya saat diklik, lalu disimpan di cache export
+
+    build_sheets mengembalikan dict sheet untuk write_xlsx. Fungsi ini dijalankan
+    di thread terpisah sehingga tidak boleh memakai st.session_state.
+    """
+    spool = n_rows > EXPORT_SPOOL_ROWS
+    return get_export_cache().deferred(key, lambda: write_xlsx(build_sheets(), spool=spool))
+
+def session_frame_version(name, df, source_version):
+    """frame_version(df) yang dihitung sekali per source_version lalu disimpan di session state
+
+    Untuk frame yang dibentuk ulang setiap rerun dari sumber yang sama, sehingga kunci
+    cache export tidak meng-hash seluruh isi frame di setiap rerun.
+    """
+    state_key = f"frame_version_{name}"
+    cached = st.session_state.get(state_key)
+    if cached is None or cached[0] != source_version:
+        cached = (source_version, frame_version(df))
+        st.session_state[state_key] = cached
+    return cached[1]
+
+def get_model_artifacts():
+    """ModelArtifacts versi aktif; reload di background jika manifest atau file .pkl berubah"""
+    return get_model_registry().current()
 
-# Cache untuk loading model
-@st.cache_data
 def load_model_and_encoders():
     """Load model dan encoder yang sudah dilatih"""
     try:
-        # Load model
-        with open('random_forest_graduation_model.pkl', 'rb') as f:
-            model = pickle.load(f)
-        
-        # Load label encoder
-        with open('prodi_label_encoder.pkl', 'rb') as f:
-            label_encoder = pickle.load(f)
-        
-        # Load feature names
-        with open('feature_names.pkl', 'rb') as f:
-            feature_names = pickle.load(f)
-        
-        # Load prodi mapping
-        with open('prodi_mapping.pkl', 'rb') as f:
-            prodi_mapping = pickle.load(f)
-        
-        return model, label_encoder, feature_names, prodi_mapping
+        return get_model_artifacts().as_tuple()
     
     except FileNotFoundError as e:
         st.error(f"File model tidak ditemukan: {e}")
         st.error("Pastikan file model sudah diupload ke direktori aplikasi")
         return None, None, None, None
     
-@st.cache_data
 def load_login_user_data(filename, id_column="NIM"):
+    """Baca file login (layout Excel) untuk diimpor ke database"""
     try:
-        df = pd.read_excel(filename)
+        # Sidecar kolom .npy menghindari parsing XLSX ulang saat file tidak berubah
+        df = read_excel_cached(filename)
         if id_column not in df.columns:
             raise ValueError("Kolom ID tidak ditemukan di file Excel")
         return df
@@ -232,169 +303,250 @@ def load_login_user_data(filename, id_column="NIM"):
         st.error(f"Gagal memuat data login: {e}")
         return pd.DataFrame(columns=["Nama Lengkap", id_column])
 
-def calculate_engineered_features(ipk, nilai_mk, kehadiran, tugas, jumlah_sks, lama_studi):
-    """Hitung fitur-fitur yang di-engineer"""
-    academic_performance = (ipk * 0.6) + (nilai_mk * 0.4 / 100)
-    engagement_score = (kehadiran * 0.7) + (tugas * 0.3)
-    study_efficiency = ipk / lama_studi if lama_studi > 0 else 0
-    sks_per_semester = jumlah_sks / lama_studi if lama_studi > 0 else 0
-    
-    return academic_performance, engagement_score, study_efficiency, sks_per_semester
+@st.cache_resource
+def get_datastore():
+    """Database bersama untuk seluruh sesi; diisi dari file Excel lama saat pertama dibuat"""
+    store = Datastore(DATASTORE_PATH)
+    seed_datastore(store)
+    return store
+
+def seed_datastore(store):
+    """Impor awal file login dan data contoh prodi, masing-masing sekali seumur database
+
+    Setelah itu database adalah sumber data utama: perubahan file login tidak diimpor
+    otomatis, hanya lewat tombol impor di panel Database (Pengaturan Sistem).
+    """
+    for role, (filename, id_column) in USER_FILES.items():
+        if os.path.exists(filename):
+            store.seed_once(f"login_{role}", lambda s, role=role: import_login_file(s, role))
+    store.seed_once("prodi_sample", lambda s: import_prodi_data(s, load_sample_prodi_data()))
+
+@st.cache_resource(max_entries=8)
+def _build_user_directory(role, version):
+    """Bangun indeks pengguna sekali per versi tabel users/students, dipakai bersama antar sesi"""
+    filename, id_column = USER_FILES[role]
+    return UserDirectory(get_datastore().users_frame(role, id_column), id_column)
+
+def get_user_directory(role):
+    """Indeks pengguna satu role, dibangun ulang otomatis jika data pengguna di database berubah"""
+    return _build_user_directory(role, get_datastore().users_version())
+
+def import_login_file(store, role):
+    """Impor file login satu role; jumlah baris, atau False jika file kosong/gagal dibaca"""
+    filename, id_column = USER_FILES[role]
+    df = load_login_user_data(filename, id_column)
+    if df.empty:
+        return False
+    return store.import_users(role, df, id_column)
+
+def import_prodi_data(store, prodi_data):
+    """Tulis tabel transkrip, kehadiran, CPMK, dan CPL (layout Excel) ke database"""
+    with store.transaction():
+        for table in ("transkrip", "kehadiran", "cpmk", "cpl"):
+            if table in prodi_data:
+                store.upsert_frame(table, prodi_data[table])
+
+def load_prodi_data():
+    """Data dashboard prodi dari database; data kinerja masih berupa contoh"""
+    store = get_datastore()
+    return {
+        # Versi dibaca sebelum tabel agar penulisan di tengah pembacaan tetap memicu hash ulang
+        'versi': store.version(),
+        'transkrip': store.read_frame('transkrip'),
+        'cpmk': store.read_frame('cpmk'),
+        'cpl': store.read_frame('cpl'),
+        'kehadiran': store.read_frame('kehadiran'),
+        'kinerja': load_sample_prodi_data()['kinerja']
+    }
 
 def get_student_data(nama, nim):
-    if "df_users" not in st.session_state:
+    if "user_nim" not in st.session_state:
         st.error("Data pengguna belum dimuat. Silakan login kembali.")
         return None
     
-    df_users = st.session_state["df_users"]
-
-    user_row = df_users[
-        (df_users["Nama Lengkap"].str.strip().str.lower() == nama.strip().lower()) &
-        (df_users["NIM"].astype(str) == str(nim).strip())
-    ]
+    user_record = get_user_directory("mahasiswa").lookup(nama, nim)
     
-    if not user_row.empty:
+    if user_record is not None:
         required_columns = ["Nama Lengkap", "NIM", "Prodi", "IPK", "Jumlah_SKS", 
                             "Nilai_Mata_Kuliah", "Jumlah_Kehadiran", "Jumlah_Tugas", 
                             "Skor_Evaluasi", "Lama_Studi"]
         
-        missing_columns = [col for col in required_columns if col not in df_users.columns]
+        missing_columns = [col for col in required_columns if pd.isna(user_record.get(col))]
         
         if missing_columns:
-            st.error(f"Kolom yang hilang di file Excel: {', '.join(missing_columns)}")
+            st.error(f"Kolom yang kosong di database: {', '.join(missing_columns)}")
             return None
         
-        return user_row.iloc[0].to_dict()
+        return user_record
     
     return None
 
-
-
-
 def predict_graduation(model, prodi_encoded, ipk, jumlah_sks, nilai_mk, 
                       kehadiran, tugas, skor_evaluasi, lama_studi):
-    """Fungsi untuk memprediksi kelulusan"""
-    
-    # Hitung fitur engineered
-    academic_performance, engagement_score, study_efficiency, sks_per_semester = \
-        calculate_engineered_features(ipk, nilai_mk, kehadiran, tugas, jumlah_sks, lama_studi)
-    
-    # Buat dataframe untuk prediksi
-    data_prediksi = pd.DataFrame({
-        'Prodi': [prodi_encoded],
-        'IPK': [ipk],
-        'Jumlah SKS': [jumlah_sks],
-        'Nilai Mata Kuliah': [nilai_mk],
-        'Jumlah Kehadiran': [kehadiran],
-        'Jumlah Tugas': [tugas],
-        'Skor Evaluasi Dosen oleh Mahasiswa': [skor_evaluasi],
-        'Waktu Lama Studi (semester)': [lama_studi],
-        'Academic_Performance': [academic_performance],
-        'Engagement_Score': [engagement_score],
-        'Study_Efficiency': [study_efficiency],
-        'SKS_per_Semester': [sks_per_semester]
-    })
-    
-    # Prediksi
-    prediksi = model.predict(data_prediksi)[0]
-    probabilitas = model.predict_proba(data_prediksi)[0]
+    """Fungsi untuk memprediksi kelulusan satu mahasiswa
+
+    Memakai predict_graduation_batch (satu kali predict_proba) dengan batch berisi satu baris.
+    """
+    hasil = predict_graduation_batch(
+        model, prodi_encoded, ipk, jumlah_sks, nilai_mk,
+        kehadiran, tugas, skor_evaluasi, lama_studi
+    )
     
-    return {
-        'prediksi': prediksi,
-        'probabilitas_tidak_lulus': probabilitas[0],
-        'probabilitas_lulus': probabilitas[1],
-        'confidence': max(probabilitas),
-        'academic_performance': academic_performance,
-        'engagement_score': engagement_score,
-        'study_efficiency': study_efficiency,
-        'sks_per_semester': sks_per_semester
-    }
+    return {key: values[0] for key, values in hasil.items()}
+
+@st.cache_resource(max_entries=1)
+def get_shared_scorer():
+    """Pemegang pool proses scoring batch, dipakai bersama antar sesi"""
+    return SharedBatchScorer()
+
+def get_parallel_scorer(n_workers, model_path, signature):
+    """Pool proses scoring batch; pool lama dihentikan saat jumlah worker atau model berubah
 
-def process_batch_data(df, model, prodi_mapping):
-    """Proses data batch untuk prediksi"""
-    results = []
+    signature ikut menjadi kunci agar pool dibuat ulang saat versi/file model berubah.
+    """
+    return get_shared_scorer().get(model_path, n_workers, (n_workers, model_path, signature))
+
+@st.cache_resource(max_entries=2)
+def get_compiled_forest(version, signature, _model):
+    """Forest terkompilasi (array node) yang sudah diverifikasi bit-exact terhadap sklearn"""
+    return compile_forest(_model)
+
+def get_inference_model(model):
+    """Pilih backend inferensi untuk prediksi individual"""
+    if PREDICTION_BACKEND != 'compiled':
+        return model
     
-    for idx, row in df.iterrows():
-        try:
-            # Konversi prodi ke encoded value   
-            prodi_name = row['Prodi']
-            if prodi_name not in prodi_mapping:
-                results.append({
-                    'Index': idx,
-                    'Nama Lengkap': row.get('Nama Lengkap', f'Mahasiswa_{idx}'),
-                    'NIM': row.get('NIM', f'NIM_{idx}'),
-                    'Prodi': prodi_name,
-                    'Error': f'Prodi "{prodi_name}" tidak dikenal'
-                })
-                continue
-            
-            prodi_encoded = prodi_mapping[prodi_name]
-            
-            # Ekstrak data
-            ipk = float(row['IPK'])
-            jumlah_sks = int(row['Jumlah_SKS'])
-            nilai_mk = float(row['Nilai_Mata_Kuliah'])
-            kehadiran = float(row['Jumlah_Kehadiran'])
-            tugas = int(row['Jumlah_Tugas'])
-            skor_evaluasi = float(row['Skor_Evaluasi'])
-            lama_studi = int(row['Lama_Studi'])
-            
-            # Prediksi
-            hasil = predict_graduation(
-                model, prodi_encoded, ipk, jumlah_sks, nilai_mk,
-                kehadiran, tugas, skor_evaluasi, lama_studi
-            )
-            
-            # Simpan hasil
-            results.append({
-                'Index': idx,
-                'Nama Lengkap': row.get('Nama Lengkap', f'Mahasiswa_{idx}'),
-                'NIM': row.get('NIM', f'NIM_{idx}'),
-                'Prodi': prodi_name,
-                'IPK': ipk,
-                'Prediksi': 'LULUS' if hasil['prediksi'] == 1 else 'TIDAK LULUS',
-                'Probabilitas_Lulus': hasil['probabilitas_lulus'],
-                'Probabilitas_Tidak_Lulus': hasil['probabilitas_tidak_lulus'],
-                'Confidence': hasil['confidence'],
-                'Academic_Performance': hasil['academic_performance'],
-                'Engagement_Score': hasil['engagement_score'],
-                'Study_Efficiency': hasil['study_efficiency'],
-                'SKS_per_Semester': hasil['sks_per_semester'],
-                'Error': None
-            })
-            
-        except Exception as e:
-            results.append({
-                'Index': idx,
-                'Nama Lengkap': row.get('Nama Lengkap', f'Mahasiswa_{idx}'),
-                'NIM': row.get('NIM', f'NIM_{idx}'),
-                'Prodi': row.get('Prodi', 'Unknown'),
-                'Error': str(e)
-            })
+    artifacts = get_model_registry().artifacts_of(model)
+    if artifacts is None:
+        return model
     
-    return pd.DataFrame(results)
-
-def create_batch_summary_charts(df_results):
-    """Buat chart summary untuk batch results"""
-    # Filter data yang valid (tanpa error)
-    valid_results = df_results[df_results['Error'].isna()]
+    try:
+        return get_compiled_forest(artifacts.version, artifacts.signature, artifacts.model)
+    except ValueError as e:
+        st.warning(f"⚠️ Backend compiled tidak dipakai, kembali ke sklearn: {e}")
+        return model
+
+@st.cache_resource(max_entries=2)
+def _load_precomputed_table(version):
+    """Muat tabel prediksi terjadwal; version (mtime, ukuran) memicu reload saat job selesai"""
+    return load_table(PRECOMPUTED_PATH)
+
+def get_precomputed_table(artifacts):
+    """Tabel prediksi terjadwal jika dibuat dengan versi model yang sama, selain itu None"""
+    if artifacts is None:
+        return None
     
-    if len(valid_results) == 0:
+    try:
+        table = _load_precomputed_table(file_version(PRECOMPUTED_PATH))
+    except (OSError, ValueError, KeyError):
+        return None
+    return table if table is not None and table.matches_model(artifacts) else None
+
+def get_individual_prediction(model, nim, prodi_encoded, ipk, jumlah_sks, nilai_mk,
+                              kehadiran, tugas, skor_evaluasi, lama_studi):
+    """Prediksi individual lewat cache memori, tabel prediksi terjadwal, lalu model
+
+    Mengembalikan (hasil, sumber) dengan sumber 'cache', 'tabel', atau 'model'.
+    """
+    registry = get_model_registry()
+    artifacts = registry.artifacts_of(model)
+    if artifacts is None:
+        hasil = predict_graduation(get_inference_model(model), prodi_encoded, ipk, jumlah_sks,
+                                   nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi)
+        return hasil, "model"
+    
+    # Kunci cache: versi model + input, sehingga data/model baru otomatis miss
+    cache = get_prediction_cache()
+    cache_key = prediction_key(
+        artifacts.version, artifacts.signature, prodi_encoded, ipk, jumlah_sks,
+        nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi
+    )
+    hasil = cache.get(cache_key)
+    if hasil is not None:
+        return hasil, "cache"
+    
+    table = get_precomputed_table(artifacts)
+    if table is not None and nim is not None:
+        inputs = dict(zip(PRECOMPUTED_INPUT_COLUMNS, (
+            prodi_encoded, ipk, jumlah_sks, nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi
+        )))
+        pos = table.match([nim], inputs)[0]
+        if pos >= 0:
+            hasil = {key: values[pos] for key, values in table.results.items()}
+            cache.put(cache_key, hasil)
+            return hasil, "tabel"
+    
+    # Latensi inferensi dicatat per versi model
+    with registry.track(artifacts.version):
+        hasil = predict_graduation(get_inference_model(model), prodi_encoded, ipk, jumlah_sks,
+                                   nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi)
+    cache.put(cache_key, hasil)
+    return hasil, "model"
+
+def model_version_of(model):
+    """Versi registry dari objek model, atau None jika model tidak berasal dari registry"""
+    artifacts = get_model_registry().artifacts_of(model)
+    return None if artifacts is None else artifacts.version
+
+def record_prediction(nim, nama, prodi, hasil, model, inputs):
+    """Simpan satu hasil prediksi individual ke tabel predictions di database
+
+    inputs adalah delapan input model; prediksi ulang dengan NIM, versi model,
+    dan input yang sama memperbarui baris yang sudah ada, bukan menambah baris.
+    """
+    row = pd.DataFrame([{
+        'NIM': nim,
+        'Nama Lengkap': nama,
+        'Prodi': prodi,
+        'Prediksi': 'LULUS' if hasil['prediksi'] == 1 else 'TIDAK LULUS',
+        'Probabilitas_Lulus': hasil['probabilitas_lulus'],
+        'Probabilitas_Tidak_Lulus': hasil['probabilitas_tidak_lulus'],
+        'Confidence': hasil['confidence'],
+        'Kunci_Input': input_hash(*inputs),
+    }])
+    get_datastore().save_predictions(row, model_version_of(model))
+
+def process_batch_data(df, model, prodi_mapping, n_workers=1, summary=None):
+    """Proses data batch untuk prediksi
+
+    Validasi, fitur engineered, dan predict_proba dijalankan per kolom untuk
+    seluruh baris sekaligus; baris bermasalah ditandai di kolom 'Error'.
+    Batch besar dibagi ke beberapa proses worker jika n_workers > 1.
+    Agregat chart/metrik ditambahkan ke summary (BatchSummary) jika diberikan.
+    """
+    registry = get_model_registry()
+    artifacts = registry.artifacts_of(model)
+    version = artifacts.version if artifacts is not None else None
+    
+    with registry.track(version, n_rows=len(df)):
+        if artifacts is not None and n_workers > 1 and len(df) >= PARALLEL_MIN_ROWS:
+            scorer = get_parallel_scorer(n_workers, artifacts.files['model'], artifacts.signature)
+            return scorer.score(df, prodi_mapping, summary=summary)
+        
+        # Baris yang ada di tabel prediksi terjadwal (NIM dan input sama) tidak dihitung ulang
+        return predict_batch_frame(
+            df, model, prodi_mapping, precomputed=get_precomputed_table(artifacts), summary=summary
+        )
+
+def create_batch_summary_charts(summary):
+    """Buat chart summary untuk batch results dari agregat BatchSummary (tanpa memindai baris)"""
+    if summary.valid_count == 0:
         return None, None, None
     
     # Chart 1: Distribusi Prediksi
-    prediksi_counts = valid_results['Prediksi'].value_counts()
+    prediksi_counts = summary.prediksi_frame()
     
     fig_pie = px.pie(
-        values=prediksi_counts.values,
-        names=prediksi_counts.index,
+        prediksi_counts,
+        values='Count',
+        names='Prediksi',
+        color='Prediksi',
         title="Distribusi Prediksi Kelulusan",
         color_discrete_map={'LULUS': '#2E8B57', 'TIDAK LULUS': '#DC143C'}
     )
     
     # Chart 2: Distribusi per Prodi
-    # Prepare data for bar chart
-    prodi_prediksi = valid_results.groupby(['Prodi', 'Prediksi']).size().reset_index(name='Count')
+    prodi_prediksi = summary.prodi_frame()
     
     fig_bar = px.bar(
         prodi_prediksi,
@@ -407,19 +559,19 @@ def create_batch_summary_charts(df_results):
     )
     fig_bar.update_xaxes(tickangle=45)
     
-    # Chart 3: Distribusi Confidence
-    fig_hist = px.histogram(
-        valid_results,
-        x='Confidence',
-        nbins=20,
+    # Chart 3: Distribusi Confidence (bin sudah dihitung, satu batang per bin)
+    fig_hist = histogram_figure(
+        summary.confidence_frame(),
         title="Distribusi Confidence Score",
-        labels={'Confidence': 'Confidence Score', 'count': 'Jumlah Mahasiswa'}
+        x_label='Confidence Score',
+        y_label='Jumlah Mahasiswa'
     )
     
     return fig_pie, fig_bar, fig_hist
 
 def create_sample_template():
     """Buat template Excel untuk batch upload"""
+    # Kolom harus sama dengan UPLOAD_SCHEMA di excel_io (kolom lain tidak dibaca saat upload)
     sample_data = {
         'Nama Lengkap': ['4', 'Jane Smith', 'Ahmad Rahman'],
         'NIM': ['12345678', '87654321', '11223344'],
@@ -565,11 +717,8 @@ def render_prodi_dashboard():
         render_header(context="prodi_dashboard")
         st.markdown("---")
         
-        # Load prodi data
-        if "prodi_data" not in st.session_state:
-            st.session_state["prodi_data"] = load_sample_prodi_data()
-        
-        prodi_data = st.session_state["prodi_data"]
+        # Load prodi data dari database (CPL/CPMK baru langsung ikut tampil)
+        prodi_data = load_prodi_data()
         # Menu navigasi prodi
         menu_options = [
             "📊 Dashboard Utama",
@@ -635,21 +784,12 @@ def render_input_cpl_cpmk():
                     return
 
                 # Cek duplikasi CPMK
-                existing_cpmk = [(mk, cpmk) for mk, cpmk in zip(
-                    st.session_state.cpmk_data['Kode_MK'], 
-                    st.session_state.cpmk_data['Kode_CPMK']
-                )]
-                
-                if (kode_mk, kode) in existing_cpmk:
+                if get_datastore().cpmk_exists(kode, kode_mk):
                     st.error(f"❌ CPMK {kode} untuk mata kuliah {kode_mk} sudah ada!")
                     return
     
-                st.session_state.cpmk_data['Kode_MK'].append(kode_mk)
-                st.session_state.cpmk_data['Nama_MK'].append(mata_kuliah)
-                st.session_state.cpmk_data['Kode_CPMK'].append(kode)
-                st.session_state.cpmk_data['Deskripsi_CPMK'].append(deskripsi)
-                st.session_state.cpmk_data['Pencapaian_Rata2'].append(0)  # Default 0
-                st.session_state.cpmk_data['Target'].append(target)
+                # Pencapaian_Rata2 default 0
+                add_cpmk(kode, deskripsi, mata_kuliah, kode_mk=kode_mk, target=target)
 
                 st.success(f"✅ CPMK {kode} untuk mata kuliah {mata_kuliah} berhasil disimpan!")
 
@@ -660,34 +800,30 @@ def render_input_cpl_cpmk():
                     return
                 
                 # Cek duplikasi CPL
-                if kode in st.session_state.cpl_data['Kode_CPL']:
+                if get_datastore().cpl_exists(kode):
                     st.error(f"❌ CPL {kode} sudah ada!")
                     return
 
-                # Simpan data CPL
-                st.session_state.cpl_data['Kode_CPL'].append(kode)
-                st.session_state.cpl_data['Deskripsi_CPL'].append(deskripsi)
-                st.session_state.cpl_data['Kontribusi_CPMK'].append(kontribusi)
-                st.session_state.cpl_data['Tingkat_Pencapaian'].append(0)  # Default 0
+                # Simpan data CPL (Tingkat_Pencapaian default 0)
+                add_cpl(kode, deskripsi, kategori=None, kontribusi=kontribusi)
 
                 st.success(f"✅ CPL {kode} berhasil disimpan!")
     
     # Tampilkan data yang sudah tersimpan
-    if st.session_state.cpmk_data['Kode_CPMK'] or st.session_state.cpl_data['Kode_CPL']:
+    store = get_datastore()
+    df_cpmk = store.read_frame('cpmk')
+    df_cpl = store.read_frame('cpl')
+    if len(df_cpmk) or len(df_cpl):
         st.subheader("📋 Data Tersimpan")
         
         # Tampilkan data CPMK
-        if st.session_state.cpmk_data['Kode_CPMK']:
+        if len(df_cpmk):
             st.write("**Data CPMK:**")
-            import pandas as pd
-            df_cpmk = pd.DataFrame(st.session_state.cpmk_data)
             st.dataframe(df_cpmk, use_container_width=True)
         
         # Tampilkan data CPL
-        if st.session_state.cpl_data['Kode_CPL']:
+        if len(df_cpl):
             st.write("**Data CPL:**")
-            import pandas as pd
-            df_cpl = pd.DataFrame(st.session_state.cpl_data)
             st.dataframe(df_cpl, use_container_width=True)
 
 def render_prodi_main_dashboard(prodi_data):
@@ -878,15 +1014,15 @@ def render_transkrip_nilai(prodi_data):
     # Download transkrip
     st.subheader("📥 Export Data")
     
-    buffer = io.BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        transkrip_display.to_excel(writer, sheet_name='Transkrip', index=False)
-    
+    # File dibuat saat tombol diklik; transkrip yang ditampilkan ditentukan oleh isi tabel transkrip
+    # (di-hash sekali per versi database) dan pilihan filter
+    transkrip_version = session_frame_version('transkrip', prodi_data['transkrip'], prodi_data['versi'])
+    export_key = ('transkrip', transkrip_version, selected_nim, selected_semester)
     st.download_button(
         label="📥 Download Transkrip (Excel)",
-        data=buffer,
+        data=deferred_xlsx(export_key, lambda: {'Transkrip': transkrip_display}),
         file_name=f"transkrip_{mahasiswa_info['NIM']}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=XLSX_MIME
     )
 
 def render_cpmk_report(prodi_data):
@@ -1127,11 +1263,12 @@ def render_rekap_nilai_absensi(prodi_data):
     nilai_map = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'E': 0}
     merged_data['Nilai_Poin'] = merged_data['Nilai'].map(nilai_map)
     
-    # Scatter plot
-    fig_scatter = px.scatter(
+    # Scatter plot (data besar di-downsample per status kehadiran dan dirender dengan WebGL)
+    fig_scatter, shown_points = scatter_figure(
         merged_data,
         x='Persentase_Kehadiran',
         y='Nilai_Poin',
+        max_points=CHART_MAX_POINTS,
         color='Status_Kehadiran',
         title='Hubungan Kehadiran dan Nilai',
         labels={'Persentase_Kehadiran': 'Kehadiran (%)', 'Nilai_Poin': 'Nilai (dalam angka)'},
@@ -1145,17 +1282,19 @@ def render_rekap_nilai_absensi(prodi_data):
     )
     
     st.plotly_chart(fig_scatter, use_container_width=True)
+    if shown_points < len(merged_data):
+        st.caption(f"Menampilkan sampel {shown_points:,} dari {len(merged_data):,} titik")
     
     # Hitung korelasi
     correlation = merged_data['Persentase_Kehadiran'].corr(merged_data['Nilai_Poin'])
     
-    # Box plot per nilai
-    fig_box = px.box(
+    # Box plot per nilai (data besar memakai kuartil yang dihitung di server)
+    fig_box = box_figure(
         merged_data,
         x='Nilai',
         y='Persentase_Kehadiran',
-        title='Distribusi Kehadiran per Nilai',
-        color='Nilai'
+        max_points=CHART_MAX_POINTS,
+        title='Distribusi Kehadiran per Nilai'
     )
     
     # Layout
@@ -1444,16 +1583,13 @@ def render_batch_upload_interface():
         # Buat template
         template_df = create_sample_template()
         
-        # Konversi ke Excel
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            template_df.to_excel(writer, sheet_name='Template', index=False)
-        
+        # Konversi ke Excel hanya saat diklik (hasilnya di-cache untuk semua pengguna)
         st.download_button(
             label="📥 Download Template Excel",
-            data=buffer.getvalue(),
+            data=deferred_xlsx(('template', session_frame_version('template', template_df, None)),
+                               lambda: {'Template': template_df}),
             file_name=f"template_batch_prediksi_{datetime.now().strftime('%Y%m%d')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            mime=XLSX_MIME,
             type="primary"
         )
     
@@ -1470,17 +1606,48 @@ def render_batch_upload_interface():
     # Upload file
     st.subheader("📤 Upload File Excel")
     uploaded_file = st.file_uploader(
-        "Pilih file Excel (.xlsx)",
-        type=['xlsx'],
-        help="File Excel harus mengandung kolom sesuai template"
+        "Pilih file Excel (.xlsx), CSV, atau Parquet",
+        type=UPLOAD_EXTENSIONS,
+        help="File harus mengandung kolom sesuai template; kolom lain diabaikan"
+    )
+    
+    # Pengaturan pemrosesan paralel
+    with st.expander("⚙️ Pengaturan Pemrosesan"):
+        n_workers = st.number_input(
+            "Jumlah worker proses",
+            min_value=1,
+            max_value=max(os.cpu_count() or 1, default_worker_count()),
+            value=default_worker_count(),
+            key="batch_n_workers",
+            help=f"Batch dengan minimal {PARALLEL_MIN_ROWS:,} baris dibagi ke beberapa proses. Isi 1 untuk satu proses."
+        )
+    
+    # Mode streaming untuk file berukuran besar
+    streaming_mode = st.checkbox(
+        "⚡ Mode streaming (file besar)",
+        key="batch_streaming_mode",
+        help="Baca dan proses file per chunk dengan progress bar, cocok untuk puluhan ribu baris lebih"
     )
     
-    if uploaded_file is not None:
+    if uploaded_file is not None and streaming_mode:
         try:
-            # Baca file Excel
-            df = pd.read_excel(uploaded_file)
+            render_streaming_batch(uploaded_file, model, prodi_mapping, required_columns, n_workers)
+        except Exception as e:
+            st.error(f"❌ Error membaca file: {str(e)}")
+    
+    elif uploaded_file is not None:
+        try:
+            # Baca hanya kolom template; file yang sama tidak diparsing ulang di setiap rerun
+            df, from_cache = read_upload_cached(uploaded_file)
             
             st.success(f"✅ File berhasil diupload! Ditemukan {len(df)} baris data")
+            memory = df.attrs[UPLOAD_MEMORY_ATTR]
+            st.caption(f"🧮 Memori data: {memory['Sesudah (MB)']:.1f} MB "
+                       f"(hemat {memory['Hemat (%)']:.0f}% dengan dtype kategori/float32/int16)")
+            if from_cache:
+                upload_stats = get_upload_cache().stats()
+                st.caption(f"♻️ Data diambil dari cache upload (isi file sama) • "
+                           f"{upload_stats['parses_avoided']:,} parsing dihindari")
             
             # Tampilkan preview data
             st.subheader("👀 Preview Data")
@@ -1497,10 +1664,11 @@ def render_batch_upload_interface():
             if st.button("🚀 Proses Batch Prediksi", type="primary", key="proses_batch_prediksi"):
                 with st.spinner("Memproses prediksi batch..."):
                     # Proses data
-                    results_df = process_batch_data(df, model, prodi_mapping)
+                    summary = BatchSummary()
+                    results_df = process_batch_data(df, model, prodi_mapping, n_workers, summary=summary)
                     
                     # Simpan hasil ke session state
-                    st.session_state["batch_results"] = results_df
+                    set_batch_results(results_df, summary, model_version_of(model))
                     
                     st.success("✅ Batch prediksi selesai!")
                     st.rerun()
@@ -1512,44 +1680,153 @@ def render_batch_upload_interface():
     if st.session_state["batch_results"] is not None:
         render_batch_results()
 
+def render_streaming_batch(uploaded_file, model, prodi_mapping, required_columns, n_workers=1):
+    """Proses batch per chunk dengan progress bar dan penyimpanan hasil di disk"""
+    total_rows = upload_row_count(uploaded_file)
+    preview = next(iter_upload_chunks(uploaded_file, chunksize=5), None)
+    
+    if preview is None:
+        st.error("❌ File tidak berisi data")
+        return
+    
+    st.success(f"✅ File berhasil diupload! Ditemukan sekitar {total_rows} baris data (mode streaming)")
+    
+    # Tampilkan preview data
+    st.subheader("👀 Preview Data")
+    st.dataframe(preview, use_container_width=True)
+    
+    # Validasi kolom
+    missing_columns = [col for col in required_columns if col not in preview.columns]
+    
+    if missing_columns:
+        st.error(f"❌ Kolom yang hilang: {', '.join(missing_columns)}")
+        return
+    
+    # Default sama dengan batas paralel: setiap chunk diproses per panggilan process_batch_data,
+    # jadi chunk yang lebih kecil selalu discoring di satu proses
+    chunk_size = st.number_input(
+        "Ukuran chunk (baris)",
+        min_value=1000,
+        max_value=100000,
+        value=PARALLEL_MIN_ROWS,
+        step=1000,
+        key="batch_chunk_size",
+        help=f"Chunk dengan minimal {PARALLEL_MIN_ROWS:,} baris dibagi ke beberapa proses worker"
+    )
+    
+    if st.button("🚀 Proses Batch Prediksi", type="primary", key="proses_batch_streaming"):
+        # Hapus hasil streaming sebelumnya dari disk
+        if st.session_state.get("batch_result_store") is not None:
+            st.session_state["batch_result_store"].cleanup()
+        
+        store = BatchResultStore()
+        summary = BatchSummary()
+        progress_bar = st.progress(0.0, text="Memulai prediksi batch...")
+        first_results = st.empty()
+        start_time = time.perf_counter()
+        
+        for chunk in iter_upload_chunks(uploaded_file, chunksize=int(chunk_size)):
+            result_chunk = process_batch_data(chunk, model, prodi_mapping, n_workers, summary=summary)
+            store.append(result_chunk)
+            
+            # Hitung kecepatan dan estimasi waktu selesai
+            processed = len(store)
+            elapsed = time.perf_counter() - start_time
+            rows_per_sec = processed / elapsed if elapsed > 0 else 0
+            remaining = max(total_rows - processed, 0)
+            eta = remaining / rows_per_sec if rows_per_sec > 0 else 0
+            progress_bar.progress(
+                min(processed / total_rows, 1.0) if total_rows else 1.0,
+                text=f"{processed:,}/{total_rows:,} baris • {rows_per_sec:,.0f} baris/detik • ETA {eta:.0f} detik"
+            )
+            
+            # Tampilkan hasil chunk pertama secepatnya
+            if len(store.chunk_files) == 1:
+                with first_results.container():
+                    st.caption("Hasil awal:")
+                    st.dataframe(store.head(), use_container_width=True)
+        
+        # Hasil tetap di disk: session state hanya menyimpan store, indeks kolom filter, dan agregat
+        st.session_state["batch_result_store"] = store
+        set_batch_results(store, summary, model_version_of(model))
+        
+        st.success("✅ Batch prediksi selesai!")
+        st.rerun()
+
+def set_batch_results(results, summary=None, model_version=None):
+    """Simpan hasil batch beserta versi isi, indeks filter, dan agregat chart (dibuat sekali per batch)
+
+    results adalah DataFrame hasil, atau BatchResultStore untuk mode streaming
+    (summary wajib diberikan) sehingga hasil tidak pernah digabung di memori.
+    model_version adalah versi model yang menghasilkan batch ini (disimpan ke database).
+    """
+    st.session_state["batch_results"] = results
+    st.session_state["batch_results_model_version"] = model_version
+    if isinstance(results, BatchResultStore):
+        st.session_state["batch_results_version"] = results.version
+    else:
+        st.session_state["batch_results_version"] = frame_version(results)
+    st.session_state["batch_results_index"] = BatchResultIndex(results)
+    st.session_state["batch_results_summary"] = summary or BatchSummary.from_results(results)
+
+def iter_result_frames(results):
+    """DataFrame hasil batch per bagian: chunk dari disk untuk BatchResultStore, atau frame itu sendiri"""
+    if isinstance(results, BatchResultStore):
+        return results.iter_chunks()
+    return iter([results])
+
+def clear_batch_results():
+    st.session_state["batch_results"] = None
+    st.session_state.pop("batch_results_version", None)
+    st.session_state.pop("batch_results_model_version", None)
+    st.session_state.pop("batch_results_index", None)
+    st.session_state.pop("batch_results_summary", None)
+
+def get_batch_results_index(results_df):
+    """Indeks filter hasil batch; dibuat ulang hanya jika hasil di session state berganti"""
+    index = st.session_state.get("batch_results_index")
+    if index is None or index.results is not results_df:
+        set_batch_results(results_df)
+        index = st.session_state["batch_results_index"]
+    return index
+
 def render_batch_results():
     """Render hasil batch prediksi"""
     results_df = st.session_state["batch_results"]
+    # Posisi baris per status/prodi dibuat sekali per hasil batch, bukan per rerun
+    result_index = get_batch_results_index(results_df)
+    # Agregat metrik dan chart dihitung saat prediksi dibuat
+    summary = st.session_state["batch_results_summary"]
     
     st.subheader("📊 Hasil Batch Prediksi")
     
     # Summary statistics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_processed = len(results_df)
-    valid_results = results_df[results_df['Error'].isna()]
-    error_count = len(results_df[results_df['Error'].notna()])
-    
-    if len(valid_results) > 0:
-        lulus_count = len(valid_results[valid_results['Prediksi'] == 'LULUS'])
-        tidak_lulus_count = len(valid_results[valid_results['Prediksi'] == 'TIDAK LULUS'])
-        avg_confidence = valid_results['Confidence'].mean()
-    else:
-        lulus_count = tidak_lulus_count = 0
-        avg_confidence = 0
+    total_processed = summary.total_rows
+    valid_count = summary.valid_count
+    error_count = summary.error_count
+    lulus_count = summary.count('LULUS')
+    tidak_lulus_count = summary.count('TIDAK LULUS')
+    avg_confidence = summary.mean_confidence
     
     with col1:
         st.metric("Total Diproses", total_processed)
     
     with col2:
-        st.metric("Prediksi Lulus", lulus_count, delta=f"{lulus_count/len(valid_results)*100:.1f}%" if len(valid_results) > 0 else "0%")
+        st.metric("Prediksi Lulus", lulus_count, delta=f"{lulus_count/valid_count*100:.1f}%" if valid_count > 0 else "0%")
     
     with col3:
-        st.metric("Prediksi Tidak Lulus", tidak_lulus_count, delta=f"{tidak_lulus_count/len(valid_results)*100:.1f}%" if len(valid_results) > 0 else "0%")
+        st.metric("Prediksi Tidak Lulus", tidak_lulus_count, delta=f"{tidak_lulus_count/valid_count*100:.1f}%" if valid_count > 0 else "0%")
     
     with col4:
         st.metric("Avg Confidence", f"{avg_confidence:.1%}" if avg_confidence > 0 else "0%")
     
     # Charts
-    if len(valid_results) > 0:
+    if valid_count > 0:
         st.subheader("📈 Visualisasi Hasil")
         
-        fig_pie, fig_bar, fig_hist = create_batch_summary_charts(results_df)
+        fig_pie, fig_bar, fig_hist = create_batch_summary_charts(summary)
         
         if fig_pie is not None:
             col1, col2 = st.columns(2)
@@ -1575,82 +1852,117 @@ def render_batch_results():
         )
     
     with col2:
-        if len(valid_results) > 0:
+        if valid_count > 0:
             prodi_filter = st.selectbox(
                 "Filter Prodi",
-                ["Semua"] + list(valid_results['Prodi'].unique())
+                ["Semua"] + result_index.prodi_options
             )
         else:
             prodi_filter = "Semua"
     
-    # Apply filters
-    filtered_df = results_df.copy()
+    # Urutan dan ukuran halaman
+    col1, col2, col3 = st.columns([2, 1, 1])
     
-    if show_filter == "Hanya Lulus":
-        filtered_df = filtered_df[filtered_df['Prediksi'] == 'LULUS']
-    elif show_filter == "Hanya Tidak Lulus":
-        filtered_df = filtered_df[filtered_df['Prediksi'] == 'TIDAK LULUS']
-    elif show_filter == "Hanya Error":
-        filtered_df = filtered_df[filtered_df['Error'].notna()]
+    with col1:
+        sort_column = st.selectbox("Urutkan Berdasarkan", ["(Urutan file)"] + list(results_df.columns))
+    
+    with col2:
+        sort_ascending = st.radio("Arah", ["Naik", "Turun"], horizontal=True) == "Naik"
     
-    if prodi_filter != "Semua":
-        filtered_df = filtered_df[filtered_df['Prodi'] == prodi_filter]
+    with col3:
+        page_size = st.selectbox("Baris per Halaman", BATCH_PAGE_SIZES, index=1)
+    
+    # Apply filters: ambil posisi baris dari indeks, tanpa menyalin DataFrame
+    # Selain filter "Hanya Error", hanya data yang tidak ada error yang ditampilkan
+    status = {
+        "Semua": 'valid',
+        "Hanya Lulus": 'LULUS',
+        "Hanya Tidak Lulus": 'TIDAK LULUS',
+        "Hanya Error": 'error',
+    }[show_filter]
+    positions = result_index.positions(status, None if prodi_filter == "Semua" else prodi_filter)
+    positions = result_index.sorted_positions(
+        positions, None if sort_column == "(Urutan file)" else sort_column, sort_ascending
+    )
     
-    # PERUBAHAN UTAMA: Hapus kolom Error untuk hasil yang sukses
-    display_df = filtered_df.copy()
+    # Pagination: hanya satu halaman yang dikirim ke browser
+    n_pages = max(-(-len(positions) // page_size), 1)
+    page = st.number_input(
+        f"Halaman (dari {n_pages:,})", min_value=1, max_value=n_pages, value=1, step=1,
+        # Kunci ikut filter agar halaman kembali ke 1 saat filter berubah
+        key=f"batch_page_{status}_{prodi_filter}_{page_size}"
+    )
+    display_df = result_index.page(positions, page, page_size)
     
-    # Jika bukan filter "Hanya Error", hilangkan kolom Error dari tampilan
+    # Hapus kolom Error dari tampilan untuk hasil yang sukses
     if show_filter != "Hanya Error":
-        # Hanya tampilkan data yang tidak ada error
-        display_df = display_df[display_df['Error'].isna()]
-        # Hapus kolom Error dari tampilan
-        if 'Error' in display_df.columns:
-            display_df = display_df.drop(columns=['Error'])
+        display_df = display_df.drop(columns=['Error'])
     
     # Display filtered results
     st.dataframe(display_df, use_container_width=True)
+    start_row = (page - 1) * page_size
+    st.caption(f"Menampilkan baris {min(start_row + 1, len(positions)):,}–{start_row + len(display_df):,} "
+               f"dari {len(positions):,}")
     
     # Tampilkan pesan jika ada data dengan error (kecuali jika sedang filter error)
     if show_filter != "Hanya Error" and error_count > 0:
         st.warning(f"⚠️ {error_count} data mengalami error. Pilih filter 'Hanya Error' untuk melihat detail error.")
     
-    # Download results
-    if st.button("📥 Download Hasil ke Excel", type="secondary", key="Download"):
-        buffer = io.BytesIO()
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # Sheet 1: Hasil detail (tanpa error untuk data yang sukses)
-            success_results = results_df[results_df['Error'].isna()].drop(columns=['Error'])
-            error_results = results_df[results_df['Error'].notna()]
-            
-            # Sheet untuk hasil sukses
-            if len(success_results) > 0:
-                success_results.to_excel(writer, sheet_name='Hasil_Sukses', index=False)
-            
-            # Sheet untuk error (jika ada)
-            if len(error_results) > 0:
-                error_results.to_excel(writer, sheet_name='Data_Error', index=False)
-            
-            # Sheet 2: Summary
-            if len(valid_results) > 0:
-                summary_data = {
-                    'Metrik': ['Total Diproses', 'Prediksi Lulus', 'Prediksi Tidak Lulus', 'Error Count', 'Avg Confidence'],
-                    'Nilai': [total_processed, lulus_count, tidak_lulus_count, error_count, f"{avg_confidence:.1%}"]
-                }
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
+    # Download results: Excel dibuat saat tombol diklik, bukan di setiap rerun
+    def build_result_sheets():
+        sheets = {}
         
-        st.download_button(
-            label="📥 Download Excel",
-            data=buffer.getvalue(),
-            file_name=f"hasil_batch_prediksi_{timestamp}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        # Sheet 1: Hasil detail (tanpa error untuk data yang sukses); ditulis per chunk
+        # sehingga hasil streaming tidak perlu dimuat seluruhnya
+        if valid_count > 0:
+            sheets['Hasil_Sukses'] = (frame[frame['Error'].isna()].drop(columns=['Error'])
+                                      for frame in iter_result_frames(results_df))
+        
+        # Sheet untuk error (jika ada)
+        if error_count > 0:
+            sheets['Data_Error'] = (frame[frame['Error'].notna()] for frame in iter_result_frames(results_df))
+        
+        # Sheet 2: Summary
+        if valid_count > 0:
+            summary_data = {
+                'Metrik': ['Total Diproses', 'Prediksi Lulus', 'Prediksi Tidak Lulus', 'Error Count', 'Avg Confidence'],
+                'Nilai': [total_processed, lulus_count, tidak_lulus_count, error_count, f"{avg_confidence:.1%}"]
+            }
+            sheets['Summary'] = pd.DataFrame(summary_data)
+        return sheets
+    
+    results_version = st.session_state["batch_results_version"]
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    st.download_button(
+        label="📥 Download Hasil ke Excel",
+        data=deferred_xlsx(('batch_results', results_version), build_result_sheets, len(results_df)),
+        file_name=f"hasil_batch_prediksi_{timestamp}.xlsx",
+        mime=XLSX_MIME,
+        type="secondary",
+        key="Download"
+    )
+    
+    # Riwayat prediksi: baris sukses ditambahkan ke tabel predictions di database, sekali per batch,
+    # dengan versi model yang menghasilkan batch ini (bukan versi yang aktif sekarang)
+    saved_version, saved_rows = st.session_state.get("batch_results_saved", (None, 0))
+    saved = saved_version == results_version
+    if st.button("💾 Simpan Hasil ke Database", type="secondary", key="batch_save_datastore",
+                 disabled=valid_count == 0 or saved) and not saved:
+        store = get_datastore()
+        version = st.session_state.get("batch_results_model_version")
+        n_rows = sum(store.save_predictions(frame, version) for frame in iter_result_frames(results_df))
+        st.session_state["batch_results_saved"] = (results_version, n_rows)
+        st.rerun()
+    if saved:
+        st.success(f"✅ {saved_rows} hasil prediksi tersimpan di database")
     
     # Clear results
     if st.button("🗑 Clear Results", type="secondary", key="Clear"):
-        st.session_state["batch_results"] = None
+        clear_batch_results()
+        if st.session_state.get("batch_result_store") is not None:
+            st.session_state["batch_result_store"].cleanup()
+            st.session_state["batch_result_store"] = None
         st.rerun()
 
 def render_prediction_interface():
@@ -1671,13 +1983,15 @@ def render_prediction_interface():
     # Tab layout untuk admin dan dosen
     if role_features["show_batch_upload"]:
         if role_features.get("show_excel_management"):
-            tab1, tab2, tab3 = st.tabs(["🎯 Prediksi Individual", "📂 Batch Upload", "📊 Kelola Excel"])
+            tab1, tab2, tab3, tab4 = st.tabs(["🎯 Prediksi Individual", "📂 Batch Upload", "📊 Kelola Excel", "⚙️ Pengaturan Sistem"])
             with tab1:
                 render_individual_prediction(model, prodi_mapping, role_features)
             with tab2:
                 render_batch_upload_interface()
             with tab3:
                 render_admin_excel_management()
+            with tab4:
+                render_model_registry_panel()
         else:
             tab1, tab2 = st.tabs(["🎯 Prediksi Individual", "📂 Batch Upload"])
             with tab1:
@@ -1822,11 +2136,18 @@ def render_individual_prediction(model, prodi_mapping, role_features):
                 st.error("Data tidak lengkap untuk melakukan prediksi")
                 return
             
-            # Lakukan prediksi
-            hasil = predict_graduation(
-                model, prodi_encoded, ipk, jumlah_sks, nilai_mk,
+            # Lakukan prediksi (cache memori → tabel prediksi terjadwal → model)
+            nim = st.session_state.get("user_nim") if st.session_state["user_role"] == "Mahasiswa" else None
+            hasil, sumber = get_individual_prediction(
+                model, nim, prodi_encoded, ipk, jumlah_sks, nilai_mk,
                 kehadiran, tugas, skor_evaluasi, lama_studi
             )
+            if sumber == "tabel":
+                st.caption("⚡ Hasil diambil dari tabel prediksi terjadwal")
+            if nim is not None:
+                record_prediction(nim, st.session_state["user_name"], prodi_selected, hasil, model, (
+                    prodi_encoded, ipk, jumlah_sks, nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi
+                ))
             
             # Tampilkan hasil utama
             if hasil['prediksi'] == 1:
@@ -1963,6 +2284,7 @@ def render_individual_prediction(model, prodi_mapping, role_features):
         st.write("*Algorithm:* Random Forest")
         st.write("*Features:* 12 fitur")
         st.write("*Balancing:* SMOTE")
+        st.write(f"*Backend Inferensi:* {PREDICTION_BACKEND}")
         
         # Feature importance (contoh)
         st.subheader("🔍 Fitur Penting:")
@@ -1974,6 +2296,11 @@ def render_individual_prediction(model, prodi_mapping, role_features):
         
         # Admin features
         if role_features["show_admin_features"]:
+            artifacts = get_model_artifacts()
+            st.write(f"*Versi Model:* {artifacts.version}")
+            st.write(f"*Waktu Load Model:* {artifacts.load_seconds:.2f} detik")
+            st.write(f"*Memori Model:* {artifacts.memory_bytes / 2**20:.1f} MB")
+            
             st.subheader("⚙ Admin Tools:")
             st.write("• Model Statistics")
             st.write("• User Management")
@@ -2011,34 +2338,61 @@ def render_excel_upload_view(prodi_mapping):
     """Render interface upload dan view Excel"""
     st.subheader("📁 Upload & Lihat Data Excel")
     
+    sumber = st.radio("Sumber Data", ["Upload File", "Database"], horizontal=True, key="admin_data_source")
+    
     # Upload file
-    uploaded_file = st.file_uploader(
-        "Upload file Excel untuk diedit",
-        type=['xlsx'],
-        key="admin_excel_upload",
-        help="Up" \
-        "load file Excel yang akan diedit/ditambahkan datanya"
-    )
+    uploaded_file = None
+    if sumber == "Upload File":
+        uploaded_file = st.file_uploader(
+            "Upload file Excel (atau CSV/Parquet) untuk diedit",
+            type=UPLOAD_EXTENSIONS,
+            key="admin_excel_upload",
+            help="Up" \
+            "load file Excel yang akan diedit/ditambahkan datanya"
+        )
     
-    if uploaded_file is not None:
+    if sumber == "Database" or uploaded_file is not None:
         try:
-            # Hanya baca file jika belum ada atau file berbeda
-            if ("admin_excel_data" not in st.session_state or 
-                st.session_state.get("current_filename") != uploaded_file.name):
+            source_name = DATASTORE_PATH if sumber == "Database" else uploaded_file.name
+            
+            # Hanya baca data jika belum ada atau sumber berbeda
+            if ("admin_dataset" not in st.session_state or 
+                st.session_state.get("current_filename") != source_name):
                 
-                # Baca file Excel
-                df = pd.read_excel(uploaded_file)
+                if sumber == "Database":
+                    # Tabel mahasiswa dengan layout login_mahasiswa.xlsx
+                    df = compact_frame(get_datastore().read_frame('students'))
+                else:
+                    # Baca kolom template saja dengan tipe data yang sudah ditentukan
+                    df, _ = read_upload_cached(uploaded_file)
                 
-                # Simpan ke session state
-                st.session_state["admin_excel_data"] = df.copy()
-                st.session_state["original_filename"] = uploaded_file.name
-                st.session_state["current_filename"] = uploaded_file.name
+                # Simpan ke session state (df dasar tidak diubah di tempat, jadi tanpa salinan)
+                st.session_state["admin_dataset"] = AdminDataset(df)
+                st.session_state["original_filename"] = source_name
+                st.session_state["current_filename"] = source_name
                 st.session_state["data_modified"] = False
                 
-                st.success(f"✅ File '{uploaded_file.name}' berhasil diupload! Ditemukan {len(df)} baris data")
+                if sumber == "Database":
+                    st.success(f"✅ Data mahasiswa dimuat dari database. Ditemukan {len(df)} baris data")
+                else:
+                    st.success(f"✅ File '{uploaded_file.name}' berhasil diupload! Ditemukan {len(df)} baris data")
+            
+            # Catat edit state data editor ke log perubahan dataset (hanya perubahannya, bukan seluruh frame)
+            dataset = st.session_state["admin_dataset"]
+            editor_key = f"excel_data_editor_{dataset.generation}"
+            edit_state = st.session_state.get(editor_key)
+            if edit_state is not None:
+                if dataset.track_edits(edit_state):
+                    st.session_state["data_modified"] = True
+            elif dataset.has_edits:
+                # Editor tidak dirender di run sebelumnya (View Only/filter) sehingga edit state-nya
+                # dibuang Streamlit: terapkan log ke data dasar dan mulai editor baru
+                dataset.commit_edits()
+                editor_key = f"excel_data_editor_{dataset.generation}"
             
-            # Ambil data dari session state
-            current_data = st.session_state["admin_excel_data"]
+            # Kolom dan opsi filter dibaca tanpa menggabungkan buffer baris baru ke seluruh data;
+            # buffer baru digabung saat Edit Mode, simpan, atau export
+            columns = dataset.columns
             
             # Tampilkan data dengan opsi edit
             st.subheader("📋 Data Saat Ini")
@@ -2048,31 +2402,27 @@ def render_excel_upload_view(prodi_mapping):
             with col1:
                 search_term = st.text_input("🔍 Cari berdasarkan Nama/NIM", key="search_excel")
             with col2:
-                if 'Prodi' in current_data.columns:
+                if 'Prodi' in columns:
                     prodi_filter = st.selectbox(
                         "Filter Prodi", 
-                        ["Semua"] + list(current_data['Prodi'].unique()),
+                        ["Semua"] + dataset.unique('Prodi'),
                         key="filter_prodi_excel"
                     )
                 else:
                     prodi_filter = "Semua"
             
-            # Apply filters untuk display
-            display_data = current_data.copy()
+            # Apply filters untuk display: posisi baris hasil filter atas data lengkap
+            positions = None
             filter_applied = False
             
             if search_term:
-                if 'Nama Lengkap' in current_data.columns and 'NIM' in current_data.columns:
-                    display_data = current_data[
-                        (current_data['Nama Lengkap'].str.contains(search_term, case=False, na=False)) |
-                        (current_data['NIM'].astype(str).str.contains(search_term, case=False, na=False))
-                    ]
-                elif 'Nama Lengkap' in current_data.columns:
-                    display_data = current_data[current_data['Nama Lengkap'].str.contains(search_term, case=False, na=False)]
+                # Indeks trigram Nama/NIM dibuat sekali per dataset, bukan str.contains per ketikan
+                positions = dataset.search(search_term)
                 filter_applied = True
             
-            if prodi_filter != "Semua" and 'prodi' in current_data.columns:
-                display_data = display_data[display_data['Prodi'] == prodi_filter]
+            if prodi_filter != "Semua" and 'prodi' in columns:
+                prodi_positions = dataset.match('Prodi', prodi_filter)
+                positions = prodi_positions if positions is None else np.intersect1d(positions, prodi_positions)
                 filter_applied = True
             
             # Peringatan jika filter aktif
@@ -2091,48 +2441,81 @@ def render_excel_upload_view(prodi_mapping):
                 # Edit mode - gunakan seluruh data
                 st.info("✏️ Mode Edit Aktif - Anda dapat mengedit data di bawah ini")
                 
-                edited_df = st.data_editor(
-                    st.session_state["admin_excel_data"],
+                # Editor selalu menerima data dasar yang sama; perubahan dibaca dari edit state
+                # di awal run berikutnya, jadi tidak ada perbandingan/salinan seluruh frame per edit
+                st.data_editor(
+                    dataset.editor_frame(),
                     use_container_width=True,
                     num_rows="dynamic",
-                    key="excel_data_editor",
+                    key=editor_key,
                     on_change=handle_data_change
                 )
                 
-                # Simpan perubahan ke session state
-                if not edited_df.equals(st.session_state["admin_excel_data"]):
-                    st.session_state["admin_excel_data"] = edited_df.copy()
-                    st.session_state["data_modified"] = True
-                    st.success("✅ Perubahan data tersimpan!")
+                if dataset.has_edits:
+                    summary = dataset.edit_summary()
+                    st.success(f"✅ Perubahan tercatat: {summary['edited_cells']} sel diedit, "
+                               f"{summary['added_rows']} baris ditambah, {summary['deleted_rows']} baris dihapus "
+                               "(diterapkan saat simpan/export)")
                 
             else:
-                # View mode - tampilkan data yang sudah difilter
+                # View mode - seluruh data atau hasil filter per halaman; hanya baris satu halaman
+                # yang dibentuk (tanpa menggabungkan buffer) dan dikirim ke browser
+                n_results = len(dataset) if positions is None else len(positions)
+                col1, col2 = st.columns([3, 1])
+                with col2:
+                    page_size = st.selectbox("Baris per Halaman", SEARCH_PAGE_SIZES, index=1, key="excel_page_size")
+                n_pages = max(-(-n_results // page_size), 1)
+                with col1:
+                    page = st.number_input(
+                        f"Halaman (dari {n_pages:,})", min_value=1, max_value=n_pages, value=1, step=1,
+                        # Kunci ikut pencarian agar halaman kembali ke 1 saat query berubah
+                        key=f"excel_page_{search_term}_{prodi_filter}_{page_size}"
+                    )
+                start_row = (page - 1) * page_size
+                page_positions = (np.arange(start_row, min(start_row + page_size, n_results)) if positions is None
+                                  else positions[start_row:start_row + page_size])
+                display_data = dataset.take(page_positions)
                 st.dataframe(display_data, use_container_width=True)
+                st.caption(f"Menampilkan baris {min(start_row + 1, n_results):,}–{start_row + len(display_data):,} "
+                           f"dari {n_results:,} {'baris' if positions is None else 'hasil'}")
+            
+            # Upsert per baris berdasarkan NIM; baris yang dihapus di editor tidak dihapus dari database
+            if st.button("💾 Simpan ke Database", key="admin_save_datastore",
+                         disabled="NIM" not in columns,
+                         help="Tambah atau perbarui data mahasiswa (berdasarkan NIM) di database"):
+                n_rows = get_datastore().upsert_students(dataset.to_frame())
+                st.session_state["data_modified"] = False
+                st.session_state.setdefault("admin_activity_log", []).append({
+                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'action': 'SAVE_DATASTORE',
+                    'details': f"Saved {n_rows} students to {DATASTORE_PATH}"
+                })
+                st.success(f"✅ {n_rows} baris data mahasiswa tersimpan di database")
             
             # Status indikator
             if st.session_state.get("data_modified", False):
-                st.info("📝 Data telah dimodifikasi. Jangan lupa untuk export data yang sudah diubah!")
-                
-                # Tombol untuk reset perubahan
+                st.info("📝 Data telah dimodifikasi. Jangan lupa simpan ke database atau export data yang sudah diubah!")
+            
+            if st.session_state.get("data_modified", False) or dataset.is_modified:
+                # Tombol untuk reset perubahan: buang log edit dan baris baru, kembali ke data yang dimuat
                 if st.button("🔄 Reset ke Data Asli", type="secondary", key="Reset"):
-                    if st.session_state.get("original_filename"):
-                        # Baca ulang file asli
-                        # Note: Ini memerlukan file asli masih tersedia
-                        st.session_state["data_modified"] = False
-                        st.rerun()
+                    dataset.reset()
+                    st.session_state["data_modified"] = False
+                    st.rerun()
         
         except Exception as e:
             st.error(f"❌ Error membaca file: {str(e)}")
     
     else:
-        st.info("📤 Silakan upload file Excel untuk mulai mengelola data")
+        st.info("📤 Silakan upload file Excel atau pilih sumber Database untuk mulai mengelola data")
 
 def render_add_data_form(prodi_mapping):
     """Render form untuk menambah data baru"""
     st.subheader("➕ Tambah Data Mahasiswa Baru")
     
     # Cek apakah ada data Excel yang sudah diupload
-    if "admin_excel_data" not in st.session_state or st.session_state["admin_excel_data"] is None:
+    dataset = st.session_state.get("admin_dataset")
+    if dataset is None:
         st.warning("⚠️ Silakan upload file Excel terlebih dahulu di tab 'Upload & View'")
         return
     
@@ -2163,9 +2546,8 @@ def render_add_data_form(prodi_mapping):
             if not nama_baru or not nim_baru:
                 st.error("❌ Nama dan NIM harus diisi!")
             else:
-                # Validasi NIM unik
-                existing_data = st.session_state["admin_excel_data"]
-                if 'NIM' in existing_data.columns and nim_baru in existing_data['NIM'].astype(str).values:
+                # Validasi NIM unik lewat hash set NIM dataset (termasuk edit yang belum disimpan)
+                if dataset.contains_id(nim_baru):
                     st.error(f"❌ NIM {nim_baru} sudah ada dalam data!")
                 else:
                     # Tambah data baru
@@ -2173,20 +2555,21 @@ def render_add_data_form(prodi_mapping):
                         nama_baru, nim_baru, prodi_baru, ipk_baru, jumlah_sks_baru,
                         nilai_mk_baru, kehadiran_baru, tugas_baru, skor_evaluasi_baru, lama_studi_baru
                     )
-                    st.success(f"✅ Data mahasiswa {nama_baru} berhasil ditambahkan!")
+                    st.success(f"✅ Data mahasiswa {nama_baru} berhasil ditambahkan! "
+                               f"Klik 💾 Simpan ke Database untuk menyimpannya.")
                     # st.rerun()
     
     # Tampilkan preview data yang sudah ada
-    if st.session_state["admin_excel_data"] is not None:
-        st.subheader("📊 Preview Data Terkini")
-        st.info(f"Total data: {len(st.session_state['admin_excel_data'])} mahasiswa")
-        st.dataframe(st.session_state["admin_excel_data"].tail(), use_container_width=True)
+    st.subheader("📊 Preview Data Terkini")
+    st.info(f"Total data: {len(dataset)} mahasiswa")
+    st.dataframe(dataset.tail(), use_container_width=True)
 
 def add_new_student_data(nama, nim, prodi, ipk, jumlah_sks, nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi):
     """Tambah data mahasiswa baru ke dataset - FIXED VERSION"""
     
     # Pastikan ada data existing
-    if "admin_excel_data" not in st.session_state:
+    dataset = st.session_state.get("admin_dataset")
+    if dataset is None:
         st.error("❌ Tidak ada data existing. Upload file Excel terlebih dahulu.")
         return False
     
@@ -2206,17 +2589,11 @@ def add_new_student_data(nama, nim, prodi, ipk, jumlah_sks, nilai_mk, kehadiran,
     }
     
     try:
-        # Ambil data existing
-        existing_data = st.session_state["admin_excel_data"].copy()
-        
-        # Buat row baru
-        new_row = pd.DataFrame([new_data])
+        # Tambah ke buffer dataset: tanpa salin/concat seluruh data, NIM dicek lewat hash set.
+        # Seperti edit di data editor, baris baru baru ditulis ke database lewat "Simpan ke Database"
+        # dan bisa dibatalkan dengan "Reset ke Data Asli"
+        dataset.append(new_data)
         
-        # Concatenate dengan data existing
-        updated_data = pd.concat([existing_data, new_row], ignore_index=True)
-        
-        # Update session state dengan data baru
-        st.session_state["admin_excel_data"] = updated_data
         st.session_state["data_modified"] = True
         
         # Log activity
@@ -2240,15 +2617,14 @@ def render_export_data_interface():
     st.subheader("📥 Export Data")
     
     # Cek apakah ada data untuk di-export
-    if "admin_excel_data" not in st.session_state or st.session_state["admin_excel_data"] is None:
+    dataset = st.session_state.get("admin_dataset")
+    if dataset is None:
         st.warning("⚠️ Tidak ada data untuk di-export. Silakan upload file Excel terlebih dahulu.")
         return
     
-    # Pastikan menggunakan data terbaru dari session state
-    data_to_export = st.session_state["admin_excel_data"].copy()
-    
-    # Informasi data
-    st.info(f"📊 Data siap export: {len(data_to_export)} baris")
+    # Tab ini dirender di setiap rerun: preview dan statistik dibaca tanpa menggabungkan
+    # buffer baris baru; DataFrame lengkap baru dibentuk saat tombol export diklik
+    st.info(f"📊 Data siap export: {len(dataset)} baris")
     
     # Status modifikasi
     if st.session_state.get("data_modified", False):
@@ -2258,7 +2634,9 @@ def render_export_data_interface():
     
     # Preview data
     with st.expander("👀 Preview Data yang akan di-export"):
-        st.dataframe(data_to_export, use_container_width=True)
+        st.dataframe(dataset.take(np.arange(min(EXPORT_PREVIEW_ROWS, len(dataset)))), use_container_width=True)
+        if len(dataset) > EXPORT_PREVIEW_ROWS:
+            st.caption(f"Menampilkan {EXPORT_PREVIEW_ROWS:,} baris pertama dari {len(dataset):,}")
     
     # Opsi export
     col1, col2 = st.columns(2)
@@ -2291,23 +2669,24 @@ def render_export_data_interface():
         st.markdown("### 📊 Statistik Data")
         
         # Tampilkan statistik singkat
-        if 'Prodi' in data_to_export.columns:
-            prodi_counts = data_to_export['Prodi'].value_counts()
+        if 'Prodi' in dataset.columns:
+            prodi_counts = dataset.value_counts('Prodi')
             st.write("**Distribusi Prodi:**")
             for prodi, count in prodi_counts.items():
                 st.write(f"• {prodi}: {count} mahasiswa")
         
-        if 'IPK' in data_to_export.columns:
+        if 'IPK' in dataset.columns:
+            ipk_mean, ipk_min, ipk_max = dataset.numeric_summary('IPK')
             st.write("**Statistik IPK:**")
-            st.write(f"• Rata-rata: {data_to_export['IPK'].mean():.2f}")
-            st.write(f"• Minimum: {data_to_export['IPK'].min():.2f}")
-            st.write(f"• Maksimum: {data_to_export['IPK'].max():.2f}")
+            st.write(f"• Rata-rata: {ipk_mean:.2f}")
+            st.write(f"• Minimum: {ipk_min:.2f}")
+            st.write(f"• Maksimum: {ipk_max:.2f}")
     
     # Tombol export
     if st.button("📥 Export Data", type="primary", use_container_width=True, key="Export"):
         try:
             # Pastikan menggunakan data terbaru
-            export_data = st.session_state["admin_excel_data"].copy()
+            export_data = dataset.to_frame()
             
             if export_format == "Excel (.xlsx)":
                 buffer = export_to_excel(
@@ -2317,7 +2696,7 @@ def render_export_data_interface():
                     include_statistics
                 )
                 file_extension = ".xlsx"
-                mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                mime_type = XLSX_MIME
             
             elif export_format == "CSV (.csv)":
                 buffer = export_to_csv(export_data)
@@ -2352,28 +2731,26 @@ def render_export_data_interface():
             st.code(str(e))
 
 def export_to_excel(data, filename, include_summary=True, include_statistics=True):
-    """Export data ke format Excel dengan multiple sheets"""
-    buffer = io.BytesIO()
+    """Export data ke format Excel dengan multiple sheets
     
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        # Sheet utama - data mahasiswa
-        data.to_excel(writer, sheet_name='Data_Mahasiswa', index=False)
-        
-        # Sheet summary
-        if include_summary:
-            summary_data = create_summary_data(data)
-            summary_data.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Sheet statistik
-        if include_statistics:
-            stats_data = create_statistics_data(data)
-            stats_data.to_excel(writer, sheet_name='Statistik', index=False)
-        
-        # Sheet metadata
-        metadata = create_metadata_sheet()
-        metadata.to_excel(writer, sheet_name='Metadata', index=False)
+    Mengembalikan file-like (BytesIO, atau file sementara untuk data besar)
+    yang bisa langsung diberikan ke st.download_button.
+    """
+    # Sheet utama - data mahasiswa
+    sheets = {'Data_Mahasiswa': data}
+    
+    # Sheet summary
+    if include_summary:
+        sheets['Summary'] = create_summary_data(data)
     
-    return buffer.getvalue()
+    # Sheet statistik
+    if include_statistics:
+        sheets['Statistik'] = create_statistics_data(data)
+    
+    # Sheet metadata
+    sheets['Metadata'] = create_metadata_sheet()
+    
+    return write_xlsx(sheets, spool=len(data) > EXPORT_SPOOL_ROWS)
 
 def export_to_csv(data):
     """Export data ke format CSV"""
@@ -2446,7 +2823,7 @@ def create_metadata_sheet():
             st.session_state.get('user_name', 'Admin'),
             'Student Prediction System v1.0',
             'Excel (.xlsx)',
-            len(st.session_state.get("admin_excel_data", []))
+            len(st.session_state.get("admin_dataset", []))
         ]
     }
     
@@ -2484,6 +2861,233 @@ def render_admin_activity_log():
         st.session_state["admin_activity_log"] = []
         st.rerun()
 
+def render_model_registry_panel():
+    """Render panel registry model: versi aktif, hot-swap, dan latensi per versi"""
+    st.subheader("🧠 Registry Model")
+    
+    registry = get_model_registry()
+    try:
+        versions = registry.versions()
+        active = registry.current()
+    except (OSError, ValueError, KeyError) as e:
+        st.error(f"Gagal membaca registry model: {e}")
+        return
+    
+    status = registry.status()
+    latency = registry.latency_stats()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Versi Aktif", active.version)
+    with col2:
+        st.metric("Waktu Load", f"{active.load_seconds:.2f} detik")
+    with col3:
+        st.metric("Memori Model", f"{active.memory_bytes / 2**20:.2f} MB")
+    
+    if status["loading"]:
+        st.info(f"⏳ Sedang memuat di background: {', '.join(status['loading'])}. "
+                "Permintaan baru tetap dilayani versi aktif sampai swap selesai.")
+    for version, error in status["errors"].items():
+        st.error(f"❌ Gagal memuat {version}: {error}")
+    
+    rows = []
+    for version, entry in versions.items():
+        stats = latency.get(version, {})
+        rows.append({
+            "Versi": version,
+            "Status": "Aktif" if version == active.version else
+                      ("Memuat" if version in status["loading"] else "-"),
+            "Deskripsi": entry.get("description", ""),
+            "Model": entry.get("model", ""),
+            "Panggilan": stats.get("panggilan", 0),
+            "Baris": stats.get("baris", 0),
+            "Rata-rata (ms)": stats.get("rata2_ms"),
+            "p50 (ms)": stats.get("p50_ms"),
+            "p95 (ms)": stats.get("p95_ms"),
+            "Maks (ms)": stats.get("maks_ms"),
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        target = st.selectbox("Pilih versi", list(versions), index=list(versions).index(active.version),
+                              key="registry_target_version")
+    with col2:
+        st.write("")
+        if st.button("🔄 Aktifkan", key="registry_activate", disabled=target == active.version):
+            registry.activate(target)
+            st.session_state.setdefault("admin_activity_log", []).append({
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'action': 'SWITCH_MODEL',
+                'details': f"Model version {active.version} -> {target}"
+            })
+            st.success(f"Versi {target} dimuat di background dan akan aktif setelah siap.")
+    
+    st.markdown("---")
+    st.subheader("⚡ Cache Prediksi")
+    cache_stats = get_prediction_cache().stats()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Hit", f"{cache_stats['hits']:,}")
+    with col2:
+        st.metric("Miss", f"{cache_stats['misses']:,}")
+    with col3:
+        st.metric("Hit Rate", f"{cache_stats['hit_rate']:.1%}")
+    with col4:
+        st.metric("Eviction", f"{cache_stats['evictions']:,}")
+    with col5:
+        st.metric("Entri", f"{cache_stats['entries']:,} / {cache_stats['max_entries']:,}")
+    st.caption(f"Kedaluwarsa (TTL {PREDICTION_CACHE_TTL:.0f} detik): {cache_stats['expirations']:,}")
+    
+    st.markdown("---")
+    st.subheader("📥 Cache Upload")
+    upload_stats = get_upload_cache().stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Parsing", f"{upload_stats['parses']:,}")
+    with col2:
+        st.metric("Parsing Dihindari", f"{upload_stats['parses_avoided']:,}")
+    with col3:
+        st.metric("File di Cache", f"{upload_stats['entries']:,}")
+    with col4:
+        st.metric("Memori", f"{upload_stats['bytes'] / 2**20:.1f} / {UPLOAD_CACHE_MB} MB")
+    
+    st.markdown("---")
+    st.subheader("📤 Cache Export")
+    export_stats = get_export_cache().stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("File Dibuat", f"{export_stats['builds']:,}")
+    with col2:
+        st.metric("Download dari Cache", f"{export_stats['hits']:,}")
+    with col3:
+        st.metric("File di Cache", f"{export_stats['entries']:,}")
+    with col4:
+        st.metric("Memori", f"{export_stats['bytes'] / 2**20:.1f} / {EXPORT_CACHE_MB} MB")
+    
+    st.markdown("---")
+    render_datastore_panel()
+    
+    st.markdown("---")
+    st.subheader("📅 Tabel Prediksi Terjadwal")
+    try:
+        table = _load_precomputed_table(file_version(PRECOMPUTED_PATH))
+    except (OSError, ValueError, KeyError) as e:
+        table = None
+        st.error(f"Gagal membaca {PRECOMPUTED_PATH}: {e}")
+    
+    if table is None:
+        st.info(f"Belum ada tabel. Jalankan `python precompute_predictions.py` "
+                f"(misalnya via cron setiap malam) untuk membuat {PRECOMPUTED_PATH}.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Mahasiswa", f"{len(table):,}")
+        with col2:
+            st.metric("Versi Model", table.version)
+        with col3:
+            st.metric("Dibuat", table.meta["created_at"])
+        if not table.matches_model(active):
+            st.warning("⚠️ Tabel dibuat dengan versi/file model yang berbeda sehingga tidak dipakai. "
+                       "Jalankan ulang `python precompute_predictions.py`.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🗑 Kosongkan Cache Prediksi", key="prediction_cache_clear"):
+            get_prediction_cache().clear()
+            st.rerun()
+    with col2:
+        if st.button("🔁 Refresh Status", key="registry_refresh"):
+            st.rerun()
+
+def render_datastore_panel():
+    """Render panel database: jumlah baris per tabel, impor file login, dan export ke Excel"""
+    st.subheader("🗄️ Database")
+    store = get_datastore()
+    counts = store.counts()
+    st.dataframe(pd.DataFrame({"Tabel": list(counts), "Baris": list(counts.values())}),
+                 use_container_width=True, hide_index=True)
+    st.caption(f"File database: {DATASTORE_PATH}")
+    
+    with st.expander("📉 Memori Tabel Mahasiswa"):
+        # Ukuran sebelum/sesudah dtype hemat (kategori, float32, int16, string Arrow). Membaca seluruh
+        # tabel mahasiswa dan menggabungkan buffer Kelola Excel, jadi hanya dihitung saat tombol ditekan
+        if st.button("📊 Hitung Memori", key="datastore_memory_button"):
+            tables = {"students (database)": compact_frame(store.read_frame('students'))}
+            dataset = st.session_state.get("admin_dataset")
+            if dataset is not None:
+                tables["Kelola Data Excel"] = dataset.to_frame()
+            st.session_state["datastore_memory_report"] = (datetime.now(), memory_report(tables))
+        computed_at, report = st.session_state.get("datastore_memory_report", (None, None))
+        if report is None:
+            st.info("Tekan Hitung Memori untuk mengukur memori tabel")
+        else:
+            st.caption(f"Dihitung {computed_at.strftime('%d/%m/%Y %H:%M:%S')}")
+            st.dataframe(report, use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        role = st.selectbox("Impor file login", list(USER_FILES), key="datastore_import_role",
+                            format_func=lambda r: USER_FILES[r][0])
+        import_file = st.file_uploader("File dengan layout yang sama", type=UPLOAD_EXTENSIONS,
+                                       key="datastore_import_file")
+        if st.button("📤 Impor ke Database", key="datastore_import", disabled=import_file is None):
+            id_column = USER_FILES[role][1]
+            if role == "mahasiswa":
+                schema = UPLOAD_SCHEMA
+            else:
+                schema = dict.fromkeys(["Nama Lengkap", id_column, "Role", "Email"], "text")
+            try:
+                df = read_upload(import_file, schema)
+                if id_column not in df.columns:
+                    raise ValueError(f"Kolom {id_column} tidak ditemukan")
+                n_rows = store.import_users(role, df, id_column)
+            except Exception as e:
+                st.error(f"❌ Gagal impor: {e}")
+            else:
+                st.session_state.setdefault("admin_activity_log", []).append({
+                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'action': 'IMPORT_DATASTORE',
+                    'details': f"Imported {n_rows} {role} rows from {import_file.name}"
+                })
+                st.success(f"✅ {n_rows} baris diimpor ke database")
+        
+        # File login di server hanya diimpor otomatis sekali (database baru); impor berikutnya eksplisit
+        filename = USER_FILES[role][0]
+        if st.button(f"📂 Impor Ulang {filename}", key="datastore_import_server",
+                     disabled=not os.path.exists(filename),
+                     help="Upsert isi file login di server; data database dengan ID yang sama ditimpa"):
+            n_rows = import_login_file(store, role)
+            if n_rows is False:
+                st.error(f"❌ {filename} kosong atau gagal dibaca")
+            else:
+                st.session_state.setdefault("admin_activity_log", []).append({
+                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'action': 'IMPORT_DATASTORE',
+                    'details': f"Imported {n_rows} {role} rows from {filename}"
+                })
+                st.success(f"✅ {n_rows} baris dari {filename} diimpor ke database")
+    
+    with col2:
+        targets = {USER_FILES[r][0]: r for r in USER_FILES}
+        targets.update({f"{table}.xlsx": table for table in ["transkrip", "kehadiran", "cpl", "cpmk", "predictions"]})
+        target = st.selectbox("Export tabel", list(targets), key="datastore_export_target")
+        
+        def build_sheets():
+            name = targets[target]
+            if name in USER_FILES:
+                return {"Sheet1": store.export_users(name, USER_FILES[name][1])}
+            return {"Sheet1": store.read_frame(name)}
+        
+        st.download_button(
+            label="📥 Download Excel",
+            data=deferred_xlsx(("datastore", DATASTORE_PATH, target, store.version()), build_sheets,
+                               counts.get(targets[target], counts["users"])),
+            file_name=target,
+            mime=XLSX_MIME,
+            key="datastore_export"
+        )
+
 def render_admin_dashboard():
     """Render dashboard khusus admin dengan fitur Excel management"""
     st.header("👨‍💼 Admin Dashboard")
@@ -2506,90 +3110,43 @@ def render_admin_dashboard():
     elif admin_menu == "📋 Log Aktivitas":
         render_admin_activity_log()
     elif admin_menu == "⚙️ Pengaturan Sistem":
-        st.info("Fitur pengaturan sistem akan segera hadir")
+        render_model_registry_panel()
 
 def handle_data_change():
     """Callback untuk handle perubahan data"""
     st.session_state["data_modified"] = True
 
-def init_cpl_cpmk_data():
-    """Inisialisasi data CPL/CPMK di session state"""
-    # Initialize cpl_data as list if it doesn't exist or if it's in old dictionary format
-    if "cpl_data" not in st.session_state:
-        st.session_state.cpl_data = []
-    elif isinstance(st.session_state.cpl_data, dict):
-        # Convert from old dictionary format to new list format
-        st.session_state.cpl_data = []
-    
-    # Initialize cpmk_data as list if it doesn't exist or if it's in old dictionary format
-    if "cpmk_data" not in st.session_state:
-        st.session_state.cpmk_data = []
-    elif isinstance(st.session_state.cpmk_data, dict):
-        # Convert from old dictionary format to new list format
-        st.session_state.cpmk_data = []
-
-def add_cpl(kode_cpl, deskripsi_cpl, kategori="Sikap"):
-    """Menambah CPL baru"""
-    # Ensure cpl_data is a list
-    if not isinstance(st.session_state.cpl_data, list):
-        st.session_state.cpl_data = []
-    
-    new_cpl = {
-        "id": len(st.session_state.cpl_data) + 1,
-        "kode_cpl": kode_cpl,
-        "deskripsi": deskripsi_cpl,
-        "kategori": kategori,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "created_by": st.session_state.get("username", "prodi_user")
-    }
-    st.session_state.cpl_data.append(new_cpl)
+def add_cpl(kode_cpl, deskripsi_cpl, kategori="Sikap", kontribusi=""):
+    """Menambah CPL baru ke database"""
+    get_datastore().add_cpl(kode_cpl, deskripsi_cpl, kategori, kontribusi,
+                            created_by=st.session_state.get("user_name") or "prodi_user")
     return True
 
-def add_cpmk(kode_cpmk, deskripsi_cpmk, mata_kuliah, sks, semester, cpl_terkait=[]):
-    """Menambah CPMK baru"""
-    # Ensure cpmk_data is a list
-    if not isinstance(st.session_state.cpmk_data, list):
-        st.session_state.cpmk_data = []
-    
-    new_cpmk = {
-        "id": len(st.session_state.cpmk_data) + 1,
-        "kode_cpmk": kode_cpmk,
-        "deskripsi": deskripsi_cpmk,
-        "mata_kuliah": mata_kuliah,
-        "sks": sks,
-        "semester": semester,
-        "cpl_terkait": cpl_terkait,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "created_by": st.session_state.get("username", "prodi_user")
-    }
-    st.session_state.cpmk_data.append(new_cpmk)
+def add_cpmk(kode_cpmk, deskripsi_cpmk, mata_kuliah, sks=None, semester=None, cpl_terkait=(),
+             kode_mk="", target=None):
+    """Menambah CPMK baru ke database"""
+    get_datastore().add_cpmk(kode_cpmk, deskripsi_cpmk, mata_kuliah, sks, semester, cpl_terkait,
+                             kode_mk=kode_mk, target=target,
+                             created_by=st.session_state.get("user_name") or "prodi_user")
     return True
 
 def delete_cpl(cpl_id):
     """Menghapus CPL berdasarkan ID"""
-    # Ensure cpl_data is a list
-    if not isinstance(st.session_state.cpl_data, list):
-        st.session_state.cpl_data = []
-        return True
-    
-    st.session_state.cpl_data = [cpl for cpl in st.session_state.cpl_data if cpl["id"] != cpl_id]
+    get_datastore().delete_cpl(cpl_id)
     return True
 
 def delete_cpmk(cpmk_id):
     """Menghapus CPMK berdasarkan ID"""
-    # Ensure cpmk_data is a list
-    if not isinstance(st.session_state.cpmk_data, list):
-        st.session_state.cpmk_data = []
-        return True
-    
-    st.session_state.cpmk_data = [cpmk for cpmk in st.session_state.cpmk_data if cpmk["id"] != cpmk_id]
+    get_datastore().delete_cpmk(cpmk_id)
     return True
 
 def show_cpl_cpmk_management():
     """Menampilkan fitur manajemen CPL/CPMK untuk role Prodi"""
     
-    # Inisialisasi data
-    init_cpl_cpmk_data()
+    # Data CPL/CPMK dari database
+    store = get_datastore()
+    cpl_records = store.cpl_records()
+    cpmk_records = store.cpmk_records()
     
     st.header("📋 Manajemen CPL/CPMK")
     st.write("Kelola Capaian Pembelajaran Lulusan (CPL) dan Capaian Pembelajaran Mata Kuliah (CPMK)")
@@ -2619,13 +3176,8 @@ def show_cpl_cpmk_management():
                 
                 if submitted_cpl:
                     if kode_cpl and deskripsi_cpl:
-                        # Ensure cpl_data is a list for validation
-                        if not isinstance(st.session_state.cpl_data, list):
-                            st.session_state.cpl_data = []
-                        
                         # Validasi kode CPL tidak duplikat
-                        existing_codes = [cpl["kode_cpl"] for cpl in st.session_state.cpl_data]
-                        if kode_cpl in existing_codes:
+                        if store.cpl_exists(kode_cpl):
                             st.error("❌ Kode CPL sudah ada! Gunakan kode yang berbeda.")
                         else:
                             add_cpl(kode_cpl, deskripsi_cpl, kategori_cpl)
@@ -2636,8 +3188,8 @@ def show_cpl_cpmk_management():
         
         # Tampilkan daftar CPL
         st.subheader("Daftar CPL")
-        if st.session_state.cpl_data:
-            df_cpl = pd.DataFrame(st.session_state.cpl_data)
+        if cpl_records:
+            df_cpl = pd.DataFrame(cpl_records)
             
             # Check if DataFrame has required columns
             if df_cpl.empty or 'kategori' not in df_cpl.columns:
@@ -2645,8 +3197,8 @@ def show_cpl_cpmk_management():
             else:
                 # Filter berdasarkan kategori
                 kategori_filter = st.multiselect("Filter berdasarkan Kategori:", 
-                                               options=df_cpl["kategori"].unique(),
-                                               default=df_cpl["kategori"].unique())
+                                               options=df_cpl["kategori"].dropna().unique(),
+                                               default=df_cpl["kategori"].dropna().unique())
             
                 if kategori_filter:
                     df_filtered = df_cpl[df_cpl["kategori"].isin(kategori_filter)]
@@ -2696,11 +3248,8 @@ def show_cpl_cpmk_management():
                 with col2:
                     semester = st.selectbox("Semester*", options=list(range(1, 9)))
                     # Pilih CPL terkait
-                    if st.session_state.cpl_data and isinstance(st.session_state.cpl_data, list):
-                        cpl_options = [f"{cpl['kode_cpl']} - {cpl['deskripsi'][:50]}..." 
-                                      for cpl in st.session_state.cpl_data]
-                    else:
-                        cpl_options = []
+                    cpl_options = [f"{cpl['kode_cpl']} - {cpl['deskripsi'][:50]}..." 
+                                   for cpl in cpl_records]
                     cpl_terkait = st.multiselect("CPL Terkait", options=cpl_options)
                 
                 deskripsi_cpmk = st.text_area("Deskripsi CPMK*", 
@@ -2711,13 +3260,9 @@ def show_cpl_cpmk_management():
                 
                 if submitted_cpmk:
                     if kode_cpmk and deskripsi_cpmk and mata_kuliah:
-                        # Ensure cpmk_data is a list for validation
-                        if not isinstance(st.session_state.cpmk_data, list):
-                            st.session_state.cpmk_data = []
-                        
-                        # Validasi kode CPMK tidak duplikat
-                        existing_codes = [cpmk["kode_cpmk"] for cpmk in st.session_state.cpmk_data]
-                        if kode_cpmk in existing_codes:
+                        # Validasi kode CPMK tidak duplikat; form ini tanpa kode MK (kode_mk ''),
+                        # jadi CPMK per mata kuliah dari Input Data CPL/CPMK tidak ikut dicek
+                        if store.cpmk_exists(kode_cpmk, kode_mk=""):
                             st.error("❌ Kode CPMK sudah ada! Gunakan kode yang berbeda.")
                         else:
                             # Extract kode CPL dari pilihan
@@ -2730,8 +3275,9 @@ def show_cpl_cpmk_management():
         
         # Tampilkan daftar CPMK
         st.subheader("Daftar CPMK")
-        if st.session_state.cpmk_data:
-            df_cpmk = pd.DataFrame(st.session_state.cpmk_data)
+        if cpmk_records:
+            # CPMK dari form Input Data CPL/CPMK tidak punya SKS/semester (NA)
+            df_cpmk = pd.DataFrame(cpmk_records).astype({"sks": "Int64", "semester": "Int64"})
             
             # Check if DataFrame has required columns
             if df_cpmk.empty or 'semester' not in df_cpmk.columns:
@@ -2739,8 +3285,8 @@ def show_cpl_cpmk_management():
             else:
                 # Filter berdasarkan semester
                 semester_filter = st.multiselect("Filter berdasarkan Semester:", 
-                                               options=sorted(df_cpmk["semester"].unique()),
-                                               default=sorted(df_cpmk["semester"].unique()))
+                                               options=sorted(df_cpmk["semester"].dropna().unique()),
+                                               default=sorted(df_cpmk["semester"].dropna().unique()))
                 
                 if semester_filter:
                     df_filtered = df_cpmk[df_cpmk["semester"].isin(semester_filter)]
@@ -2780,24 +3326,15 @@ def show_cpl_cpmk_management():
     with tab_mapping:
         st.subheader("Pemetaan CPL-CPMK")
         
-        # Ensure both data structures are lists
-        cpl_data_valid = (st.session_state.cpl_data and 
-                         isinstance(st.session_state.cpl_data, list) and 
-                         len(st.session_state.cpl_data) > 0)
-        cpmk_data_valid = (st.session_state.cpmk_data and 
-                          isinstance(st.session_state.cpmk_data, list) and 
-                          len(st.session_state.cpmk_data) > 0)
-        
-        if cpl_data_valid and cpmk_data_valid:
+        if cpl_records and cpmk_records:
             # Buat matriks pemetaan
             st.write("**Matriks Pemetaan CPL-CPMK**")
             
             # Buat DataFrame untuk matriks
-            cpl_list = [cpl['kode_cpl'] for cpl in st.session_state.cpl_data]
-            cpmk_list = [cpmk['kode_cpmk'] for cpmk in st.session_state.cpmk_data]
+            cpl_list = [cpl['kode_cpl'] for cpl in cpl_records]
             
             mapping_data = []
-            for cpmk in st.session_state.cpmk_data:
+            for cpmk in cpmk_records:
                 row = {"CPMK": cpmk['kode_cpmk'], "Mata Kuliah": cpmk['mata_kuliah']}
                 for cpl_code in cpl_list:
                     row[cpl_code] = "✓" if cpl_code in cpmk.get('cpl_terkait', []) else ""
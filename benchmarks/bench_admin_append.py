@@ -0,0 +1,75 @@
+"""Benchmark tambah mahasiswa di Kelola Excel: salin + concat per baris vs AdminDataset
+
+Jalur lama per baris: cek NIM dengan astype(str) atas seluruh kolom, lalu
+copy() dan pd.concat seluruh data. Jalur baru: cek NIM di hash set dan
+tambah ke buffer; DataFrame lengkap dibentuk sekali saat ditampilkan/export.
+
+Contoh:
+    python benchmarks/bench_admin_append.py --sizes 10k,80k --inserts 100
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from synthetic import make_student_frame, parse_sizes
+from admin_dataset import AdminDataset
+
+
+def new_record(i):
+    return {
+        'Nama Lengkap': f'Mahasiswa Baru {i}', 'NIM': str(10_000_000 + i), 'Role': 'Mahasiswa',
+        'Prodi': 'Manajemen', 'IPK': 3.0, 'Jumlah_SKS': 144, 'Nilai_Mata_Kuliah': 75,
+        'Jumlah_Kehadiran': 80, 'Jumlah_Tugas': 15, 'Skor_Evaluasi': 3.5, 'Lama_Studi': 8,
+    }
+
+
+def append_concat(df, inserts):
+    for i in range(inserts):
+        record = new_record(i)
+        if record['NIM'] in df['NIM'].astype(str).values:
+            raise ValueError('NIM duplikat')
+        existing = df.copy()
+        df = pd.concat([existing, pd.DataFrame([record])], ignore_index=True)
+    return df
+
+
+def append_dataset(dataset, inserts):
+    for i in range(inserts):
+        record = new_record(i)
+        if dataset.contains_id(record['NIM']):
+            raise ValueError('NIM duplikat')
+        dataset.append(record)
+    return dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,80k', help='jumlah baris data admin, dipisah koma')
+    parser.add_argument('--inserts', type=int, default=100, help='jumlah mahasiswa yang ditambahkan')
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'concat/baris':>13} {'dataset/baris':>14} {'bangun dataset':>15} {'to_frame':>10} identik")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_student_frame(n_rows)
+
+        start = time.perf_counter()
+        expected = append_concat(df, args.inserts)
+        concat_ms = (time.perf_counter() - start) / args.inserts * 1000
+
+        start = time.perf_counter()
+        dataset = AdminDataset(df)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        dataset = append_dataset(dataset, args.inserts)
+        dataset_ms = (time.perf_counter() - start) / args.inserts * 1000
+
+        start = time.perf_counter()
+        frame = dataset.to_frame()
+        frame_ms = (time.perf_counter() - start) * 1000
+        print(f"{n_rows:>9,} {concat_ms:>11.2f}ms {dataset_ms:>12.4f}ms {build_ms:>13.1f}ms "
+              f"{frame_ms:>8.1f}ms {frame.equals(expected)}")
+
+
+if __name__ == '__main__':
+    main()
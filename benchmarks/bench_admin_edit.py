@@ -0,0 +1,76 @@
+"""Benchmark edit sel di Kelola Excel: bandingkan + salin seluruh frame vs log perubahan AdminDataset
+
+Jalur lama per edit: edited_df.equals(data) lalu edited_df.copy() disimpan ke
+session state. Jalur baru: edit state data editor (edited_rows/added_rows/
+deleted_rows) dicatat dengan track_edits, dan baru diterapkan sekali saat
+to_frame (export/simpan). Frame hasil st.data_editor sendiri dibuat Streamlit
+di kedua jalur, jadi tidak ikut diukur.
+
+Contoh:
+    python benchmarks/bench_admin_edit.py --sizes 10k,100k --edits 50
+"""
+import argparse
+import time
+
+import numpy as np
+
+from synthetic import make_student_frame, parse_sizes
+from admin_dataset import AdminDataset
+
+
+def make_edits(n_rows, n_edits, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(n_rows, size=n_edits, replace=False)
+    return [(int(pos), round(float(value), 2)) for pos, value in zip(positions, rng.uniform(2, 4, n_edits))]
+
+
+def edit_compare_copy(df, edits):
+    """Jalur lama; mengembalikan data akhir dan rata-rata ms per edit"""
+    current = df
+    column = df.columns.get_loc('IPK')
+    elapsed = 0.0
+    for pos, value in edits:
+        edited_df = current.copy()
+        edited_df.iloc[pos, column] = value
+        start = time.perf_counter()
+        if not edited_df.equals(current):
+            current = edited_df.copy()
+        elapsed += time.perf_counter() - start
+    return current, elapsed / len(edits) * 1000
+
+
+def edit_change_log(dataset, edits):
+    state = {'edited_rows': {}, 'added_rows': [], 'deleted_rows': []}
+    elapsed = 0.0
+    for pos, value in edits:
+        # Edit state Streamlit bersifat kumulatif sejak editor dibuat
+        state['edited_rows'][pos] = {'IPK': value}
+        start = time.perf_counter()
+        dataset.track_edits(state)
+        elapsed += time.perf_counter() - start
+    return elapsed / len(edits) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris data admin, dipisah koma')
+    parser.add_argument('--edits', type=int, default=50, help='jumlah sel yang diedit')
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'salin/edit':>11} {'log/edit':>10} {'to_frame':>10} identik")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_student_frame(n_rows)
+        edits = make_edits(n_rows, args.edits)
+
+        expected, copy_ms = edit_compare_copy(df, edits)
+
+        dataset = AdminDataset(df)
+        log_ms = edit_change_log(dataset, edits)
+        start = time.perf_counter()
+        frame = dataset.to_frame()
+        frame_ms = (time.perf_counter() - start) * 1000
+        print(f"{n_rows:>9,} {copy_ms:>9.2f}ms {log_ms:>8.4f}ms {frame_ms:>8.1f}ms {frame.equals(expected)}")
+
+
+if __name__ == '__main__':
+    main()
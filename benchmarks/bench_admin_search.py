@@ -0,0 +1,74 @@
+"""Benchmark kotak "Cari berdasarkan Nama/NIM": str.contains per ketikan vs indeks trigram
+
+Jalur lama menjalankan str.contains atas Nama Lengkap dan NIM.astype(str)
+seluruh sheet di setiap rerun. Jalur baru membangun SearchIndex sekali per
+dataset (AdminDataset.search) lalu setiap query cukup mengiris posting list.
+Query diambil dari potongan nama/NIM acak seperti saat mengetik.
+
+Contoh:
+    python benchmarks/bench_admin_search.py --sizes 10k,100k,500k
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from synthetic import make_student_frame, parse_sizes
+from admin_dataset import AdminDataset
+
+QUERIES = 40
+
+
+def contains_search(df, query):
+    mask = (df['Nama Lengkap'].str.contains(query, case=False, na=False, regex=False) |
+            df['NIM'].astype(str).str.contains(query, case=False, na=False, regex=False))
+    return np.flatnonzero(mask.to_numpy())
+
+
+def make_queries(df, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(QUERIES // 2):
+        nama = df['Nama Lengkap'].iloc[rng.randrange(len(df))]
+        start = rng.randrange(len(nama) - 2)
+        queries.append(nama[start:start + rng.randint(3, 8)])
+        nim = str(df['NIM'].iloc[rng.randrange(len(df))])
+        queries.append(nim[:rng.randint(3, len(nim))])
+    return queries
+
+
+def timed_ms(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris data admin, dipisah koma')
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'jalur':<14} {'median':>9} {'maks':>9} {'bangun indeks':>14} identik")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_student_frame(n_rows)
+        queries = make_queries(df)
+        dataset = AdminDataset(df)
+
+        start = time.perf_counter()
+        dataset.search('')
+        build_ms = (time.perf_counter() - start) * 1000
+
+        same = all(np.array_equal(contains_search(df, query), dataset.search(query)) for query in queries)
+        for label, fn in (('str.contains', lambda query: contains_search(df, query)),
+                          ('indeks', dataset.search)):
+            median_ms, max_ms = timed_ms(fn, queries)
+            extra = f"{build_ms:>12.0f}ms {same}" if label == 'indeks' else ''
+            print(f"{n_rows:>9,} {label:<14} {median_ms:>7.2f}ms {max_ms:>7.2f}ms {extra}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark chart ringkasan batch per rerun: agregasi dari DataFrame hasil vs BatchSummary
+
+Jalur lama menghitung value_counts, groupby prodi x prediksi, dan px.histogram
+atas seluruh baris valid di setiap rerun (histogram ikut membawa semua nilai
+confidence ke browser). Jalur baru merender dari agregat yang dihitung saat
+prediksi.
+
+Contoh:
+    python benchmarks/bench_batch_summary.py --sizes 10k,100k,1m
+"""
+import argparse
+import time
+
+import plotly.express as px
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes
+
+REPEATS = 3
+
+
+def charts_from_rows(results):
+    """Jalur lama create_batch_summary_charts"""
+    valid = results[results['Error'].isna()]
+    counts = valid['Prediksi'].value_counts()
+    counts = counts[counts > 0]
+    fig_pie = px.pie(values=counts.values, names=counts.index)
+    prodi = valid.groupby(['Prodi', 'Prediksi'], observed=True).size().reset_index(name='Count')
+    fig_bar = px.bar(prodi, x='Prodi', y='Count', color='Prediksi', barmode='group')
+    fig_hist = px.histogram(valid, x='Confidence', nbins=20)
+    return fig_pie, fig_bar, fig_hist
+
+
+def charts_from_summary(summary):
+    fig_pie = px.pie(summary.prediksi_frame(), values='Count', names='Prediksi')
+    fig_bar = px.bar(summary.prodi_frame(), x='Prodi', y='Count', color='Prediksi', barmode='group')
+    fig_hist = px.bar(summary.confidence_frame(), x='Titik_Tengah', y='Count')
+    return fig_pie, fig_bar, fig_hist
+
+
+def timed(fn, arg):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        figures = fn(arg)
+    seconds = (time.perf_counter() - start) / REPEATS
+    payload = sum(len(fig.to_json()) for fig in figures)
+    return seconds * 1000, payload / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,1m)')
+    args = parser.parse_args()
+
+    from prediction_engine import BatchSummary, predict_batch_frame
+
+    model, prodi_mapping = load_model_artifacts()
+    print(f"{'baris':>9} {'sumber chart':<16} {'waktu':>10} {'JSON figure':>12} {'update agregat':>15}")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_student_frame(n_rows)
+        summary = BatchSummary()
+        results = predict_batch_frame(df, model, prodi_mapping)
+
+        start = time.perf_counter()
+        summary.update(results)
+        update_ms = (time.perf_counter() - start) * 1000
+
+        for label, fn, arg in (('DataFrame hasil', charts_from_rows, results),
+                               ('BatchSummary', charts_from_summary, summary)):
+            ms, kb = timed(fn, arg)
+            extra = f"{update_ms:>13.1f}ms" if fn is charts_from_summary else ''
+            print(f"{n_rows:>9,} {label:<16} {ms:>8.1f}ms {kb:>10,.0f}KB {extra}")
+
+
+if __name__ == '__main__':
+    main()
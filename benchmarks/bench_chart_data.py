@@ -0,0 +1,72 @@
+"""Benchmark ukuran dan waktu pembuatan figure: Plotly penuh vs reduksi chart_data
+
+Data sintetis kehadiran vs nilai (seperti render_rekap_nilai_absensi). Jalur
+penuh memakai px.scatter/px.box/px.histogram atas seluruh baris; jalur reduksi
+memakai scatter_figure, box_figure, dan bin_counts + histogram_figure.
+
+Contoh:
+    python benchmarks/bench_chart_data.py --sizes 10k,100k,1m
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from synthetic import parse_sizes
+
+NILAI = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'E': 0}
+
+
+def make_attendance_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    nilai = rng.choice(list(NILAI), size=n_rows, p=[0.3, 0.3, 0.2, 0.15, 0.05])
+    kehadiran = rng.uniform(40, 100, size=n_rows).round(1)
+    return pd.DataFrame({
+        'Nama': [f'Mahasiswa {i}' for i in range(n_rows)],
+        'Nilai': nilai,
+        'Nilai_Poin': pd.Series(nilai).map(NILAI).to_numpy(),
+        'Persentase_Kehadiran': kehadiran,
+        'Status_Kehadiran': np.where(kehadiran >= 75, 'Memenuhi', 'Tidak Memenuhi'),
+    })
+
+
+def full_figures(df):
+    return [
+        px.scatter(df, x='Persentase_Kehadiran', y='Nilai_Poin', color='Status_Kehadiran',
+                   hover_data=['Nama', 'Nilai']),
+        px.box(df, x='Nilai', y='Persentase_Kehadiran', color='Nilai'),
+        px.histogram(df, x='Persentase_Kehadiran', nbins=20),
+    ]
+
+
+def reduced_figures(df):
+    from chart_data import bin_counts, box_figure, histogram_figure, scatter_figure
+
+    fig_scatter, _ = scatter_figure(df, x='Persentase_Kehadiran', y='Nilai_Poin', color='Status_Kehadiran',
+                                    hover_data=['Nama', 'Nilai'])
+    return [
+        fig_scatter,
+        box_figure(df, x='Nilai', y='Persentase_Kehadiran'),
+        histogram_figure(bin_counts(df['Persentase_Kehadiran'], bins=20)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,1m)')
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'jalur':<8} {'waktu':>10} {'JSON figure':>12}")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_attendance_frame(n_rows)
+        for label, build in (('penuh', full_figures), ('reduksi', reduced_figures)):
+            start = time.perf_counter()
+            payload = sum(len(fig.to_json()) for fig in build(df))
+            ms = (time.perf_counter() - start) * 1000
+            print(f"{n_rows:>9,} {label:<8} {ms:>8.0f}ms {payload / 1024:>10,.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
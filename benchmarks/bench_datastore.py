@@ -0,0 +1,84 @@
+"""Benchmark data mahasiswa: file Excel sebagai penyimpanan vs database SQLite (datastore.py)
+
+Jalur Excel: login membaca seluruh workbook lalu memindai baris, dan menambah
+satu mahasiswa berarti membaca, menggabungkan, dan menulis ulang seluruh file.
+Jalur database: impor sekali, lalu login/data mahasiswa berupa query berindeks
+dan penambahan mahasiswa berupa upsert satu baris.
+
+Contoh:
+    python benchmarks/bench_datastore.py --sizes 10k,100k
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import make_student_frame, parse_sizes
+from datastore import Datastore
+
+REPEATS = 200
+
+
+def excel_lookup(path, nama, nim):
+    df = pd.read_excel(path)
+    match = df[(df['Nama Lengkap'].str.strip().str.lower() == nama.lower()) & (df['NIM'].astype(str) == nim)]
+    return match.iloc[0].to_dict() if len(match) else None
+
+
+def excel_append(path, row):
+    df = pd.read_excel(path)
+    pd.concat([df, row], ignore_index=True).to_excel(path, index=False)
+
+
+def timed_ms(fn, repeats=1):
+    start = time.perf_counter()
+    for i in range(repeats):
+        fn(i)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,50k', help='jumlah baris mahasiswa, dipisah koma')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_datastore_')
+    try:
+        print(f"{'baris':>9} {'operasi':<22} {'Excel':>11} {'database':>11}")
+        for n_rows in parse_sizes(args.sizes):
+            df = make_student_frame(n_rows)
+            path = os.path.join(work_dir, f'login_{n_rows}.xlsx')
+            df.to_excel(path, index=False)
+            store = Datastore(os.path.join(work_dir, f'akademik_{n_rows}.db'))
+
+            import_ms = timed_ms(lambda i: store.import_users('mahasiswa', df, 'NIM'))
+            target = df.iloc[n_rows // 2]
+            nama, nim = target['Nama Lengkap'], str(target['NIM'])
+
+            lookup = (timed_ms(lambda i: excel_lookup(path, nama, nim)),
+                      timed_ms(lambda i: store.lookup_user('mahasiswa', nama, nim), REPEATS))
+            student = (lookup[0], timed_ms(lambda i: store.get_student(nim), REPEATS))
+
+            def new_row(i):
+                row = df.iloc[[0]].copy()
+                row['NIM'] = 10_000_000 + i
+                row['Nama Lengkap'] = f'Mahasiswa Baru {i}'
+                return row
+
+            append = (timed_ms(lambda i: excel_append(path, new_row(i))),
+                      timed_ms(lambda i: store.upsert_students(new_row(i)), REPEATS))
+
+            print(f"{n_rows:>9,} {'impor awal (sekali)':<22} {'-':>11} {import_ms:>9.0f}ms")
+            for label, (excel_ms, db_ms) in (('login', lookup), ('data mahasiswa', student),
+                                             ('tambah 1 mahasiswa', append)):
+                print(f"{n_rows:>9,} {label:<22} {excel_ms:>9.0f}ms {db_ms:>9.3f}ms")
+            store.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
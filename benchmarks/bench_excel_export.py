@@ -0,0 +1,79 @@
+"""Benchmark export hasil batch ke Excel: pd.ExcelWriter vs write_xlsx
+
+Membandingkan cara lama (ExcelWriter openpyxl ke BytesIO lalu getvalue()) dengan
+write_xlsx (workbook write-only) ke memori dan ke file sementara (spool). Setiap
+export dijalankan di proses terpisah; puncak RSS diukur relatif terhadap memori
+setelah DataFrame hasil siap.
+
+Contoh:
+    python benchmarks/bench_excel_export.py --sizes 10k,100k
+"""
+import argparse
+import io
+import multiprocessing
+import time
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes, peak_rss_kb, reset_peak_rss
+
+WRITERS = ['pd.ExcelWriter', 'write_xlsx', 'write_xlsx (spool)']
+
+
+def _export(writer, results):
+    if writer == 'pd.ExcelWriter':
+        import pandas as pd
+
+        buffer = io.BytesIO()
+        with pd.ExcelWriter(buffer, engine='openpyxl') as excel:
+            results.to_excel(excel, sheet_name='Hasil_Sukses', index=False)
+        data = buffer.getvalue()
+        return len(data)
+
+    from excel_io import write_xlsx
+
+    output = write_xlsx({'Hasil_Sukses': results}, spool=writer.endswith('(spool)'))
+    output.seek(0, 2)
+    size = output.tell()
+    output.close()
+    return size
+
+
+def _measure(writer, n_rows, queue):
+    """Dijalankan di proses anak: (detik, puncak RSS tambahan dalam MB, ukuran file MB)"""
+    from prediction_engine import predict_batch_frame
+
+    model, prodi_mapping = load_model_artifacts()
+    results = predict_batch_frame(make_student_frame(n_rows), model, prodi_mapping)
+    results = results[results['Error'].isna()].drop(columns=['Error'])
+
+    reset_peak_rss()
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    size = _export(writer, results)
+    seconds = time.perf_counter() - start
+    queue.put((seconds, (peak_rss_kb() - baseline) / 1024, size / 2**20))
+
+
+def measure(writer, n_rows):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(writer, n_rows, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,500k)')
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'penulis':<20} {'waktu':>9} {'puncak RSS':>11} {'ukuran':>8}")
+    for n_rows in parse_sizes(args.sizes):
+        for writer in WRITERS:
+            seconds, peak_mb, size_mb = measure(writer, n_rows)
+            print(f"{n_rows:>9,} {writer:<20} {seconds:>8.2f}s {peak_mb:>9.0f}MB {size_mb:>6.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
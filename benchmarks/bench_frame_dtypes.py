@@ -0,0 +1,62 @@
+"""Benchmark memori tabel mahasiswa: dtype bawaan vs compact_frame (kategori, float32, int16)
+
+Tabel mahasiswa dipakai bersama lewat cache upload dan data Kelola Excel.
+compact_frame mengubah Prodi/Role menjadi kategori dan metrik menjadi
+float32/int16 hanya jika nilainya kembali utuh. Kolom "identik" memastikan
+input model (coerce_batch_inputs) sama persis dengan input dari frame asli.
+
+Contoh:
+    python benchmarks/bench_frame_dtypes.py --sizes 10k,100k,1m
+"""
+import argparse
+import time
+
+import numpy as np
+
+from synthetic import PRODI_NAMES, make_student_frame, parse_sizes
+from frame_dtypes import compact_frame
+from prediction_engine import coerce_batch_inputs
+from upload_cache import frame_nbytes
+
+REPEATS = 10
+
+
+def filter_ms(df):
+    """Rata-rata waktu filter Prodi seperti di Kelola Excel (ms)"""
+    prodi = df['Prodi'].iloc[0]
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        df[df['Prodi'] == prodi]
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def same_inputs(wide, compact):
+    prodi_mapping = {prodi: code for code, prodi in enumerate(PRODI_NAMES)}
+    expected, expected_errors, _ = coerce_batch_inputs(wide, prodi_mapping)
+    actual, actual_errors, _ = coerce_batch_inputs(compact, prodi_mapping)
+    return (np.array_equal(expected_errors, actual_errors)
+            and all(np.array_equal(expected[col], actual[col]) for col in expected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,1m)')
+    args = parser.parse_args()
+
+    print(f"{'baris':>9} {'sebelum':>10} {'sesudah':>10} {'hemat':>7} {'konversi':>10} "
+          f"{'filter lama':>12} {'filter baru':>12} identik")
+    for n_rows in parse_sizes(args.sizes):
+        wide = make_student_frame(n_rows)
+
+        start = time.perf_counter()
+        compact = compact_frame(wide)
+        convert_ms = (time.perf_counter() - start) * 1000
+
+        before, after = frame_nbytes(wide) / 2**20, frame_nbytes(compact) / 2**20
+        print(f"{n_rows:>9,} {before:>8.1f}MB {after:>8.1f}MB {(1 - after / before) * 100:>6.1f}% "
+              f"{convert_ms:>8.0f}ms {filter_ms(wide):>10.2f}ms {filter_ms(compact):>10.2f}ms "
+              f"{same_inputs(wide, compact)}")
+
+
+if __name__ == '__main__':
+    main()
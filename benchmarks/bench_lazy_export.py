@@ -0,0 +1,54 @@
+"""Benchmark biaya export per rerun: serialisasi XLSX langsung vs download tertunda (ExportCache)
+
+Sebelumnya setiap rerun halaman membuat file XLSX walaupun tombol download tidak
+diklik. Dengan ExportCache rerun hanya menghitung versi data dan membuat
+callable; file dibuat sekali saat diklik dan klik berikutnya memakai cache.
+
+Contoh:
+    python benchmarks/bench_lazy_export.py --sizes 3,1k,10k --reruns 20
+"""
+import argparse
+import time
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='3,1k,10k', help='jumlah baris, dipisah koma (mis. 3,1k,10k)')
+    parser.add_argument('--reruns', type=int, default=20, help='jumlah rerun halaman per ukuran')
+    args = parser.parse_args()
+
+    from excel_io import write_xlsx
+    from export_cache import ExportCache, frame_version
+    from prediction_engine import predict_batch_frame
+
+    model, prodi_mapping = load_model_artifacts()
+    print(f"{'baris':>9} {'langsung/rerun':>15} {'tertunda/rerun':>15} {'klik pertama':>13} {'klik ulang':>11}")
+    for n_rows in parse_sizes(args.sizes):
+        results = predict_batch_frame(make_student_frame(n_rows), model, prodi_mapping)
+
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            write_xlsx({'Hasil': results}).getvalue()
+        eager = (time.perf_counter() - start) / args.reruns
+
+        cache = ExportCache()
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            download = cache.deferred(('hasil', frame_version(results)), lambda: write_xlsx({'Hasil': results}))
+        lazy = (time.perf_counter() - start) / args.reruns
+
+        start = time.perf_counter()
+        download()
+        first_click = time.perf_counter() - start
+        start = time.perf_counter()
+        download()
+        repeat_click = time.perf_counter() - start
+
+        print(f"{n_rows:>9,} {eager * 1000:>13.1f}ms {lazy * 1000:>13.2f}ms "
+              f"{first_click * 1000:>11.1f}ms {repeat_click * 1000:>9.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark scoring batch: satu proses vs pool proses (1..N worker)
+
+Contoh:
+    python benchmarks/bench_parallel_scoring.py --sizes 10k,100k,1m --workers 1,2,4,8
+"""
+import argparse
+import os
+import time
+import warnings
+
+import pandas as pd
+
+from synthetic import ROOT_DIR, load_model_artifacts, make_student_frame, parse_sizes
+from prediction_engine import ParallelBatchScorer, predict_batch_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k,1m', help='jumlah baris, dipisah koma')
+    parser.add_argument('--workers', default=None, help='jumlah worker, dipisah koma (default: 1,2,4,..,cpu)')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    model, prodi_mapping = load_model_artifacts()
+    model_path = os.path.join(ROOT_DIR, 'random_forest_graduation_model.pkl')
+
+    cpu = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        worker_counts = sorted({1, cpu} | {2 ** i for i in range(1, cpu.bit_length()) if 2 ** i <= cpu})
+
+    scorers = {n: ParallelBatchScorer(model_path, n_workers=n) for n in worker_counts}
+    warmup = make_student_frame(2000, seed=1)
+    for scorer in scorers.values():
+        scorer.score(warmup, prodi_mapping)
+
+    print(f"{'baris':>10} {'mode':>12} {'detik':>9} {'baris/detik':>13} {'speedup':>8} identik")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_student_frame(n_rows)
+
+        start = time.perf_counter()
+        baseline = predict_batch_frame(df, model, prodi_mapping)
+        base_time = time.perf_counter() - start
+        print(f"{n_rows:>10,} {'1 proses':>12} {base_time:>9.2f} {n_rows / base_time:>13,.0f} {1.0:>8.2f} -")
+
+        for n_workers, scorer in scorers.items():
+            start = time.perf_counter()
+            result = scorer.score(df, prodi_mapping)
+            elapsed = time.perf_counter() - start
+            try:
+                pd.testing.assert_frame_equal(baseline, result)
+                identical = 'ya'
+            except AssertionError:
+                identical = 'TIDAK'
+            print(f"{n_rows:>10,} {f'{n_workers} worker':>12} {elapsed:>9.2f} "
+                  f"{n_rows / elapsed:>13,.0f} {base_time / elapsed:>8.2f} {identical}")
+
+    for scorer in scorers.values():
+        scorer.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Micro-benchmark: predict + predict_proba (lama) vs satu predict_proba (baru)
+
+Versi lama menelusuri setiap pohon dua kali per prediksi; predict_graduation_batch
+menurunkan label dari probabilitas sehingga forest hanya dievaluasi sekali.
+
+Contoh:
+    python benchmarks/bench_predict_api.py --sizes 1,1k,10k
+"""
+import argparse
+import timeit
+import warnings
+
+import numpy as np
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes
+from prediction_engine import (
+    build_feature_frame,
+    coerce_batch_inputs,
+    compute_model_features,
+    predict_graduation_batch,
+)
+
+
+def predict_two_calls(model, inputs):
+    """Alur lama: predict lalu predict_proba pada input yang sama"""
+    features = compute_model_features(*inputs)
+    X = build_feature_frame(features, model.feature_names_in_)
+    prediksi = model.predict(X)
+    probabilitas = model.predict_proba(X)
+    return prediksi, probabilitas
+
+
+def best_time(fn):
+    """Waktu terbaik per panggilan (detik)"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=max(number, 1))) / max(number, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,1k,10k', help='ukuran batch, dipisah koma')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    model, prodi_mapping = load_model_artifacts()
+
+    print(f"{'baris':>8} {'predict+proba':>15} {'proba saja':>12} {'rasio':>7} identik")
+    for n_rows in parse_sizes(args.sizes):
+        values, _, _ = coerce_batch_inputs(make_student_frame(n_rows), prodi_mapping)
+        inputs = [values[col] for col in ['Prodi', 'IPK', 'Jumlah_SKS', 'Nilai_Mata_Kuliah',
+                                          'Jumlah_Kehadiran', 'Jumlah_Tugas', 'Skor_Evaluasi',
+                                          'Lama_Studi']]
+
+        prediksi, probabilitas = predict_two_calls(model, inputs)
+        hasil = predict_graduation_batch(model, *inputs)
+        identical = np.array_equal(prediksi, hasil['prediksi']) \
+            and np.array_equal(probabilitas[:, 1], hasil['probabilitas_lulus'])
+
+        t_old = best_time(lambda: predict_two_calls(model, inputs))
+        t_new = best_time(lambda: predict_graduation_batch(model, *inputs))
+        print(f"{n_rows:>8,} {t_old * 1e3:>13.2f}ms {t_new * 1e3:>10.2f}ms "
+              f"{t_new / t_old:>7.2f} {'ya' if identical else 'TIDAK'}")
+
+
+if __name__ == '__main__':
+    main()
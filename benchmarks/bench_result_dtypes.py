@@ -0,0 +1,50 @@
+"""Benchmark ukuran dan kecepatan filter DataFrame hasil batch: kolom bertipe vs object
+
+Kolom bertipe: probabilitas float32, Prediksi dan Error kategori. Pembanding
+adalah DataFrame yang sama dengan kolom object/float64 (bentuk hasil lama).
+
+Contoh:
+    python benchmarks/bench_result_dtypes.py --sizes 10k,100k,1m
+"""
+import argparse
+import time
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes
+
+REPEATS = 10
+
+
+def filter_ms(df):
+    """Rata-rata waktu filter yang dipakai render_batch_results (ms)"""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        df[df['Prediksi'] == 'LULUS']
+        df[df['Error'].isna()]
+        df[df['Error'].notna()]
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,1m)')
+    args = parser.parse_args()
+
+    from prediction_engine import PROBABILITY_COLUMNS, predict_batch_frame
+
+    model, prodi_mapping = load_model_artifacts()
+    print(f"{'baris':>9} {'kolom':<8} {'memori':>9} {'filter':>10}")
+    for n_rows in parse_sizes(args.sizes):
+        df = make_student_frame(n_rows)
+        # 1% baris dengan prodi tidak dikenal agar ada data error
+        df.loc[df.index[::100], 'Prodi'] = 'Prodi Lama'
+        typed = predict_batch_frame(df, model, prodi_mapping)
+        untyped = typed.astype({'Prediksi': object, 'Error': object,
+                                **dict.fromkeys(PROBABILITY_COLUMNS, 'float64')})
+
+        for label, frame in (('object', untyped), ('bertipe', typed)):
+            memory_mb = frame.memory_usage(index=True, deep=True).sum() / 2**20
+            print(f"{n_rows:>9,} {label:<8} {memory_mb:>7.1f}MB {filter_ms(frame):>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
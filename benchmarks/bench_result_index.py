@@ -0,0 +1,69 @@
+"""Benchmark filter tabel hasil batch per rerun: salin + filter DataFrame vs BatchResultIndex
+
+Jalur lama menyalin hasil, memfilter per status/prodi, lalu mengirim seluruh
+baris ke st.dataframe. Jalur indeks memilih posisi yang sudah dihitung,
+mengurutkan (opsional), dan mengambil satu halaman.
+
+Contoh:
+    python benchmarks/bench_result_index.py --sizes 10k,100k,1m
+"""
+import argparse
+import time
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes
+
+REPEATS = 10
+PAGE_SIZE = 50
+
+
+def filter_copy(results, prediksi, prodi):
+    """Jalur lama render_batch_results (tanpa st.dataframe)"""
+    filtered = results.copy()
+    filtered = filtered[filtered['Prediksi'] == prediksi]
+    filtered = filtered[filtered['Prodi'] == prodi]
+    display = filtered.copy()
+    return display[display['Error'].isna()].drop(columns=['Error'])
+
+
+def filter_index(index, prediksi, prodi, sort_column=None):
+    positions = index.sorted_positions(index.positions(prediksi, prodi), sort_column, False)
+    return index.page(positions, 1, PAGE_SIZE).drop(columns=['Error'])
+
+
+def timed_ms(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        out = fn(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000, len(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,1m)')
+    args = parser.parse_args()
+
+    from prediction_engine import predict_batch_frame
+    from result_index import BatchResultIndex
+
+    model, prodi_mapping = load_model_artifacts()
+    print(f"{'baris':>9} {'jalur':<26} {'waktu':>9} {'baris dikirim':>14}")
+    for n_rows in parse_sizes(args.sizes):
+        results = predict_batch_frame(make_student_frame(n_rows), model, prodi_mapping)
+
+        start = time.perf_counter()
+        index = BatchResultIndex(results)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        cases = [
+            ('salin + filter', filter_copy, (results, 'LULUS', 'Manajemen')),
+            ('indeks', filter_index, (index, 'LULUS', 'Manajemen')),
+            ('indeks + urut Confidence', filter_index, (index, 'LULUS', 'Manajemen', 'Confidence')),
+        ]
+        print(f"{n_rows:>9,} {'bangun indeks (sekali)':<26} {build_ms:>7.1f}ms")
+        for label, fn, fn_args in cases:
+            ms, rows = timed_ms(fn, *fn_args)
+            print(f"{n_rows:>9,} {label:<26} {ms:>7.2f}ms {rows:>14,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark memori per sesi: salinan tabel pengguna per sesi vs UserDirectory bersama
+
+Cara lama: setiap login menyimpan DataFrame hasil st.cache_data di session_state.
+cache_data mengembalikan salinan (unpickle) di setiap pemanggilan, sehingga setiap
+sesi memegang satu salinan tabel. Cara baru (seperti app.get_user_directory): satu
+UserDirectory per proses yang dibangun dari tabel mahasiswa di database, dan sesi
+hanya menyimpan kunci pengguna serta record miliknya. Ukuran "baru" mencakup indeks
+bersama; database sendiri ada di disk dan tidak dihitung.
+
+Contoh:
+    python benchmarks/bench_session_memory.py --sessions 1,100,1000
+"""
+import argparse
+import gc
+import os
+import pickle
+import shutil
+import tempfile
+import tracemalloc
+
+from synthetic import make_student_frame, parse_sizes
+from datastore import Datastore
+from user_directory import UserDirectory
+
+
+def measure(fn):
+    """Memori (byte) yang masih dipegang setelah fn() selesai"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def old_sessions(df, n_sessions):
+    """Setiap sesi menyimpan salinan DataFrame (perilaku st.cache_data + df_users)"""
+    payload = pickle.dumps(df)
+    sessions = []
+    for i in range(n_sessions):
+        nama, nim = df['Nama Lengkap'].iat[i % len(df)], df['NIM'].iat[i % len(df)]
+        sessions.append({'user_name': nama, 'user_nim': str(nim), 'df_users': pickle.loads(payload)})
+    return sessions
+
+
+def new_sessions(store, df, n_sessions):
+    """Satu UserDirectory bersama dari database, sesi menyimpan kunci dan record miliknya"""
+    directory = UserDirectory(store.users_frame('mahasiswa', 'NIM'), 'NIM')
+    sessions = []
+    for i in range(n_sessions):
+        nama, nim = df['Nama Lengkap'].iat[i % len(df)], str(df['NIM'].iat[i % len(df)])
+        sessions.append({'user_name': nama, 'user_nim': nim, 'record': directory.lookup(nama, nim)})
+    return directory, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', default='1,100,1000', help='jumlah sesi simulasi, dipisah koma')
+    parser.add_argument('--rows', type=int, default=1000, help='jumlah baris tabel mahasiswa')
+    args = parser.parse_args()
+
+    df = make_student_frame(args.rows)
+    work_dir = tempfile.mkdtemp(prefix='bench_session_')
+    try:
+        store = Datastore(os.path.join(work_dir, 'akademik.db'))
+        store.import_users('mahasiswa', df, 'NIM')
+        print(f"Tabel mahasiswa: {args.rows:,} baris")
+        print(f"{'sesi':>6} {'lama total':>12} {'lama/sesi':>12} {'baru total':>12} {'baru/sesi':>12}")
+        for n_sessions in parse_sizes(args.sessions):
+            old = measure(lambda: old_sessions(df, n_sessions))
+            new = measure(lambda: new_sessions(store, df, n_sessions))
+            print(f"{n_sessions:>6,} {old / 2**20:>10.1f}MB {old / n_sessions / 1024:>10.1f}KB "
+                  f"{new / 2**20:>10.1f}MB {new / n_sessions / 1024:>10.1f}KB")
+        store.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
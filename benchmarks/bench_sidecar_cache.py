@@ -0,0 +1,57 @@
+"""Benchmark load file login: parsing XLSX (openpyxl) vs sidecar kolom .npy
+
+Untuk setiap ukuran, file login sintetis ditulis ke folder sementara lalu
+diukur: parsing XLSX dingin, load pertama (parsing + tulis sidecar), dan
+load hangat dari sidecar yang di-memory-map.
+
+Contoh:
+    python benchmarks/bench_sidecar_cache.py --sizes 10k,100k,1m
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import make_student_frame, parse_sizes
+from sidecar_cache import read_excel_cached
+
+
+def timed(fn):
+    """(hasil, detik) dari satu panggilan"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k,1m', help='jumlah baris pengguna, dipisah koma')
+    parser.add_argument('--warm-repeat', type=int, default=5, help='pengulangan load hangat')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_sidecar_')
+    try:
+        print(f"{'baris':>9} {'xlsx':>10} {'pertama':>10} {'hangat':>10} {'speedup':>8} identik")
+        for n_rows in parse_sizes(args.sizes):
+            path = os.path.join(work_dir, f'login_{n_rows}.xlsx')
+            cache_dir = os.path.join(work_dir, 'cache')
+            make_student_frame(n_rows).to_excel(path, index=False)
+
+            expected, t_xlsx = timed(lambda: pd.read_excel(path))
+            _, t_first = timed(lambda: read_excel_cached(path, cache_dir=cache_dir))
+            t_warm = min(timed(lambda: read_excel_cached(path, cache_dir=cache_dir))[1]
+                         for _ in range(args.warm_repeat))
+            identical = read_excel_cached(path, cache_dir=cache_dir).equals(expected)
+
+            print(f"{n_rows:>9,} {t_xlsx:>9.2f}s {t_first:>9.2f}s {t_warm * 1e3:>8.1f}ms "
+                  f"{t_xlsx / t_warm:>8.0f} {'ya' if identical else 'TIDAK'}")
+            os.remove(path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark inferensi: sklearn predict_proba vs CompiledForest (array node)
+
+Mengukur latensi per panggilan untuk beberapa ukuran batch dan memeriksa
+bahwa probabilitas identik bit-per-bit. Kolom df/matriks mengukur CompiledForest
+termasuk penyusunan input: DataFrame (build_feature_frame) vs matriks float32
+(build_feature_matrix, jalur predict_graduation_batch).
+
+Contoh:
+    python benchmarks/bench_tree_inference.py --sizes 1,10,100,1k,10k
+"""
+import argparse
+import timeit
+import warnings
+
+import numpy as np
+
+from synthetic import load_model_artifacts, make_student_frame, parse_sizes
+from prediction_engine import (
+    build_feature_frame,
+    build_feature_matrix,
+    coerce_batch_inputs,
+    compute_model_features,
+)
+from tree_inference import compile_forest
+
+
+def model_features(df, prodi_mapping):
+    """Fitur model per nama kolom dari DataFrame mahasiswa sintetis"""
+    inputs, _, _ = coerce_batch_inputs(df, prodi_mapping)
+    return compute_model_features(
+        inputs['Prodi'], inputs['IPK'], inputs['Jumlah_SKS'], inputs['Nilai_Mata_Kuliah'],
+        inputs['Jumlah_Kehadiran'], inputs['Jumlah_Tugas'], inputs['Skor_Evaluasi'],
+        inputs['Lama_Studi']
+    )
+
+
+def best_time(fn):
+    """Waktu terbaik per panggilan (detik)"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(number, 1)
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,10,100,1k,10k', help='ukuran batch, dipisah koma')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    model, prodi_mapping = load_model_artifacts()
+    forest = compile_forest(model)
+
+    names = model.feature_names_in_
+    print(f"{'baris':>8} {'sklearn':>12} {'compiled':>12} {'speedup':>8} identik "
+          f"{'df+compiled':>12} {'matriks+comp':>12}")
+    for n_rows in parse_sizes(args.sizes):
+        features = model_features(make_student_frame(n_rows), prodi_mapping)
+        X_df = build_feature_frame(features, names)
+        X = X_df.to_numpy()
+
+        identical = np.array_equal(model.predict_proba(X_df), forest.predict_proba(X)) \
+            and np.array_equal(forest.predict_proba(X), forest.predict_proba(build_feature_matrix(features, names)))
+        t_sklearn = best_time(lambda: model.predict_proba(X_df))
+        t_compiled = best_time(lambda: forest.predict_proba(X))
+        t_df = best_time(lambda: forest.predict_proba(build_feature_frame(features, names)))
+        t_matrix = best_time(lambda: forest.predict_proba(build_feature_matrix(features, names)))
+        print(f"{n_rows:>8,} {t_sklearn * 1e6:>10.0f}µs {t_compiled * 1e6:>10.0f}µs "
+              f"{t_sklearn / t_compiled:>8.1f} {'ya' if identical else 'TIDAK':>7} "
+              f"{t_df * 1e6:>10.0f}µs {t_matrix * 1e6:>10.0f}µs")
+
+if __name__ == '__main__':
+    main()
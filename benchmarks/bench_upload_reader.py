@@ -0,0 +1,76 @@
+"""Benchmark pembacaan file upload: pd.read_excel vs read_upload (XLSX/CSV/Parquet)
+
+File sintetis berisi kolom template ditambah beberapa kolom ekstra (seperti file
+hasil ekspor SIAKAD). Setiap pembacaan dijalankan di proses terpisah agar
+puncak memori (VmHWM) tidak saling memengaruhi.
+
+Contoh:
+    python benchmarks/bench_upload_reader.py --sizes 10k,100k,500k
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from synthetic import make_student_frame, parse_sizes, peak_rss_kb
+
+EXTRA_COLUMNS = ['Alamat', 'Email', 'No_HP', 'Angkatan', 'Catatan']
+
+
+def _measure(reader, path, queue):
+    """Dijalankan di proses anak: (detik, puncak RSS tambahan dalam MB, jumlah baris)"""
+    import pandas as pd
+    from excel_io import read_upload
+
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    df = pd.read_excel(path) if reader == 'pd.read_excel' else read_upload(path)
+    seconds = time.perf_counter() - start
+    queue.put((seconds, (peak_rss_kb() - baseline) / 1024, len(df)))
+
+
+def measure(reader, path):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(reader, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k,100k', help='jumlah baris, dipisah koma (mis. 10k,100k,500k)')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_upload_')
+    try:
+        print(f"{'baris':>9} {'pembaca':<24} {'waktu':>9} {'puncak RSS':>11}")
+        for n_rows in parse_sizes(args.sizes):
+            df = make_student_frame(n_rows)
+            for col in EXTRA_COLUMNS:
+                df[col] = f'{col} mahasiswa'
+
+            paths = {fmt: os.path.join(work_dir, f'upload_{n_rows}.{fmt}') for fmt in ('xlsx', 'csv', 'parquet')}
+            df.to_excel(paths['xlsx'], index=False)
+            df.to_csv(paths['csv'], index=False)
+            df.to_parquet(paths['parquet'], index=False)
+
+            cases = [('pd.read_excel', paths['xlsx'], 'pd.read_excel (xlsx)')]
+            cases += [('read_upload', path, f'read_upload ({fmt})') for fmt, path in paths.items()]
+            for reader, path, label in cases:
+                seconds, peak_mb, rows = measure(reader, path)
+                assert rows == n_rows, (label, rows)
+                print(f"{n_rows:>9,} {label:<24} {seconds:>8.2f}s {peak_mb:>9.0f}MB")
+
+            for path in paths.values():
+                os.remove(path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Generator data mahasiswa sintetis untuk benchmark"""
+import os
+import resource
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Benchmark dijalankan dari root repo: python benchmarks/<nama>.py
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+PRODI_NAMES = ['Akuntansi', 'Manajemen', 'Sistem Informasi', 'Teknik Elektro', 'Teknik Informatika']
+
+
+def make_student_frame(n_rows, seed=0):
+    """Buat DataFrame mahasiswa sintetis dengan kolom sesuai template batch"""
+    rng = np.random.default_rng(seed)
+    nim = rng.choice(np.arange(20000000, 29999999), size=n_rows, replace=False) \
+        if n_rows <= 1_000_000 else np.arange(20000000, 20000000 + n_rows)
+    return pd.DataFrame({
+        'Nama Lengkap': [f'Mahasiswa {i}' for i in range(n_rows)],
+        'NIM': nim,
+        'Role': 'Mahasiswa',
+        'Prodi': rng.choice(PRODI_NAMES, size=n_rows),
+        'IPK': rng.uniform(1.5, 4.0, size=n_rows).round(2),
+        'Jumlah_SKS': rng.integers(100, 160, size=n_rows),
+        'Nilai_Mata_Kuliah': rng.uniform(40, 100, size=n_rows).round(1),
+        'Jumlah_Kehadiran': rng.integers(40, 101, size=n_rows),
+        'Jumlah_Tugas': rng.integers(0, 40, size=n_rows),
+        'Skor_Evaluasi': rng.uniform(1.0, 5.0, size=n_rows).round(2),
+        'Lama_Studi': rng.integers(4, 15, size=n_rows),
+    })
+
+
+def load_model_artifacts():
+    """Muat model dan prodi mapping dari root repo"""
+    import pickle
+
+    with open(os.path.join(ROOT_DIR, 'random_forest_graduation_model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(ROOT_DIR, 'prodi_mapping.pkl'), 'rb') as f:
+        prodi_mapping = pickle.load(f)
+    return model, prodi_mapping
+
+
+def parse_sizes(text):
+    """Ubah '10k,100k,1m' menjadi [10000, 100000, 1000000]"""
+    sizes = []
+    for part in text.split(','):
+        part = part.strip().lower()
+        factor = 1
+        if part.endswith('k'):
+            factor, part = 1_000, part[:-1]
+        elif part.endswith('m'):
+            factor, part = 1_000_000, part[:-1]
+        sizes.append(int(float(part) * factor))
+    return sizes
+
+
+def peak_rss_kb():
+    """Puncak RSS proses saat ini (KB)
+
+    Di Linux memakai VmHWM karena ru_maxrss ikut terbawa dari proses induk
+    melewati exec dan akan menutupi pemakaian proses anak.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def reset_peak_rss():
+    """Reset puncak RSS (VmHWM) ke RSS saat ini agar tahap persiapan tidak ikut terukur
+
+    Hanya di Linux; di sistem lain tidak melakukan apa-apa.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
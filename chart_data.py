@@ -0,0 +1,123 @@
+"""Reduksi data chart Plotly agar ukuran figure tidak tumbuh dengan jumlah baris
+
+- Histogram dihitung di server (bin + jumlah), bukan dikirim per nilai.
+- Scatter di-downsample acak terstratifikasi per grup warna hingga batas titik.
+- Box plot di atas batas titik memakai statistik kuartil yang dihitung di server.
+- Trace scatter memakai WebGL jika jumlah titiknya besar.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Batas titik scatter/box yang dikirim ke browser
+DEFAULT_MAX_POINTS = 5000
+
+# Di atas jumlah titik ini scatter dirender dengan WebGL (scattergl)
+WEBGL_MIN_POINTS = 1000
+
+
+def bin_counts(values, bins=20, value_range=None):
+    """Histogram nilai numerik sebagai DataFrame (Batas_Bawah, Batas_Atas, Titik_Tengah, Count)"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if value_range is None:
+        value_range = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return pd.DataFrame({
+        'Batas_Bawah': edges[:-1],
+        'Batas_Atas': edges[1:],
+        'Titik_Tengah': (edges[:-1] + edges[1:]) / 2,
+        'Count': counts,
+    })
+
+
+def histogram_figure(binned, title=None, x_label=None, y_label='Jumlah'):
+    """Bar chart dari hasil bin_counts (satu batang per bin, tanpa celah seperti histogram)"""
+    fig = px.bar(
+        binned,
+        x='Titik_Tengah',
+        y='Count',
+        hover_data=['Batas_Bawah', 'Batas_Atas'],
+        title=title,
+        labels={'Titik_Tengah': x_label or 'Nilai', 'Count': y_label},
+    )
+    if len(binned):
+        fig.update_traces(width=float(binned['Batas_Atas'].iloc[0] - binned['Batas_Bawah'].iloc[0]))
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def stratified_sample(df, max_points=DEFAULT_MAX_POINTS, by=None, seed=0):
+    """Sampel acak maksimal max_points baris, proporsional per grup `by`
+
+    Setiap grup mendapat minimal satu titik sehingga kategori kecil tetap
+    terlihat. Urutan baris asli dipertahankan. DataFrame kecil dikembalikan apa adanya.
+    """
+    n_rows = len(df)
+    if n_rows <= max_points:
+        return df
+
+    rng = np.random.default_rng(seed)
+    if by is None:
+        chosen = rng.choice(n_rows, size=max_points, replace=False)
+    else:
+        codes, _ = pd.factorize(df[by], use_na_sentinel=False)
+        sizes = np.bincount(codes)
+        quota = np.maximum(np.floor(sizes * max_points / n_rows), 1).astype(np.int64)
+        quota = np.minimum(quota, sizes)
+        chosen = np.concatenate([
+            rng.choice(np.flatnonzero(codes == code), size=quota[code], replace=False)
+            for code in range(len(sizes))
+        ])
+    return df.iloc[np.sort(chosen)]
+
+
+def scatter_figure(df, x, y, max_points=DEFAULT_MAX_POINTS, color=None, **px_kwargs):
+    """px.scatter dengan downsampling terstratifikasi (per color) dan WebGL untuk titik banyak
+
+    Mengembalikan (figure, jumlah titik yang ditampilkan).
+    """
+    sample = stratified_sample(df, max_points=max_points, by=color)
+    render_mode = 'webgl' if len(sample) > WEBGL_MIN_POINTS else 'svg'
+    fig = px.scatter(sample, x=x, y=y, color=color, render_mode=render_mode, **px_kwargs)
+    return fig, len(sample)
+
+
+def _box_stats(values):
+    """Statistik box plot Plotly (whisker 1.5 IQR dibatasi ke data) untuk satu grup"""
+    values = np.sort(values[np.isfinite(values)])
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'q1': q1, 'median': median, 'q3': q3, 'mean': values.mean(),
+        'lowerfence': inside.min(), 'upperfence': inside.max(),
+    }
+
+
+def box_figure(df, x, y, max_points=DEFAULT_MAX_POINTS, title=None, **px_kwargs):
+    """px.box untuk data kecil; di atas max_points memakai kuartil per grup yang dihitung di server
+
+    Mode statistik tidak menampilkan titik outlier satu per satu. Warna mengikuti grup x.
+    """
+    if len(df) <= max_points:
+        return px.box(df, x=x, y=y, color=x, title=title, **px_kwargs)
+
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    for i, (group, values) in enumerate(df.groupby(x, sort=False)[y]):
+        values = values.to_numpy(dtype=np.float64)
+        if not np.isfinite(values).any():
+            continue
+        stats = _box_stats(values)
+        fig.add_trace(go.Box(
+            name=str(group),
+            x=[group],
+            q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']], mean=[stats['mean']],
+            lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']],
+            marker_color=colors[i % len(colors)],
+            boxpoints=False,
+        ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, legend_title_text=x)
+    return fig
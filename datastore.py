@@ -0,0 +1,460 @@
+"""Penyimpanan data akademik di SQLite sebagai sumber data utama
+
+Pengguna, fitur mahasiswa, hasil prediksi, CPL, CPMK, transkrip, dan kehadiran
+disimpan dalam tabel berindeks sesuai pola akses aplikasi: login per (role, ID),
+data mahasiswa per NIM, transkrip/kehadiran per NIM dan mata kuliah. Penulisan
+berupa upsert per baris, bukan menulis ulang seluruh file. File Excel hanya
+dipakai untuk impor dan ekspor dengan layout kolom yang sama seperti sebelumnya.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from frame_dtypes import widen_column
+from user_directory import normalize_id, normalize_name
+
+DATASTORE_PATH = 'akademik.db'
+
+# Layout kolom Excel per tabel: kolom Excel -> (kolom tabel, tipe SQL), urut sesuai file
+STUDENT_COLUMNS = {
+    'Nama Lengkap': ('nama_lengkap', 'TEXT'),
+    'NIM': ('nim', 'TEXT'),
+    'Prodi': ('prodi', 'TEXT'),
+    'IPK': ('ipk', 'REAL'),
+    'Jumlah_SKS': ('jumlah_sks', 'INTEGER'),
+    'Nilai_Mata_Kuliah': ('nilai_mata_kuliah', 'REAL'),
+    'Jumlah_Kehadiran': ('jumlah_kehadiran', 'INTEGER'),
+    'Jumlah_Tugas': ('jumlah_tugas', 'INTEGER'),
+    'Skor_Evaluasi': ('skor_evaluasi', 'REAL'),
+    'Lama_Studi': ('lama_studi', 'INTEGER'),
+    'Role': ('role', 'TEXT'),
+}
+
+TRANSCRIPT_COLUMNS = {
+    'NIM': ('nim', 'TEXT'),
+    'Nama': ('nama', 'TEXT'),
+    'Kode_MK': ('kode_mk', 'TEXT'),
+    'Nama_MK': ('nama_mk', 'TEXT'),
+    'SKS': ('sks', 'INTEGER'),
+    'Nilai': ('nilai', 'TEXT'),
+    'Semester': ('semester', 'INTEGER'),
+}
+
+ATTENDANCE_COLUMNS = {
+    'NIM': ('nim', 'TEXT'),
+    'Nama': ('nama', 'TEXT'),
+    'Kode_MK': ('kode_mk', 'TEXT'),
+    'Nama_MK': ('nama_mk', 'TEXT'),
+    'Pertemuan': ('pertemuan', 'INTEGER'),
+    'Hadir': ('hadir', 'INTEGER'),
+    'Persentase_Kehadiran': ('persentase_kehadiran', 'REAL'),
+}
+
+CPL_COLUMNS = {
+    'Kode_CPL': ('kode_cpl', 'TEXT'),
+    'Deskripsi_CPL': ('deskripsi', 'TEXT'),
+    'Kategori': ('kategori', 'TEXT'),
+    'Kontribusi_CPMK': ('kontribusi_cpmk', 'TEXT'),
+    'Tingkat_Pencapaian': ('tingkat_pencapaian', 'REAL'),
+}
+
+CPMK_COLUMNS = {
+    'Kode_MK': ('kode_mk', 'TEXT'),
+    'Nama_MK': ('mata_kuliah', 'TEXT'),
+    'Kode_CPMK': ('kode_cpmk', 'TEXT'),
+    'Deskripsi_CPMK': ('deskripsi', 'TEXT'),
+    'SKS': ('sks', 'INTEGER'),
+    'Semester': ('semester', 'INTEGER'),
+    'Pencapaian_Rata2': ('pencapaian_rata2', 'REAL'),
+    'Target': ('target', 'REAL'),
+    'CPL_Terkait': ('cpl_terkait', 'TEXT'),
+}
+
+PREDICTION_COLUMNS = {
+    'NIM': ('nim', 'TEXT'),
+    'Nama Lengkap': ('nama_lengkap', 'TEXT'),
+    'Prodi': ('prodi', 'TEXT'),
+    'Prediksi': ('prediksi', 'TEXT'),
+    'Probabilitas_Lulus': ('probabilitas_lulus', 'REAL'),
+    'Probabilitas_Tidak_Lulus': ('probabilitas_tidak_lulus', 'REAL'),
+    'Confidence': ('confidence', 'REAL'),
+    'Versi_Model': ('model_version', 'TEXT'),
+    'Kunci_Input': ('input_key', 'TEXT'),
+    'Waktu': ('created_at', 'TEXT'),
+}
+
+# Tabel yang punya layout Excel: (layout kolom, kunci upsert atau None untuk append saja).
+# Kunci prediksi tidak boleh NULL (NULL tidak pernah konflik): hasil batch tanpa hash input
+# memakai input_key '' sehingga tersimpan satu baris per NIM dan versi model.
+TABLES = {
+    'students': (STUDENT_COLUMNS, ('nim',)),
+    'transkrip': (TRANSCRIPT_COLUMNS, ('nim', 'kode_mk', 'semester')),
+    'kehadiran': (ATTENDANCE_COLUMNS, ('nim', 'kode_mk')),
+    'cpl': (CPL_COLUMNS, ('kode_cpl',)),
+    'cpmk': (CPMK_COLUMNS, ('kode_mk', 'kode_cpmk')),
+    'predictions': (PREDICTION_COLUMNS, ('nim', 'model_version', 'input_key')),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS users (
+    role TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    nama_key TEXT NOT NULL,
+    nama_lengkap TEXT,
+    role_label TEXT,
+    email TEXT,
+    PRIMARY KEY (role, user_id, nama_key)
+);
+CREATE TABLE IF NOT EXISTS students (
+    nim TEXT PRIMARY KEY, nama_lengkap TEXT, prodi TEXT, ipk REAL, jumlah_sks INTEGER,
+    nilai_mata_kuliah REAL, jumlah_kehadiran INTEGER, jumlah_tugas INTEGER,
+    skor_evaluasi REAL, lama_studi INTEGER, role TEXT
+);
+CREATE INDEX IF NOT EXISTS students_prodi ON students (prodi);
+CREATE TABLE IF NOT EXISTS transkrip (
+    id INTEGER PRIMARY KEY, nim TEXT NOT NULL, nama TEXT, kode_mk TEXT NOT NULL, nama_mk TEXT,
+    sks INTEGER, nilai TEXT, semester INTEGER,
+    UNIQUE (nim, kode_mk, semester)
+);
+CREATE INDEX IF NOT EXISTS transkrip_nama_mk ON transkrip (nama_mk);
+CREATE TABLE IF NOT EXISTS kehadiran (
+    id INTEGER PRIMARY KEY, nim TEXT NOT NULL, nama TEXT, kode_mk TEXT NOT NULL, nama_mk TEXT,
+    pertemuan INTEGER, hadir INTEGER, persentase_kehadiran REAL,
+    UNIQUE (nim, kode_mk)
+);
+CREATE INDEX IF NOT EXISTS kehadiran_nama_mk ON kehadiran (nama_mk);
+CREATE TABLE IF NOT EXISTS cpl (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, kode_cpl TEXT NOT NULL UNIQUE, deskripsi TEXT,
+    kategori TEXT, kontribusi_cpmk TEXT, tingkat_pencapaian REAL,
+    created_at TEXT, created_by TEXT
+);
+CREATE TABLE IF NOT EXISTS cpmk (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, kode_mk TEXT NOT NULL DEFAULT '', mata_kuliah TEXT,
+    kode_cpmk TEXT NOT NULL, deskripsi TEXT, sks INTEGER, semester INTEGER,
+    pencapaian_rata2 REAL, target REAL, cpl_terkait TEXT,
+    created_at TEXT, created_by TEXT,
+    UNIQUE (kode_mk, kode_cpmk)
+);
+CREATE INDEX IF NOT EXISTS cpmk_kode ON cpmk (kode_cpmk);
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, nim TEXT NOT NULL, nama_lengkap TEXT, prodi TEXT,
+    prediksi TEXT, probabilitas_lulus REAL, probabilitas_tidak_lulus REAL, confidence REAL,
+    model_version TEXT NOT NULL DEFAULT '', input_key TEXT NOT NULL DEFAULT '', created_at TEXT,
+    UNIQUE (nim, model_version, input_key)
+);
+CREATE INDEX IF NOT EXISTS predictions_nim ON predictions (nim, id);
+"""
+
+
+def now_text():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _sql_values(series, sql_type, is_id=False):
+    """Kolom DataFrame sebagai list nilai Python untuk sqlite3 (NaN -> None)
+
+    ID numerik dari Excel (mis. NIM int64 atau float karena ada sel kosong)
+    disimpan sebagai teks tanpa '.0' dan tanpa spasi, sama seperti pencocokan login lama.
+    """
+    if sql_type == 'TEXT':
+        if series.dtype.kind == 'f' and np.all(np.mod(series.dropna(), 1) == 0):
+            series = series.astype('Int64')
+        mask = series.isna().to_numpy()
+        series = series.astype(str)
+        values = (series.str.strip() if is_id else series).to_numpy(dtype=object)
+    else:
+        numeric = pd.to_numeric(series, errors='coerce')
+        # Desimal asli float32 (0.7, bukan 0.699999988), sama seperti export Excel
+        numeric = widen_column(numeric)
+        # Float bulat di kolom INTEGER disimpan SQLite sebagai integer (type affinity)
+        numeric = numeric.astype(np.float64)
+        mask = numeric.isna().to_numpy()
+        values = numeric.to_numpy().astype(object)
+    values[mask] = None
+    return values.tolist()
+
+
+def _id_layout(series):
+    """Kolom ID teks kembali ke int64 jika semuanya angka (seperti NIM/NIDN di file Excel)
+
+    ID tetap disimpan sebagai TEXT; jika ada ID dengan nol di depan (mis. "0123"),
+    kolom dibiarkan teks agar nol tersebut tidak hilang di file export.
+    """
+    if len(series) and series.notna().all() and series.str.fullmatch(r'0|[1-9]\d{0,17}').all():
+        return series.astype(np.int64)
+    return series
+
+
+def _select_layout(layout):
+    """Daftar kolom SELECT dengan alias nama kolom Excel"""
+    return ', '.join(f'{col} AS "{name}"' for name, (col, _) in layout.items())
+
+
+class Datastore:
+    """Satu koneksi SQLite (mode WAL) dipakai bersama antar sesi Streamlit
+
+    Semua akses lewat satu lock sehingga aman dipanggil dari thread sesi mana pun
+    maupun thread download. Record yang dikembalikan selalu salinan baru.
+    """
+
+    def __init__(self, path=DATASTORE_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # Naik setiap tabel users/students ditulis; kunci cache UserDirectory
+        self._users_version = 0
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def version(self):
+        """Jumlah perubahan baris sejak koneksi dibuka; naik setiap ada penulisan"""
+        with self._lock:
+            return self._conn.total_changes
+
+    def users_version(self):
+        """Jumlah penulisan ke tabel users/students sejak koneksi dibuka"""
+        with self._lock:
+            return self._users_version
+
+    @contextmanager
+    def transaction(self):
+        """Satu transaksi untuk beberapa penulisan; boleh bersarang (commit di level terluar)"""
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self._conn
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.rollback()
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.commit()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql, rows):
+        with self.transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def count(self, table):
+        return self._query(f'SELECT COUNT(*) FROM {table}')[0][0]
+
+    def counts(self):
+        """Jumlah baris per tabel"""
+        return {table: self.count(table) for table in ['users', *TABLES]}
+
+    # --- tabel dengan layout Excel ---------------------------------------------
+
+    def upsert_frame(self, table, df):
+        """Tulis baris DataFrame (layout Excel) ke tabel: insert, atau update jika kunci sudah ada
+
+        Kolom layout yang tidak ada di df ditulis NULL. Mengembalikan jumlah baris.
+        """
+        layout, key = TABLES[table]
+        columns = [(name, col, sql_type) for name, (col, sql_type) in layout.items() if name in df.columns]
+        if not columns or len(df) == 0:
+            return 0
+        names = [col for _, col, _ in columns]
+        sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        if key is not None:
+            updates = [col for col in names if col not in key]
+            sql += f" ON CONFLICT ({', '.join(key)}) DO "
+            sql += (f"UPDATE SET {', '.join(f'{col} = excluded.{col}' for col in updates)}"
+                    if updates else 'NOTHING')
+        values = [_sql_values(df[name], sql_type, is_id=key is not None and col in key)
+                  for name, col, sql_type in columns]
+        self._write(sql, zip(*values))
+        return len(df)
+
+    def read_frame(self, table):
+        """Baris tabel sebagai DataFrame dengan layout kolom Excel"""
+        layout, _ = TABLES[table]
+        rows = self._query(f'SELECT {_select_layout(layout)} FROM {table} ORDER BY rowid')
+        df = pd.DataFrame([tuple(row) for row in rows], columns=list(layout))
+        for name, (_, sql_type) in layout.items():
+            if sql_type != 'TEXT':
+                df[name] = pd.to_numeric(df[name])
+        return df
+
+    # --- pengguna dan mahasiswa -------------------------------------------------
+
+    def import_users(self, role, df, id_column):
+        """Impor file login (layout Excel) untuk satu role; mahasiswa juga ke tabel students"""
+        df = df[df[id_column].notna()] if id_column in df.columns else df.iloc[:0]
+        if role == 'mahasiswa':
+            return self.upsert_students(df.rename(columns={id_column: 'NIM'}))
+        self._upsert_users(role, df, id_column)
+        return len(df)
+
+    def _upsert_users(self, role, df, id_column):
+        ids = _sql_values(df[id_column], 'TEXT', is_id=True)
+        nama = _sql_values(df['Nama Lengkap'], 'TEXT') if 'Nama Lengkap' in df.columns else [None] * len(df)
+        optional = [
+            _sql_values(df[column], 'TEXT') if column in df.columns else [None] * len(df)
+            for column in ('Role', 'Email')
+        ]
+        rows = [
+            (role, user_id, '' if name is None else normalize_name(name), name, label, email)
+            for user_id, name, label, email in zip(ids, nama, *optional)
+        ]
+        with self.transaction():
+            self._users_version += 1
+            if role == 'mahasiswa':
+                # Satu akun per NIM: akun lama dihapus agar perubahan nama tidak meninggalkan login lama
+                self._write("DELETE FROM users WHERE role = 'mahasiswa' AND user_id = ?",
+                            [(user_id,) for user_id in ids])
+            # Login dicocokkan per (nama, ID); dosen boleh berbagi NIDN seperti di file Excel
+            self._write(
+                "INSERT INTO users (role, user_id, nama_key, nama_lengkap, role_label, email) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (role, user_id, nama_key) DO UPDATE SET "
+                "nama_lengkap = excluded.nama_lengkap, role_label = excluded.role_label, "
+                "email = excluded.email",
+                rows
+            )
+
+    def upsert_students(self, df):
+        """Tulis data mahasiswa (layout login_mahasiswa.xlsx) beserta akun loginnya"""
+        if 'NIM' not in df.columns:
+            raise ValueError("Kolom NIM tidak ditemukan")
+        df = df[df['NIM'].notna()]
+        with self.transaction():
+            n_rows = self.upsert_frame('students', df)
+            self._upsert_users('mahasiswa', df, 'NIM')
+        return n_rows
+
+    def lookup_user(self, role, nama, id_user):
+        """Data login (dict) yang cocok dengan role, nama, dan ID, atau None"""
+        rows = self._query(
+            'SELECT user_id, nama_lengkap, role_label, email FROM users '
+            'WHERE role = ? AND user_id = ? AND nama_key = ?',
+            (role, normalize_id(id_user), normalize_name(nama))
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return {'ID': row['user_id'], 'Nama Lengkap': row['nama_lengkap'],
+                'Role': row['role_label'], 'Email': row['email']}
+
+    def get_student(self, nim):
+        """Data mahasiswa (dict, layout Excel) berdasarkan NIM, atau None"""
+        rows = self._query(f'SELECT {_select_layout(STUDENT_COLUMNS)} FROM students WHERE nim = ?',
+                           (normalize_id(nim),))
+        return dict(rows[0]) if rows else None
+
+    def users_frame(self, role, id_column):
+        """Tabel login satu role (ID sebagai teks); mahasiswa berupa tabel students lengkap"""
+        if role == 'mahasiswa':
+            return self.read_frame('students')
+        rows = self._query(
+            'SELECT nama_lengkap, user_id, role_label, email FROM users WHERE role = ? ORDER BY rowid',
+            (role,)
+        )
+        return pd.DataFrame([tuple(row) for row in rows], columns=['Nama Lengkap', id_column, 'Role', 'Email'])
+
+    def export_users(self, role, id_column):
+        """Tabel login satu role dalam layout file Excel aslinya"""
+        df = self.users_frame(role, id_column)
+        df[id_column] = _id_layout(df[id_column])
+        if role == 'mahasiswa':
+            return df
+        # Kolom opsional hanya ditulis jika ada isinya (dosen: Role, prodi: Email)
+        return df[[col for col in df.columns if col in ('Nama Lengkap', id_column) or df[col].notna().any()]]
+
+    # --- prediksi ---------------------------------------------------------------
+
+    def save_predictions(self, results, model_version=None):
+        """Simpan baris hasil prediksi yang valid (layout hasil batch); mengembalikan jumlah baris
+
+        Prediksi dengan NIM, versi model, dan Kunci_Input (hash input model) yang sama
+        memperbarui baris yang sudah ada, bukan menambah baris. Hasil batch tidak punya
+        Kunci_Input, jadi disimpan satu baris terbaru per NIM dan versi model.
+        """
+        if 'Error' in results.columns:
+            results = results[results['Error'].isna()]
+        results = results[results['NIM'].notna()]
+        key = results['Kunci_Input'].fillna('') if 'Kunci_Input' in results.columns else ''
+        results = results.assign(Versi_Model=model_version or '', Kunci_Input=key, Waktu=now_text())
+        return self.upsert_frame('predictions', results)
+
+    # --- CPL/CPMK ---------------------------------------------------------------
+
+    def cpl_exists(self, kode_cpl):
+        return bool(self._query('SELECT 1 FROM cpl WHERE kode_cpl = ?', (kode_cpl,)))
+
+    def cpmk_exists(self, kode_cpmk, kode_mk=''):
+        """CPMK dengan kode tersebut sudah ada untuk mata kuliah kode_mk (kunci unik tabel cpmk)"""
+        return bool(self._query('SELECT 1 FROM cpmk WHERE kode_mk = ? AND kode_cpmk = ?',
+                                (kode_mk, kode_cpmk)))
+
+    def add_cpl(self, kode_cpl, deskripsi, kategori=None, kontribusi_cpmk='', created_by=None):
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO cpl (kode_cpl, deskripsi, kategori, kontribusi_cpmk, tingkat_pencapaian, '
+                'created_at, created_by) VALUES (?, ?, ?, ?, 0, ?, ?)',
+                (kode_cpl, deskripsi, kategori, kontribusi_cpmk, now_text(), created_by)
+            )
+            return cursor.lastrowid
+
+    def add_cpmk(self, kode_cpmk, deskripsi, mata_kuliah, sks=None, semester=None, cpl_terkait=(),
+                 kode_mk='', target=None, created_by=None):
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO cpmk (kode_mk, mata_kuliah, kode_cpmk, deskripsi, sks, semester, '
+                'pencapaian_rata2, target, cpl_terkait, created_at, created_by) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)',
+                (kode_mk, mata_kuliah, kode_cpmk, deskripsi, sks, semester, target,
+                 ', '.join(cpl_terkait), now_text(), created_by)
+            )
+            return cursor.lastrowid
+
+    def delete_cpl(self, cpl_id):
+        return self._write('DELETE FROM cpl WHERE id = ?', [(cpl_id,)])
+
+    def delete_cpmk(self, cpmk_id):
+        return self._write('DELETE FROM cpmk WHERE id = ?', [(cpmk_id,)])
+
+    def cpl_records(self):
+        """Daftar CPL sebagai list dict (id, kode_cpl, deskripsi, kategori, created_at, created_by)"""
+        return [dict(row) for row in self._query('SELECT * FROM cpl ORDER BY id')]
+
+    def cpmk_records(self):
+        """Daftar CPMK sebagai list dict; cpl_terkait berupa list kode CPL"""
+        records = [dict(row) for row in self._query('SELECT * FROM cpmk ORDER BY id')]
+        for record in records:
+            record['cpl_terkait'] = [kode for kode in (record['cpl_terkait'] or '').split(', ') if kode]
+        return records
+
+    # --- inisialisasi ------------------------------------------------------------
+
+    def seed_once(self, name, seed):
+        """Jalankan seed(self) sekali seumur database (ditandai di tabel meta)
+
+        Data yang sudah ada (termasuk yang sengaja dihapus pengguna) tidak diisi ulang
+        saat aplikasi restart. seed boleh mengembalikan False agar dicoba lagi nanti.
+        """
+        key = f'seed:{name}'
+        with self.transaction():
+            if self._query('SELECT 1 FROM meta WHERE key = ?', (key,)):
+                return False
+            if seed(self) is False:
+                return False
+            self._write('INSERT INTO meta (key, value) VALUES (?, ?)', [(key, now_text())])
+        return True
@@ -0,0 +1,346 @@
+"""Utilitas baca/tulis file Excel untuk data mahasiswa"""
+import io
+import os
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from frame_dtypes import compact_frame, widen_column
+from prediction_engine import NUMERIC_INPUT_COLUMNS
+
+# Kolom template upload (urutan sama dengan create_sample_template) dan jenis datanya.
+# 'text' dibaca apa adanya (CSV: string), 'float'/'int' dikonversi ke array numerik.
+UPLOAD_SCHEMA = {
+    'Nama Lengkap': 'text',
+    'NIM': 'text',
+    'Role': 'text',
+    'Prodi': 'text',
+    **NUMERIC_INPUT_COLUMNS,
+}
+
+UPLOAD_EXTENSIONS = ['xlsx', 'csv', 'parquet']
+
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Jumlah baris XLSX yang dikonversi ke array sekaligus (membatasi list tuple di memori)
+_XLSX_BLOCK_ROWS = 50000
+
+# Jumlah baris DataFrame yang dikonversi ke nilai Python sekaligus saat menulis XLSX
+_WRITE_BLOCK_ROWS = 10000
+
+
+def _rewind(file):
+    """Kembalikan posisi file-like ke awal (untuk UploadedFile/BytesIO)"""
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+
+def upload_format(file):
+    """Format file upload berdasarkan ekstensi nama file: 'xlsx', 'csv', atau 'parquet'"""
+    name = file if isinstance(file, str) else getattr(file, 'name', '')
+    ext = os.path.splitext(name)[1].lower().lstrip('.')
+    return ext if ext in UPLOAD_EXTENSIONS else 'xlsx'
+
+
+def excel_row_count(file):
+    """Perkiraan jumlah baris data (tanpa header) dari dimensi sheet pertama"""
+    _rewind(file)
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        max_row = ws.max_row
+        if max_row is None:
+            # Dimensi tidak tercatat di file, hitung manual
+            ws.reset_dimensions()
+            max_row = sum(1 for _ in ws.iter_rows(values_only=True))
+        return max(max_row - 1, 0)
+    finally:
+        wb.close()
+
+
+def iter_excel_chunks(file, chunksize=10000, schema=None):
+    """Baca sheet pertama secara streaming dan hasilkan DataFrame per chunk
+
+    Menggunakan mode read-only openpyxl sehingga hanya satu chunk baris yang
+    berada di memori. Index DataFrame melanjutkan nomor baris antar chunk.
+    Jika schema diberikan, hanya kolom schema yang dibaca dan dikonversi.
+    """
+    _rewind(file)
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        header = next(ws.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            return
+        columns = [str(col) if col is not None else f'Unnamed: {i}' for i, col in enumerate(header)]
+
+        if schema is None:
+            positions = list(range(len(columns)))
+        else:
+            positions = [i for i, col in enumerate(columns) if col in schema]
+        if not positions:
+            return
+        selected = [columns[i] for i in positions]
+        # Kolom di kanan kolom schema terakhir tidak perlu diparsing sama sekali
+        max_col = positions[-1] + 1
+
+        start = 0
+        buffer = []
+        for row in ws.iter_rows(min_row=2, max_col=max_col, values_only=True):
+            values = tuple(row[i] if i < len(row) else None for i in positions)
+            if all(value is None for value in values):
+                continue
+            buffer.append(values)
+            if len(buffer) >= chunksize:
+                yield _rows_to_frame(buffer, selected, start, schema)
+                start += len(buffer)
+                buffer = []
+
+        if buffer:
+            yield _rows_to_frame(buffer, selected, start, schema)
+    finally:
+        wb.close()
+
+
+def _rows_to_frame(rows, columns, start, schema=None):
+    """Bentuk DataFrame dari list tuple baris dengan index berkelanjutan"""
+    index = pd.RangeIndex(start, start + len(rows))
+    if schema is None:
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        df.index = index
+        return df.infer_objects()
+
+    data = {col: _convert_values(values, schema[col]) for col, values in zip(columns, zip(*rows))}
+    df = pd.DataFrame(data, columns=columns)
+    df.index = index
+    return df
+
+
+def _convert_values(values, kind):
+    """Konversi nilai satu kolom sesuai jenis schema
+
+    Kolom numerik yang berisi teks non-angka dibiarkan sebagai object agar
+    validasi batch bisa melaporkan nilai mentahnya.
+    """
+    if kind == 'text':
+        return pd.Series(np.array(values, dtype=object)).infer_objects()
+
+    try:
+        numbers = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+    if kind == 'int' and np.isfinite(numbers).all() and (numbers == np.trunc(numbers)).all():
+        return numbers.astype(np.int64)
+    return numbers
+
+
+def _apply_schema(df, schema):
+    """Pilih kolom schema dan konversi tipe kolom numerik pada DataFrame yang sudah terbaca"""
+    columns = [col for col in df.columns if col in schema]
+    data = {}
+    for col in columns:
+        kind = schema[col]
+        values = df[col]
+        if kind == 'text' or (kind == 'int' and values.dtype.kind in 'iu'):
+            data[col] = values
+        elif kind == 'float' and values.dtype.kind in 'iuf':
+            data[col] = values.to_numpy(dtype=np.float64)
+        else:
+            data[col] = _convert_values(values.to_numpy(dtype=object, na_value=None), kind)
+    return pd.DataFrame(data, index=df.index, columns=columns)
+
+
+def _read_csv(file, schema, chunksize=None):
+    """read_csv hanya untuk kolom schema dengan dtype dideklarasikan di depan
+
+    Mode chunk hanya mendeklarasikan dtype kolom teks karena nilai numerik tidak
+    valid baru terlihat saat chunk dibaca; kolom numerik dikonversi per chunk.
+    """
+    usecols = lambda col: col in schema
+    text_dtypes = {col: str for col, kind in schema.items() if kind == 'text'}
+    _rewind(file)
+    if chunksize is not None:
+        reader = pd.read_csv(file, usecols=usecols, dtype=text_dtypes, chunksize=chunksize)
+        return (_apply_schema(chunk, schema) for chunk in reader)
+
+    dtypes = dict(text_dtypes, **{col: 'float64' for col, kind in schema.items() if kind == 'float'})
+    try:
+        df = pd.read_csv(file, usecols=usecols, dtype=dtypes)
+    except ValueError:
+        # Ada nilai numerik tidak valid: baca ulang dan konversi per kolom
+        _rewind(file)
+        df = pd.read_csv(file, usecols=usecols, dtype=text_dtypes)
+    return _apply_schema(df, schema)
+
+
+def _parquet_file(file):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Upload Parquet membutuhkan paket pyarrow (pip install pyarrow)")
+    _rewind(file)
+    return pq.ParquetFile(file)
+
+
+def read_upload(file, schema=UPLOAD_SCHEMA, dtypes=None):
+    """Baca file upload (XLSX, CSV, atau Parquet) hanya untuk kolom schema
+
+    Kolom yang tidak ada di schema tidak dibaca; kolom schema yang tidak ada
+    di file dibiarkan hilang agar pemanggil bisa melaporkannya. Jika dtypes
+    diberikan (mis. frame_dtypes.STUDENT_DTYPES), hasilnya diubah ke dtype
+    hemat memori dengan compact_frame.
+    """
+    df = _read_upload_frame(file, schema)
+    return df if dtypes is None else compact_frame(df, dtypes)
+
+
+def _read_upload_frame(file, schema):
+    fmt = upload_format(file)
+    if fmt == 'csv':
+        return _read_csv(file, schema)
+
+    if fmt == 'parquet':
+        parquet = _parquet_file(file)
+        columns = [col for col in parquet.schema_arrow.names if col in schema]
+        return _apply_schema(parquet.read(columns=columns).to_pandas(), schema)
+
+    frames = list(iter_excel_chunks(file, chunksize=_XLSX_BLOCK_ROWS, schema=schema))
+    if not frames:
+        return pd.DataFrame(columns=list(schema))
+    return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+
+def upload_row_count(file):
+    """Jumlah baris data file upload (perkiraan untuk XLSX)"""
+    fmt = upload_format(file)
+    if fmt == 'parquet':
+        return _parquet_file(file).metadata.num_rows
+    if fmt == 'csv':
+        _rewind(file)
+        lines = sum(block.count(b'\n') for block in iter(lambda: file.read(1 << 20), b''))
+        _rewind(file)
+        return max(lines - 1, 0)
+    return excel_row_count(file)
+
+
+def iter_upload_chunks(file, chunksize=10000, schema=UPLOAD_SCHEMA):
+    """Baca file upload per chunk (XLSX, CSV, atau Parquet) dengan index berkelanjutan"""
+    fmt = upload_format(file)
+    if fmt == 'xlsx':
+        yield from iter_excel_chunks(file, chunksize=chunksize, schema=schema)
+        return
+
+    if fmt == 'csv':
+        chunks = _read_csv(file, schema, chunksize=chunksize)
+    else:
+        parquet = _parquet_file(file)
+        columns = [col for col in parquet.schema_arrow.names if col in schema]
+        chunks = (_apply_schema(batch.to_pandas(), schema)
+                  for batch in parquet.iter_batches(batch_size=chunksize, columns=columns))
+
+    start = 0
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def _iter_frames(data):
+    """DataFrame atau iterable DataFrame (mis. generator chunk) per blok baris"""
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for frame in frames:
+        if len(frame) == 0:
+            yield frame
+        for start in range(0, len(frame), _WRITE_BLOCK_ROWS):
+            yield frame.iloc[start:start + _WRITE_BLOCK_ROWS]
+
+
+def _frame_rows(frame):
+    """Baris DataFrame sebagai tuple nilai Python; NaN/None menjadi sel kosong seperti to_excel"""
+    columns = []
+    for _, series in frame.items():
+        # float32 dilebarkan dengan desimal aslinya agar 0.7 tidak tertulis 0.699999988
+        series = widen_column(series)
+        values = series.to_numpy(dtype=object, copy=True)
+        missing = pd.isna(series).to_numpy()
+        if missing.any():
+            values[missing] = None
+        if series.dtype.kind == 'f':
+            infinite = np.isinf(series.to_numpy())
+            if infinite.any():
+                # Sama seperti inf_rep default pandas
+                values[infinite] = np.where(series.to_numpy()[infinite] > 0, 'inf', '-inf')
+        columns.append(values)
+    return zip(*columns)
+
+
+def _header_cells(ws, columns):
+    """Sel header dengan gaya yang sama seperti header pandas.to_excel"""
+    thin = Side(style='thin')
+    font = Font(bold=True)
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    alignment = Alignment(horizontal='center', vertical='top')
+
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(ws, value=str(name))
+        cell.font = font
+        cell.border = border
+        cell.alignment = alignment
+        cells.append(cell)
+    return cells
+
+
+def write_xlsx(sheets, spool=False):
+    """Tulis beberapa sheet ke XLSX dengan workbook write-only openpyxl
+
+    sheets adalah dict {nama sheet: DataFrame atau iterable DataFrame}. Baris
+    ditulis bertahap per blok sehingga tidak ada model sel lengkap di memori.
+    Dengan spool=True hasil ditulis ke file sementara di disk dan dikembalikan
+    sebagai file terbuka (BufferedReader); selain itu sebagai BytesIO.
+    Keduanya bisa langsung dipakai sebagai data st.download_button.
+    """
+    wb = Workbook(write_only=True)
+    for name, data in sheets.items():
+        ws = wb.create_sheet(title=name)
+        header_written = False
+        for frame in _iter_frames(data):
+            if not header_written:
+                ws.append(_header_cells(ws, frame.columns))
+                header_written = True
+            for row in _frame_rows(frame):
+                ws.append(row)
+
+    if not spool:
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    fd, path = tempfile.mkstemp(prefix='export_', suffix='.xlsx')
+    os.close(fd)
+    try:
+        wb.save(path)
+        result = open(path, 'rb')
+    except Exception:
+        os.remove(path)
+        raise
+    try:
+        # POSIX: file tetap bisa dibaca setelah di-unlink dan hilang saat ditutup
+        os.remove(path)
+    except OSError:
+        weakref.finalize(result, _remove_quietly, path)
+    return result
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
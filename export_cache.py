@@ -0,0 +1,91 @@
+"""Cache hasil export (bytes) yang dibuat hanya saat tombol download diklik"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def frame_version(df):
+    """Versi isi DataFrame (sha256 kolom, tipe, index, dan nilai) untuk kunci cache export"""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _as_bytes(data):
+    """Isi export sebagai bytes; None untuk file di disk (hasil spool) yang tidak di-cache"""
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, str):
+        return data.encode('utf-8')
+    if hasattr(data, 'getvalue'):
+        return data.getvalue()
+    return None
+
+
+class ExportCache:
+    """Cache LRU isi file export dengan batas memori, dipakai bersama antar sesi
+
+    Kunci berisi versi data dan opsi export sehingga data yang berubah otomatis
+    menghasilkan kunci baru. build() dipanggil paling lambat saat download
+    diminta; halaman yang hanya dirender ulang tidak membuat file sama sekali.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_build(self, key, build):
+        """Isi export dari cache atau hasil build(); file spool dikembalikan apa adanya"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        # Build di luar lock agar download lain tidak ikut menunggu
+        result = build()
+        data = _as_bytes(result)
+        with self._lock:
+            self.builds += 1
+            if data is None:
+                return result
+            if len(data) <= self.max_bytes and key not in self._entries:
+                self._entries[key] = data
+                self._bytes += len(data)
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted)
+                    self.evictions += 1
+        return data
+
+    def deferred(self, key, build):
+        """Callable tanpa argumen untuk data st.download_button (dijalankan saat diklik)"""
+        return lambda: self.get_or_build(key, build)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counter cache untuk ditampilkan di UI"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'builds': self.builds,
+                'hits': self.hits,
+                'evictions': self.evictions,
+            }
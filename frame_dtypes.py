@@ -0,0 +1,183 @@
+"""Tipe data hemat memori untuk tabel mahasiswa yang dimuat ke memori
+
+Prodi/Role menjadi kategori, metrik berbatas menjadi float32/int16, dan nama
+disimpan sebagai array string (Arrow di pandas 3). Konversi numerik hanya
+dilakukan jika tanpa kehilangan nilai: float32 dilebarkan kembali ke float64
+dengan desimal yang sama persis (widen_float32), sehingga prediksi, tabel
+prediksi precompute, database, dan export tetap melihat nilai aslinya.
+"""
+import numpy as np
+import pandas as pd
+
+from upload_cache import frame_nbytes
+
+# Tipe memori per kolom: 'category' (jika kardinalitas rendah), 'string', 'float32', 'int16'
+STUDENT_DTYPES = {
+    'Nama Lengkap': 'string',
+    'Email': 'string',
+    'Role': 'category',
+    'Prodi': 'category',
+    'IPK': 'float32',
+    'Jumlah_SKS': 'int16',
+    'Nilai_Mata_Kuliah': 'float32',
+    'Jumlah_Kehadiran': 'float32',
+    'Jumlah_Tugas': 'int16',
+    'Skor_Evaluasi': 'float32',
+    'Lama_Studi': 'int16',
+}
+
+# Kolom teks jadi kategori hanya jika nilai uniknya paling banyak sebagian kecil dari jumlah baris
+CATEGORY_MAX_RATIO = 0.5
+
+# Digit signifikan yang dijamin kembali utuh lewat float32 (desimal -> float32 -> desimal)
+FLOAT32_DIGITS = 6
+
+# Dtype string bawaan pandas: array Arrow di pandas 3 (nilai kosong tetap NaN), object di versi lama
+STRING_DTYPE = pd.Series([''], dtype='str').dtype
+
+# Ukuran memori sebelum konversi, disimpan di DataFrame.attrs untuk laporan memori
+BYTES_BEFORE_ATTR = 'bytes_before_compact'
+
+
+def widen_float32(values):
+    """float32 -> float64 dengan desimal terpendek (3.45, bukan 3.450000047683716)
+
+    Nilai dibulatkan ke FLOAT32_DIGITS digit signifikan, sama dengan hasil
+    astype(str) untuk nilai yang berasal dari desimal sependek itu.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values) & (values != 0)
+    magnitude = np.abs(np.where(finite, values, 1.0))
+    exponent = np.floor(np.log10(magnitude)) - (FLOAT32_DIGITS - 1)
+    # Pangkat 10 negatif tidak eksak sebagai float, jadi selalu kalikan/bagi dengan 10**k (k >= 0)
+    up = 10.0 ** np.maximum(-exponent, 0)
+    down = 10.0 ** np.maximum(exponent, 0)
+    rounded = np.round(values * up / down) * down / up
+    return np.where(finite, rounded, values)
+
+
+def fits_float32(values):
+    """Nilai-nilai (angka/None) kembali utuh jika disimpan di kolom float32"""
+    numbers = pd.to_numeric(pd.Series(list(values), dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    return np.array_equal(widen_float32(numbers.astype(np.float32)), numbers, equal_nan=True)
+
+
+def widen_column(series):
+    """Kolom ber-dtype hemat kembali ke dtype lebar tanpa mengubah nilai"""
+    if series.dtype == np.float32:
+        return pd.Series(widen_float32(series.to_numpy()), index=series.index, name=series.name)
+    if series.dtype == np.int16:
+        return series.astype(np.int64)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(series.cat.categories.dtype)
+    return series
+
+
+def _compact_column(series, kind):
+    """Kolom dalam dtype hemat, atau None jika tidak bisa tanpa mengubah nilai"""
+    if kind in ('category', 'string'):
+        # Hanya kolom yang seluruh isinya teks; angka di kolom teks tidak diubah jadi string
+        if not pd.api.types.is_string_dtype(series.dtype) or pd.api.types.infer_dtype(series) not in ('string', 'empty'):
+            return None
+        values = series if STRING_DTYPE == object else series.astype(STRING_DTYPE)
+        if kind == 'category' and series.nunique() <= CATEGORY_MAX_RATIO * len(series):
+            return values.astype('category')
+        return None if values is series else values
+
+    if series.dtype.kind not in 'iuf' or series.dtype == kind:
+        return None
+    numbers = series.to_numpy(dtype=np.float64)
+    if kind == 'int16':
+        info = np.iinfo(np.int16)
+        if (np.isfinite(numbers).all() and (numbers == np.trunc(numbers)).all()
+                and numbers.min(initial=0) >= info.min and numbers.max(initial=0) <= info.max):
+            return series.astype(np.int16)
+    # float32 (juga untuk kolom int berisi sel kosong) hanya jika nilainya kembali utuh
+    narrow = numbers.astype(np.float32)
+    if np.array_equal(widen_float32(narrow), numbers, equal_nan=True):
+        return pd.Series(narrow, index=series.index, name=series.name)
+    return None
+
+
+def compact_frame(df, dtypes=STUDENT_DTYPES):
+    """Salinan df dengan dtype hemat memori untuk kolom yang dikenal di dtypes
+
+    Kolom yang tidak ada di dtypes, kolom numerik berisi teks (untuk laporan
+    validasi batch), dan kolom yang akan berubah nilainya dibiarkan. Ukuran
+    sebelum konversi disimpan di df.attrs[BYTES_BEFORE_ATTR].
+    """
+    before = frame_nbytes(df)
+    data = {}
+    for column in df.columns:
+        series = df[column]
+        compact = _compact_column(series, dtypes[column]) if column in dtypes else None
+        data[column] = series if compact is None else compact
+    out = pd.DataFrame(data, index=df.index, columns=df.columns)
+    out.attrs[BYTES_BEFORE_ATTR] = df.attrs.get(BYTES_BEFORE_ATTR, before)
+    return out
+
+
+def append_rows(base, new):
+    """pd.concat baris baru ke frame ber-dtype hemat tanpa noise desimal float32
+
+    Kolom baris baru diubah ke dtype kolom dasar jika nilainya muat; jika tidak,
+    kolom dasar dilebarkan dengan widen_column (bukan astype) sebelum digabung.
+    """
+    before = base.attrs.get(BYTES_BEFORE_ATTR)
+    if before is not None:
+        before += frame_nbytes(new)
+    base = base.copy(deep=False)
+    new = new.copy(deep=False)
+    for column in base.columns.intersection(new.columns):
+        dtype = base[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            added = pd.Index(new[column].dropna().unique()).difference(dtype.categories)
+            if len(added) and not pd.api.types.is_string_dtype(pd.Index(added).dtype):
+                base[column] = widen_column(base[column])
+                continue
+            if len(added):
+                base[column] = base[column].cat.add_categories(added)
+            new[column] = pd.Categorical(new[column], dtype=base[column].dtype)
+        elif dtype in (np.float32, np.int16):
+            values = new[column]
+            if values.dtype == object:
+                # None/angka dari form atau editor; teks non-angka dibiarkan
+                numeric = pd.to_numeric(values, errors='coerce')
+                if numeric.isna().equals(values.isna()):
+                    new[column] = values = numeric.astype(np.float64)
+            compact = _compact_column(values, 'int16' if dtype == np.int16 else 'float32')
+            if compact is not None and compact.dtype == dtype:
+                new[column] = compact
+            elif compact is not None and compact.dtype == np.float32:
+                # Sel kosong di kolom int16: seluruh kolom jadi float32 (int16 muat utuh di float32)
+                base[column] = base[column].astype(np.float32)
+                new[column] = compact
+            else:
+                base[column] = widen_column(base[column])
+        elif pd.api.types.is_string_dtype(dtype) and dtype != object:
+            values = new[column]
+            if values.dtype.kind in 'OTU' or pd.api.types.is_string_dtype(values.dtype) or values.isna().all():
+                new[column] = values.astype(dtype)
+    out = pd.concat([base, new], ignore_index=True)
+    if before is not None:
+        out.attrs[BYTES_BEFORE_ATTR] = before
+    return out
+
+
+def memory_report(tables):
+    """Ukuran memori per tabel sebelum/sesudah compact_frame
+
+    tables adalah dict {nama tabel: DataFrame hasil compact_frame}.
+    """
+    rows = []
+    for name, df in tables.items():
+        after = frame_nbytes(df)
+        before = df.attrs.get(BYTES_BEFORE_ATTR, after)
+        rows.append({
+            'Tabel': name,
+            'Baris': len(df),
+            'Sebelum (MB)': round(before / 2**20, 2),
+            'Sesudah (MB)': round(after / 2**20, 2),
+            'Hemat (%)': round((1 - after / before) * 100, 1) if before else 0.0,
+        })
+    return pd.DataFrame(rows, columns=['Tabel', 'Baris', 'Sebelum (MB)', 'Sesudah (MB)', 'Hemat (%)'])
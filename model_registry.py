@@ -0,0 +1,315 @@
+"""Registry artefak model (model, encoder, fitur, mapping) yang dimuat sekali per proses
+
+Setiap versi model didaftarkan di manifest JSON (model_registry.json). Versi baru
+dimuat dan dipanaskan di thread background, lalu ditukar secara atomik sehingga
+permintaan yang sedang berjalan tetap memakai versi lama tanpa restart Streamlit.
+"""
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from types import MappingProxyType
+
+import numpy as np
+
+from user_directory import file_version
+
+MANIFEST_PATH = 'model_registry.json'
+ARTIFACT_KEYS = ('model', 'label_encoder', 'feature_names', 'prodi_mapping')
+
+DEFAULT_ARTIFACT_FILES = {
+    'model': 'random_forest_graduation_model.pkl',
+    'label_encoder': 'prodi_label_encoder.pkl',
+    'feature_names': 'feature_names.pkl',
+    'prodi_mapping': 'prodi_mapping.pkl',
+}
+
+
+def artifact_signature(artifact_files):
+    """Versi (mtime, ukuran) setiap file artefak; berubah jika salah satu .pkl diganti"""
+    return tuple((name, file_version(path)) for name, path in sorted(artifact_files.items()))
+
+
+def model_memory_bytes(model):
+    """Perkiraan memori forest: total array node dan nilai leaf semua pohon"""
+    total = 0
+    for estimator in getattr(model, 'estimators_', []):
+        state = estimator.tree_.__getstate__()
+        total += state['nodes'].nbytes + state['values'].nbytes
+    return total
+
+
+class ModelArtifacts:
+    """Artefak model yang dibagikan antar sesi dan bersifat read-only
+
+    prodi_mapping dibungkus MappingProxyType dan feature_names berupa tuple
+    sehingga pemanggil tidak bisa mengubah objek bersama secara tidak sengaja.
+    Model dan label encoder tidak boleh di-fit ulang oleh pemanggil.
+    """
+
+    __slots__ = ('model', 'label_encoder', 'feature_names', 'prodi_mapping', 'version',
+                 'metadata', 'files', 'signature', 'load_seconds', 'memory_bytes', 'loaded_at')
+
+    def __init__(self, model, label_encoder, feature_names, prodi_mapping, version='default',
+                 metadata=None, files=None, signature=None, load_seconds=0.0):
+        self.model = model
+        self.label_encoder = label_encoder
+        if feature_names is None:
+            feature_names = getattr(model, 'feature_names_in_', ())
+        self.feature_names = tuple(feature_names)
+        self.prodi_mapping = MappingProxyType(dict(prodi_mapping))
+        self.version = version
+        self.metadata = MappingProxyType(dict(metadata or {}))
+        self.files = MappingProxyType(dict(files or {}))
+        self.signature = signature
+        self.load_seconds = load_seconds
+        self.memory_bytes = model_memory_bytes(model)
+        self.loaded_at = time.time()
+
+    def as_tuple(self):
+        """(model, label_encoder, feature_names, prodi_mapping) seperti load_model_and_encoders"""
+        return self.model, self.label_encoder, self.feature_names, self.prodi_mapping
+
+
+def load_artifacts(artifact_files=None, version='default', metadata=None):
+    """Muat semua artefak dari disk dan catat waktu load
+
+    Hanya 'model' dan 'prodi_mapping' yang wajib; tanpa 'feature_names' dipakai
+    model.feature_names_in_. Raise FileNotFoundError jika salah satu file tidak ada.
+    """
+    artifact_files = artifact_files or DEFAULT_ARTIFACT_FILES
+    signature = artifact_signature(artifact_files)
+
+    start = time.perf_counter()
+    loaded = {}
+    for name, path in artifact_files.items():
+        with open(path, 'rb') as f:
+            loaded[name] = pickle.load(f)
+    load_seconds = time.perf_counter() - start
+
+    return ModelArtifacts(
+        loaded['model'], loaded.get('label_encoder'), loaded.get('feature_names'),
+        loaded['prodi_mapping'], version=version, metadata=metadata, files=artifact_files,
+        signature=signature, load_seconds=load_seconds
+    )
+
+
+def warm_up(artifacts):
+    """Jalankan satu prediksi dummy agar versi baru siap sebelum ditukar"""
+    from prediction_engine import predict_graduation_batch
+
+    prodi_encoded = next(iter(artifacts.prodi_mapping.values()), 0)
+    predict_graduation_batch(
+        artifacts.model, np.array([prodi_encoded]), np.array([3.0]), np.array([144]),
+        np.array([80.0]), np.array([90.0]), np.array([20]), np.array([4.0]), np.array([8])
+    )
+
+
+def read_manifest(path=MANIFEST_PATH):
+    """Baca manifest registry; tanpa file dipakai satu versi 'default'"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {'active': 'default', 'versions': {'default': dict(DEFAULT_ARTIFACT_FILES)}}
+
+    if manifest.get('active') not in manifest.get('versions', {}):
+        raise ValueError(f"Versi aktif '{manifest.get('active')}' tidak ada di manifest {path}")
+    return manifest
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Tulis manifest secara atomik (file sementara lalu os.replace)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.registry_', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class LatencyStats:
+    """Statistik latensi inferensi satu versi (jendela sampel terakhir)"""
+
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.calls = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+
+    def record(self, seconds, n_rows=1):
+        self.samples.append(seconds)
+        self.calls += 1
+        self.rows += n_rows
+        self.total_seconds += seconds
+
+    def summary(self):
+        """Ringkasan dalam milidetik"""
+        if not self.samples:
+            return {'panggilan': 0, 'baris': 0, 'rata2_ms': None, 'p50_ms': None,
+                    'p95_ms': None, 'maks_ms': None}
+        samples = np.array(self.samples) * 1000
+        return {
+            'panggilan': self.calls,
+            'baris': self.rows,
+            'rata2_ms': self.total_seconds * 1000 / self.calls,
+            'p50_ms': float(np.percentile(samples, 50)),
+            'p95_ms': float(np.percentile(samples, 95)),
+            'maks_ms': float(samples.max()),
+        }
+
+
+class ModelRegistry:
+    """Registry versi model dengan warm-load background dan swap atomik
+
+    current() selalu mengembalikan ModelArtifacts yang sudah siap pakai. Perubahan
+    manifest (versi aktif) atau file .pkl versi aktif terdeteksi otomatis dan
+    versi baru dimuat di background; sampai selesai, versi lama tetap dilayani.
+    """
+
+    poll_interval = 1.0
+
+    def __init__(self, manifest_path=MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._active = None
+        self._previous = None
+        self._loading = {}
+        self._errors = {}
+        self._stats = {}
+        self._last_poll = 0.0
+
+    def manifest(self):
+        return read_manifest(self.manifest_path)
+
+    def versions(self):
+        """Daftar versi di manifest: {versi: entri manifest}"""
+        return self.manifest()['versions']
+
+    def _resolve_files(self, entry):
+        base_dir = os.path.dirname(self.manifest_path)
+        return {key: os.path.join(base_dir, entry[key]) for key in ARTIFACT_KEYS if key in entry}
+
+    def load_version(self, version):
+        """Muat dan panaskan satu versi tanpa mengaktifkannya"""
+        entry = self.versions()[version]
+        metadata = {key: value for key, value in entry.items() if key not in ARTIFACT_KEYS}
+        artifacts = load_artifacts(self._resolve_files(entry), version=version, metadata=metadata)
+        warm_up(artifacts)
+        return artifacts
+
+    def _swap(self, artifacts):
+        with self._lock:
+            self._previous, self._active = self._active, artifacts
+            self._errors.pop(artifacts.version, None)
+
+    def current(self):
+        """Artefak versi aktif; versi pertama dimuat secara sinkron"""
+        if self._active is None:
+            with self._lock:
+                if self._active is None:
+                    self._active = self.load_version(self.manifest()['active'])
+        else:
+            self._poll()
+        return self._active
+
+    def activate(self, version, background=True, persist=True):
+        """Muat versi di background lalu tukar sebagai versi aktif
+
+        Jika persist, manifest diperbarui agar proses lain dan restart berikutnya
+        memakai versi yang sama. Mengembalikan thread pemuat (atau None jika sinkron).
+        """
+        with self._lock:
+            running = self._loading.get(version)
+            if running is not None and running.is_alive():
+                return running
+
+            def worker():
+                try:
+                    artifacts = self.load_version(version)
+                    if persist:
+                        manifest = self.manifest()
+                        if manifest.get('active') != version:
+                            manifest['active'] = version
+                            write_manifest(manifest, self.manifest_path)
+                    self._swap(artifacts)
+                except Exception as e:
+                    self._errors[version] = str(e)
+                finally:
+                    with self._lock:
+                        self._loading.pop(version, None)
+
+            if not background:
+                self._loading[version] = threading.current_thread()
+            else:
+                thread = threading.Thread(target=worker, name=f'model-warmup-{version}', daemon=True)
+                self._loading[version] = thread
+                thread.start()
+                return thread
+
+        worker()
+        return None
+
+    def _poll(self):
+        """Cek manifest dan file versi aktif, maksimal sekali per poll_interval"""
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval or self._loading:
+            return
+        self._last_poll = now
+
+        try:
+            manifest = self.manifest()
+            desired = manifest['active']
+            files = self._resolve_files(manifest['versions'][desired])
+        except (OSError, ValueError, KeyError) as e:
+            self._errors['manifest'] = str(e)
+            return
+        self._errors.pop('manifest', None)
+
+        active = self._active
+        if desired in self._errors:
+            # Jangan ulangi load yang gagal; admin bisa mengaktifkan ulang secara manual
+            return
+        if active.version != desired or artifact_signature(files) != active.signature:
+            self.activate(desired, persist=False)
+
+    def artifacts_of(self, model):
+        """ModelArtifacts pemilik objek model (aktif atau sebelumnya), None jika tidak dikenal"""
+        for artifacts in (self._active, self._previous):
+            if artifacts is not None and artifacts.model is model:
+                return artifacts
+        return None
+
+    def record_latency(self, version, seconds, n_rows=1):
+        with self._lock:
+            stats = self._stats.setdefault(version, LatencyStats())
+            stats.record(seconds, n_rows)
+
+    @contextmanager
+    def track(self, version, n_rows=1):
+        """Context manager pencatat latensi inferensi untuk satu versi"""
+        start = time.perf_counter()
+        yield
+        if version is not None:
+            self.record_latency(version, time.perf_counter() - start, n_rows)
+
+    def latency_stats(self):
+        with self._lock:
+            return {version: stats.summary() for version, stats in self._stats.items()}
+
+    def status(self):
+        """Ringkasan status registry untuk panel admin"""
+        with self._lock:
+            return {
+                'active': self._active.version if self._active is not None else None,
+                'loading': sorted(self._loading),
+                'errors': dict(self._errors),
+            }
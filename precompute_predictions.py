@@ -0,0 +1,198 @@
+"""Tabel prediksi terjadwal untuk seluruh mahasiswa di database (tabel students)
+
+Dijalankan sebagai job malam (cron) dari root repository:
+    python precompute_predictions.py
+    python precompute_predictions.py --source login_mahasiswa.xlsx   # dari file Excel
+
+Setiap baris tabel menyimpan NIM, input model, kelas, probabilitas, fitur
+engineered, dan versi model. Aplikasi memakai tabel ini untuk prediksi
+individual dan batch jika versi model dan seluruh input masih sama.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from datastore import DATASTORE_PATH, Datastore
+from model_registry import MANIFEST_PATH, ModelRegistry
+from prediction_engine import NUMERIC_INPUT_COLUMNS, coerce_batch_inputs, predict_graduation_batch
+from sidecar_cache import read_excel_cached
+
+PRECOMPUTED_PATH = 'precomputed_predictions.npz'
+
+# Urutan input sama dengan argumen predict_graduation_batch
+INPUT_COLUMNS = ['Prodi'] + list(NUMERIC_INPUT_COLUMNS)
+RESULT_KEYS = [
+    'prediksi', 'probabilitas_tidak_lulus', 'probabilitas_lulus', 'confidence',
+    'academic_performance', 'engagement_score', 'study_efficiency', 'sks_per_semester'
+]
+
+
+def _signature_key(signature):
+    """Bentuk signature artefak yang stabil setelah disimpan sebagai JSON"""
+    return json.loads(json.dumps(signature))
+
+
+def nim_to_int(values):
+    """Konversi NIM ke int64; nilai yang bukan angka bulat menjadi -1"""
+    numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    bulat = np.isfinite(numeric) & (numeric == np.trunc(numeric))
+    return np.where(bulat, numeric, -1).astype(np.int64)
+
+
+class PrecomputedTable:
+    """Tabel hasil prediksi yang diurutkan per NIM untuk lookup dengan searchsorted"""
+
+    def __init__(self, nim, inputs, results, meta):
+        order = np.argsort(nim, kind='stable')
+        self.nim = nim[order]
+        self.inputs = {key: values[order] for key, values in inputs.items()}
+        self.results = {key: values[order] for key, values in results.items()}
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.nim)
+
+    @property
+    def version(self):
+        return self.meta['model_version']
+
+    def matches_model(self, artifacts):
+        """True jika tabel dibuat dengan versi dan file model yang sama"""
+        return (artifacts is not None and self.version == artifacts.version
+                and self.meta['model_signature'] == _signature_key(artifacts.signature))
+
+    def match(self, nim, inputs):
+        """Posisi baris tabel untuk setiap NIM yang inputnya identik, -1 jika tidak cocok
+
+        NIM boleh berupa angka atau teks (misalnya dari file upload).
+        """
+        nim = np.atleast_1d(np.asarray(nim))
+        if nim.dtype.kind not in 'iu':
+            nim = nim_to_int(nim)
+        nim = nim.astype(np.int64, copy=False)
+        if len(self.nim) == 0:
+            return np.full(len(nim), -1, dtype=np.intp)
+
+        pos = np.minimum(np.searchsorted(self.nim, nim), len(self.nim) - 1)
+        cocok = (self.nim[pos] == nim) & (nim >= 0)
+        for key in INPUT_COLUMNS:
+            cocok &= self.inputs[key][pos] == np.atleast_1d(inputs[key])
+        return np.where(cocok, pos, -1)
+
+    def predict(self, model, nim, inputs):
+        """Hasil seperti predict_graduation_batch; baris yang tidak cocok dihitung dengan model
+
+        Mengembalikan (hasil, jumlah baris yang diambil dari tabel).
+        """
+        pos = self.match(nim, inputs)
+        hit = pos >= 0
+        if not hit.any():
+            return predict_graduation_batch(model, *(inputs[key] for key in INPUT_COLUMNS)), 0
+
+        hasil = {key: np.empty(len(pos), dtype=self.results[key].dtype) for key in RESULT_KEYS}
+        for key in RESULT_KEYS:
+            hasil[key][hit] = self.results[key][pos[hit]]
+
+        miss = ~hit
+        if miss.any():
+            dihitung = predict_graduation_batch(
+                model, *(np.atleast_1d(inputs[key])[miss] for key in INPUT_COLUMNS)
+            )
+            for key in RESULT_KEYS:
+                hasil[key][miss] = dihitung[key]
+        return hasil, int(hit.sum())
+
+
+def build_table(df, artifacts):
+    """Skor seluruh mahasiswa valid di DataFrame dengan versi model tertentu"""
+    inputs, error_mask, _ = coerce_batch_inputs(df, artifacts.prodi_mapping)
+    nim = nim_to_int(df['NIM'].to_numpy())
+
+    # NIM ganda: pakai baris pertama, sama seperti indeks login
+    _, first = np.unique(nim, return_index=True)
+    valid = np.zeros(len(df), dtype=bool)
+    valid[first] = True
+    valid &= ~error_mask & (nim >= 0)
+
+    inputs = {key: inputs[key][valid] for key in INPUT_COLUMNS}
+    results = predict_graduation_batch(artifacts.model, *(inputs[key] for key in INPUT_COLUMNS))
+    meta = {
+        'model_version': artifacts.version,
+        'model_signature': _signature_key(artifacts.signature),
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'rows': int(valid.sum()),
+        'skipped_rows': int((~valid).sum()),
+    }
+    return PrecomputedTable(nim[valid], inputs, dict(results), meta)
+
+
+def save_table(table, path=PRECOMPUTED_PATH):
+    """Simpan tabel sebagai .npz secara atomik"""
+    arrays = {'nim': table.nim, 'meta': np.array(json.dumps(table.meta))}
+    arrays.update({f'input__{key}': values for key, values in table.inputs.items()})
+    arrays.update({f'result__{key}': values for key, values in table.results.items()})
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.precomputed_', suffix='.npz', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_table(path=PRECOMPUTED_PATH):
+    """Muat tabel dari .npz; None jika file belum ada"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        inputs = {key: data[f'input__{key}'] for key in INPUT_COLUMNS}
+        results = {key: data[f'result__{key}'] for key in RESULT_KEYS}
+        return PrecomputedTable(data['nim'], inputs, results, json.loads(str(data['meta'])))
+
+
+def read_students(database):
+    """Data mahasiswa (layout login_mahasiswa.xlsx) dari database aplikasi"""
+    store = Datastore(database)
+    try:
+        return store.read_frame('students')
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=os.environ.get('DATASTORE_PATH', DATASTORE_PATH),
+                        help='database SQLite aplikasi (default: env DATASTORE_PATH atau akademik.db)')
+    parser.add_argument('--source', default=None, help='file Excel data mahasiswa, dipakai sebagai ganti database')
+    parser.add_argument('--output', default=PRECOMPUTED_PATH, help='file tabel hasil (.npz)')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help='manifest registry model')
+    parser.add_argument('--version', default=None, help='versi model (default: versi aktif)')
+    args = parser.parse_args()
+    if args.source is None and not os.path.exists(args.database):
+        parser.error(f"database {args.database} tidak ditemukan (jalankan aplikasi sekali atau pakai --source)")
+
+    registry = ModelRegistry(args.manifest)
+    version = args.version or registry.manifest()['active']
+    artifacts = registry.load_version(version)
+
+    start = time.perf_counter()
+    students = read_students(args.database) if args.source is None else read_excel_cached(args.source)
+    table = build_table(students, artifacts)
+    save_table(table, args.output)
+    print(f"{table.meta['rows']:,} mahasiswa diprediksi dengan model {version} "
+          f"({table.meta['skipped_rows']:,} baris dilewati) dalam "
+          f"{time.perf_counter() - start:.2f} detik -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
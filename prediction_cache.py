@@ -0,0 +1,87 @@
+"""Cache hasil prediksi individual (LRU + TTL) berdasarkan versi model dan input mahasiswa"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def prediction_key(version, signature, prodi_encoded, ipk, jumlah_sks, nilai_mk,
+                   kehadiran, tugas, skor_evaluasi, lama_studi):
+    """Kunci cache: versi + signature file model dan delapan input mentah
+
+    Karena input ikut menjadi kunci, perubahan data mahasiswa atau pergantian
+    model otomatis menghasilkan kunci baru (cache miss) tanpa invalidasi manual.
+    """
+    return (
+        version, signature, int(prodi_encoded), float(ipk), int(jumlah_sks), float(nilai_mk),
+        float(kehadiran), int(tugas), float(skor_evaluasi), int(lama_studi)
+    )
+
+
+def input_hash(prodi_encoded, ipk, jumlah_sks, nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi):
+    """Hash pendek delapan input mentah (tanpa versi model), mis. untuk kunci riwayat prediksi"""
+    inputs = prediction_key(None, None, prodi_encoded, ipk, jumlah_sks, nilai_mk,
+                            kehadiran, tugas, skor_evaluasi, lama_studi)[2:]
+    return hashlib.sha256(repr(inputs).encode('utf-8')).hexdigest()[:16]
+
+
+class PredictionCache:
+    """Cache LRU berukuran tetap dengan TTL, aman dipakai bersama antar thread sesi"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Hasil prediksi (salinan dict) atau None jika tidak ada / kedaluwarsa"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counter cache untuk dashboard admin"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,584 @@
+"""Engine prediksi kelulusan berbasis kolom untuk batch upload"""
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from frame_dtypes import widen_float32
+from tree_inference import CompiledForest
+
+# Kolom numerik pada file upload beserta tipe konversinya (urutan validasi)
+NUMERIC_INPUT_COLUMNS = {
+    'IPK': 'float',
+    'Jumlah_SKS': 'int',
+    'Nilai_Mata_Kuliah': 'float',
+    'Jumlah_Kehadiran': 'float',
+    'Jumlah_Tugas': 'int',
+    'Skor_Evaluasi': 'float',
+    'Lama_Studi': 'int',
+}
+
+# Urutan fitur default sesuai feature_names.pkl
+DEFAULT_FEATURE_NAMES = [
+    'Prodi', 'IPK', 'Jumlah SKS', 'Nilai Mata Kuliah', 'Jumlah Kehadiran',
+    'Jumlah Tugas', 'Skor Evaluasi Dosen oleh Mahasiswa', 'Waktu Lama Studi (semester)',
+    'Academic_Performance', 'Engagement_Score', 'Study_Efficiency', 'SKS_per_Semester'
+]
+
+# Kolom yang dikirim ke worker proses (kolom lain tidak ikut di-pickle)
+BATCH_INPUT_COLUMNS = ['Nama Lengkap', 'NIM', 'Prodi'] + list(NUMERIC_INPUT_COLUMNS)
+
+# Batas minimal baris sebelum scoring dibagi ke beberapa proses
+PARALLEL_MIN_ROWS = 20000
+
+RESULT_COLUMNS = [
+    'Index', 'Nama Lengkap', 'NIM', 'Prodi', 'IPK', 'Prediksi',
+    'Probabilitas_Lulus', 'Probabilitas_Tidak_Lulus', 'Confidence',
+    'Academic_Performance', 'Engagement_Score', 'Study_Efficiency',
+    'SKS_per_Semester', 'Error'
+]
+
+# Tipe kolom hasil: probabilitas float32 dan label prediksi sebagai kategori tetap
+PREDIKSI_DTYPE = pd.CategoricalDtype(['TIDAK LULUS', 'LULUS'])
+PROBABILITY_COLUMNS = ['Probabilitas_Lulus', 'Probabilitas_Tidak_Lulus', 'Confidence']
+
+# Batas 20 bin histogram confidence; confidence model biner selalu di [0.5, 1]
+CONFIDENCE_BINS = np.linspace(0.5, 1.0, 21)
+
+
+def calculate_engineered_features(ipk, nilai_mk, kehadiran, tugas, jumlah_sks, lama_studi):
+    """Hitung fitur-fitur yang di-engineer (nilai tunggal maupun array)"""
+    academic_performance = (ipk * 0.6) + (nilai_mk * 0.4 / 100)
+    engagement_score = (kehadiran * 0.7) + (tugas * 0.3)
+
+    if np.ndim(lama_studi) == 0:
+        study_efficiency = ipk / lama_studi if lama_studi > 0 else 0
+        sks_per_semester = jumlah_sks / lama_studi if lama_studi > 0 else 0
+    else:
+        lama_studi = np.asarray(lama_studi, dtype=np.float64)
+        positif = lama_studi > 0
+        pembagi = np.where(positif, lama_studi, 1.0)
+        study_efficiency = np.where(positif, np.asarray(ipk, dtype=np.float64) / pembagi, 0.0)
+        sks_per_semester = np.where(positif, np.asarray(jumlah_sks, dtype=np.float64) / pembagi, 0.0)
+
+    return academic_performance, engagement_score, study_efficiency, sks_per_semester
+
+
+def compute_model_features(prodi_encoded, ipk, jumlah_sks, nilai_mk, kehadiran, tugas,
+                           skor_evaluasi, lama_studi):
+    """Hitung seluruh fitur model (termasuk fitur engineered) per nama kolom"""
+    academic_performance, engagement_score, study_efficiency, sks_per_semester = \
+        calculate_engineered_features(ipk, nilai_mk, kehadiran, tugas, jumlah_sks, lama_studi)
+
+    return {
+        'Prodi': prodi_encoded,
+        'IPK': ipk,
+        'Jumlah SKS': jumlah_sks,
+        'Nilai Mata Kuliah': nilai_mk,
+        'Jumlah Kehadiran': kehadiran,
+        'Jumlah Tugas': tugas,
+        'Skor Evaluasi Dosen oleh Mahasiswa': skor_evaluasi,
+        'Waktu Lama Studi (semester)': lama_studi,
+        'Academic_Performance': academic_performance,
+        'Engagement_Score': engagement_score,
+        'Study_Efficiency': study_efficiency,
+        'SKS_per_Semester': sks_per_semester
+    }
+
+
+def build_feature_frame(features, feature_names=None):
+    """Susun DataFrame fitur sesuai urutan kolom yang dipakai model"""
+    if feature_names is None:
+        feature_names = DEFAULT_FEATURE_NAMES
+
+    # Model lama memakai nama kolom 'Jurusan' untuk kode prodi
+    kolom = dict(features, Jurusan=features['Prodi'])
+    return pd.DataFrame({name: np.atleast_1d(kolom[name]) for name in feature_names})
+
+
+def build_feature_matrix(features, feature_names=None):
+    """Susun matriks fitur float32 C-contiguous sesuai urutan kolom model, tanpa DataFrame
+
+    float32 sama dengan konversi input di predict_proba forest sehingga hasilnya identik.
+    """
+    if feature_names is None:
+        feature_names = DEFAULT_FEATURE_NAMES
+
+    kolom = dict(features, Jurusan=features['Prodi'])
+    n_rows = len(np.atleast_1d(kolom[feature_names[0]]))
+    X = np.empty((n_rows, len(feature_names)), dtype=np.float32)
+    for j, name in enumerate(feature_names):
+        X[:, j] = kolom[name]
+    return X
+
+
+def predict_graduation_batch(model, prodi_encoded, ipk, jumlah_sks, nilai_mk,
+                             kehadiran, tugas, skor_evaluasi, lama_studi):
+    """Prediksi kelulusan untuk array input dengan satu kali evaluasi forest
+
+    Label diturunkan dari predict_proba (argmax, sama seperti model.predict)
+    sehingga setiap pohon hanya ditelusuri sekali. Semua nilai kembalian
+    berupa array dengan panjang sama dengan input.
+    """
+    inputs = [np.atleast_1d(np.asarray(value)) for value in (
+        prodi_encoded, ipk, jumlah_sks, nilai_mk, kehadiran, tugas, skor_evaluasi, lama_studi
+    )]
+    features = compute_model_features(*inputs)
+    feature_names = getattr(model, 'feature_names_in_', None)
+    # DataFrame hanya untuk estimator sklearn yang memvalidasi nama kolom; CompiledForest dan
+    # model tanpa feature_names_in_ langsung menerima matriks
+    if feature_names is not None and not isinstance(model, CompiledForest):
+        X = build_feature_frame(features, feature_names)
+    else:
+        X = build_feature_matrix(features, feature_names)
+
+    probabilitas = model.predict_proba(X)
+
+    return {
+        'prediksi': model.classes_.take(np.argmax(probabilitas, axis=1)),
+        'probabilitas_tidak_lulus': probabilitas[:, 0],
+        'probabilitas_lulus': probabilitas[:, 1],
+        'confidence': probabilitas.max(axis=1),
+        'academic_performance': features['Academic_Performance'],
+        'engagement_score': features['Engagement_Score'],
+        'study_efficiency': features['Study_Efficiency'],
+        'sks_per_semester': features['SKS_per_Semester']
+    }
+
+
+def coerce_batch_inputs(df, prodi_mapping):
+    """Validasi dan konversi kolom input batch sekaligus per kolom
+
+    Mengembalikan dict array input, mask baris error, dan array pesan error.
+    """
+    n_rows = len(df)
+    error_mask = np.zeros(n_rows, dtype=bool)
+    error_messages = np.full(n_rows, None, dtype=object)
+
+    def tandai_error(mask, pesan_fn):
+        baru = mask & ~error_mask
+        for pos in np.flatnonzero(baru):
+            error_messages[pos] = pesan_fn(pos)
+        error_mask[baru] = True
+
+    # Prodi: petakan hanya nilai unik, lalu sebarkan ke semua baris
+    prodi_values = df['Prodi'].to_numpy(dtype=object)
+    kode_unik, nilai_unik = pd.factorize(df['Prodi'])
+    # Slot terakhir (-1) menampung kode NaN dari factorize
+    tabel_kode = np.array([prodi_mapping.get(p, -1) for p in nilai_unik] + [-1], dtype=np.int64)
+    prodi_encoded = tabel_kode[kode_unik]
+    tandai_error(prodi_encoded < 0, lambda pos: f'Prodi "{prodi_values[pos]}" tidak dikenal')
+
+    inputs = {'Prodi': prodi_encoded}
+    for col, jenis in NUMERIC_INPUT_COLUMNS.items():
+        raw = df[col]
+        if raw.dtype == np.float32:
+            # Kolom hasil compact_frame: kembalikan desimal aslinya (3.45, bukan 3.4500000477)
+            values = widen_float32(raw.to_numpy())
+        else:
+            values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        raw_values = raw.to_numpy(dtype=object)
+        tandai_error(
+            ~np.isfinite(values),
+            lambda pos, col=col, raw_values=raw_values: (
+                f'Nilai {col} kosong' if pd.isna(raw_values[pos])
+                else f'Nilai {col} tidak valid: "{raw_values[pos]}"'
+            )
+        )
+        values = np.where(np.isfinite(values), values, 0.0)
+        if jenis == 'int':
+            values = np.trunc(values).astype(np.int64)
+        inputs[col] = values
+
+    return inputs, error_mask, error_messages
+
+
+def predict_batch_frame(df, model, prodi_mapping, precomputed=None, summary=None):
+    """Prediksi seluruh baris batch dengan satu panggilan predict_proba
+
+    Jika precomputed (PrecomputedTable) diberikan, baris dengan NIM dan input
+    yang sama persis diambil dari tabel dan hanya sisanya dievaluasi forest.
+    Jika summary (BatchSummary) diberikan, agregat hasil batch ini ditambahkan ke dalamnya.
+    """
+    inputs, error_mask, error_messages = coerce_batch_inputs(df, prodi_mapping)
+    valid = ~error_mask
+    n_rows = len(df)
+
+    index_values = df.index.to_numpy()
+    if 'Nama Lengkap' in df.columns:
+        nama = df['Nama Lengkap'].to_numpy()
+    else:
+        nama = np.array([f'Mahasiswa_{idx}' for idx in index_values], dtype=object)
+    if 'NIM' in df.columns:
+        nim = df['NIM'].to_numpy()
+    else:
+        nim = np.array([f'NIM_{idx}' for idx in index_values], dtype=object)
+
+    def kolom_hasil(values, dtype=np.float64):
+        out = np.full(n_rows, np.nan, dtype=dtype)
+        out[valid] = values
+        return out
+
+    # Kode kategori PREDIKSI_DTYPE: -1 (baris error), 0 TIDAK LULUS, 1 LULUS
+    prediksi = np.full(n_rows, -1, dtype=np.int8)
+    kosong = np.full(n_rows, np.nan)
+    proba_lulus = proba_tidak_lulus = confidence = kosong.astype(np.float32)
+    engineered = dict.fromkeys(
+        ['Academic_Performance', 'Engagement_Score', 'Study_Efficiency', 'SKS_per_Semester'],
+        kosong
+    )
+
+    if valid.any():
+        if precomputed is not None:
+            valid_inputs = {key: values[valid] for key, values in inputs.items()}
+            hasil, _ = precomputed.predict(model, nim[valid], valid_inputs)
+        else:
+            hasil = predict_graduation_batch(
+                model, inputs['Prodi'][valid], inputs['IPK'][valid], inputs['Jumlah_SKS'][valid],
+                inputs['Nilai_Mata_Kuliah'][valid], inputs['Jumlah_Kehadiran'][valid],
+                inputs['Jumlah_Tugas'][valid], inputs['Skor_Evaluasi'][valid],
+                inputs['Lama_Studi'][valid]
+            )
+
+        prediksi[valid] = hasil['prediksi'] == 1
+        proba_tidak_lulus = kolom_hasil(hasil['probabilitas_tidak_lulus'], np.float32)
+        proba_lulus = kolom_hasil(hasil['probabilitas_lulus'], np.float32)
+        confidence = kolom_hasil(hasil['confidence'], np.float32)
+        engineered = {
+            'Academic_Performance': kolom_hasil(hasil['academic_performance']),
+            'Engagement_Score': kolom_hasil(hasil['engagement_score']),
+            'Study_Efficiency': kolom_hasil(hasil['study_efficiency']),
+            'SKS_per_Semester': kolom_hasil(hasil['sks_per_semester'])
+        }
+
+    results = pd.DataFrame({
+        'Index': index_values,
+        'Nama Lengkap': nama,
+        'NIM': nim,
+        'Prodi': df['Prodi'].to_numpy(),
+        'IPK': kolom_hasil(inputs['IPK'][valid]),
+        'Prediksi': pd.Categorical.from_codes(prediksi, dtype=PREDIKSI_DTYPE),
+        'Probabilitas_Lulus': proba_lulus,
+        'Probabilitas_Tidak_Lulus': proba_tidak_lulus,
+        'Confidence': confidence,
+        'Academic_Performance': engineered['Academic_Performance'],
+        'Engagement_Score': engineered['Engagement_Score'],
+        'Study_Efficiency': engineered['Study_Efficiency'],
+        'SKS_per_Semester': engineered['SKS_per_Semester'],
+        'Error': error_column(error_mask, error_messages)
+    }, columns=RESULT_COLUMNS)
+    if summary is not None:
+        summary.update(results)
+    return results
+
+
+def error_column(error_mask, error_messages):
+    """Kolom Error sebagai kategori yang hanya dibentuk dari baris error
+
+    Baris sukses cukup berupa kode -1 (NaN), sehingga isna()/notna() tetap
+    berlaku tanpa array object selebar batch.
+    """
+    codes = np.full(len(error_mask), -1, dtype=np.int32)
+    kode_error, pesan_unik = pd.factorize(error_messages[error_mask])
+    codes[error_mask] = kode_error
+    return pd.Categorical.from_codes(codes, categories=pd.Index(pesan_unik, dtype=str))
+
+
+def concat_results(frames):
+    """Gabungkan DataFrame hasil per chunk/shard dengan index baru dan kolom Error tetap kategori"""
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    if 'Error' in df.columns:
+        df['Error'] = union_categoricals([frame['Error'] for frame in frames])
+    return df
+
+
+class BatchSummary:
+    """Agregat hasil batch: jumlah per prediksi, per prodi x prediksi, dan histogram confidence
+
+    Diperbarui per batch/chunk/shard saat prediksi dibuat dan bisa digabung
+    (merge), sehingga metrik dan chart dirender dari agregat berukuran tetap
+    tanpa memindai ulang DataFrame hasil.
+    """
+
+    def __init__(self):
+        self.total_rows = 0
+        self.error_count = 0
+        # Urutan sesuai kategori PREDIKSI_DTYPE: [TIDAK LULUS, LULUS]
+        self.prediksi_counts = np.zeros(len(PREDIKSI_DTYPE.categories), dtype=np.int64)
+        self.prodi_counts = {}
+        self.confidence_hist = np.zeros(len(CONFIDENCE_BINS) - 1, dtype=np.int64)
+        self.confidence_sum = 0.0
+
+    @classmethod
+    def from_results(cls, results):
+        """Agregat dari DataFrame hasil yang sudah ada (mis. hasil lama di session state)"""
+        summary = cls()
+        summary.update(results)
+        return summary
+
+    @property
+    def valid_count(self):
+        return self.total_rows - self.error_count
+
+    def count(self, prediksi):
+        return int(self.prediksi_counts[PREDIKSI_DTYPE.categories.get_loc(prediksi)])
+
+    @property
+    def mean_confidence(self):
+        return self.confidence_sum / self.valid_count if self.valid_count else 0.0
+
+    def update(self, results):
+        """Tambahkan satu DataFrame hasil (batch, chunk, atau shard)"""
+        valid = results['Error'].isna().to_numpy()
+        codes = pd.Categorical(results['Prediksi'], dtype=PREDIKSI_DTYPE).codes[valid]
+        n_kelas = len(PREDIKSI_DTYPE.categories)
+
+        self.total_rows += len(results)
+        self.error_count += int((~valid).sum())
+        self.prediksi_counts += np.bincount(codes, minlength=n_kelas)
+
+        kode_prodi, nilai_prodi = pd.factorize(results['Prodi'].to_numpy()[valid])
+        per_prodi = np.bincount(kode_prodi * n_kelas + codes, minlength=len(nilai_prodi) * n_kelas)
+        for prodi, counts in zip(nilai_prodi, per_prodi.reshape(-1, n_kelas)):
+            self.prodi_counts[prodi] = self.prodi_counts.get(prodi, 0) + counts
+
+        confidence = results['Confidence'].to_numpy(dtype=np.float64)[valid]
+        clipped = np.clip(confidence, CONFIDENCE_BINS[0], CONFIDENCE_BINS[-1])
+        self.confidence_hist += np.histogram(clipped, bins=CONFIDENCE_BINS)[0]
+        self.confidence_sum += float(confidence.sum())
+        return self
+
+    def merge(self, other):
+        """Gabungkan agregat lain (mis. dari shard worker) ke agregat ini"""
+        self.total_rows += other.total_rows
+        self.error_count += other.error_count
+        self.prediksi_counts += other.prediksi_counts
+        for prodi, counts in other.prodi_counts.items():
+            self.prodi_counts[prodi] = self.prodi_counts.get(prodi, 0) + counts
+        self.confidence_hist += other.confidence_hist
+        self.confidence_sum += other.confidence_sum
+        return self
+
+    def prediksi_frame(self):
+        """Jumlah per prediksi (hanya yang > 0)"""
+        df = pd.DataFrame({'Prediksi': list(PREDIKSI_DTYPE.categories), 'Count': self.prediksi_counts})
+        return df[df['Count'] > 0].reset_index(drop=True)
+
+    def prodi_frame(self):
+        """Jumlah per prodi x prediksi seperti groupby(['Prodi', 'Prediksi']).size()"""
+        rows = [
+            (prodi, prediksi, int(count))
+            for prodi in sorted(self.prodi_counts)
+            for prediksi, count in zip(PREDIKSI_DTYPE.categories, self.prodi_counts[prodi])
+            if count > 0
+        ]
+        return pd.DataFrame(rows, columns=['Prodi', 'Prediksi', 'Count'])
+
+    def confidence_frame(self):
+        """Histogram confidence dengan kolom yang sama seperti chart_data.bin_counts"""
+        return pd.DataFrame({
+            'Batas_Bawah': CONFIDENCE_BINS[:-1],
+            'Batas_Atas': CONFIDENCE_BINS[1:],
+            'Titik_Tengah': (CONFIDENCE_BINS[:-1] + CONFIDENCE_BINS[1:]) / 2,
+            'Count': self.confidence_hist,
+        })
+
+
+class BatchResultStore:
+    """Penyimpanan hasil batch di disk, ditambahkan per chunk
+
+    Setiap chunk disimpan sebagai file pickle di direktori sementara sehingga
+    hasil tidak perlu ditampung seluruhnya di memori selama proses berjalan.
+    Direktori dihapus otomatis saat objek tidak lagi dipakai.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = tempfile.mkdtemp(prefix='batch_results_', dir=directory)
+        self.chunk_files = []
+        self.row_count = 0
+        # Posisi baris pertama setiap chunk (posisi global seperti di to_frame)
+        self._starts = []
+        self._columns = None
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def __len__(self):
+        return self.row_count
+
+    @property
+    def columns(self):
+        return pd.Index(RESULT_COLUMNS) if self._columns is None else self._columns
+
+    @property
+    def version(self):
+        """Versi isi untuk kunci cache export; direktori unik per store dan isinya hanya bertambah"""
+        return f'{self.directory}:{self.row_count}'
+
+    def append(self, df):
+        """Tambahkan satu chunk hasil ke disk"""
+        path = os.path.join(self.directory, f'chunk_{len(self.chunk_files):05d}.pkl')
+        df.to_pickle(path)
+        self.chunk_files.append(path)
+        self._starts.append(self.row_count)
+        if self._columns is None:
+            self._columns = df.columns
+        self.row_count += len(df)
+
+    def iter_chunks(self):
+        """Baca kembali chunk hasil satu per satu"""
+        for path in self.chunk_files:
+            yield pd.read_pickle(path)
+
+    def head(self, n=20):
+        """Ambil n baris pertama tanpa memuat seluruh hasil"""
+        parts = []
+        remaining = n
+        for chunk in self.iter_chunks():
+            parts.append(chunk.head(remaining))
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        return pd.concat(parts) if parts else pd.DataFrame(columns=RESULT_COLUMNS)
+
+    def read_columns(self, columns):
+        """Kolom tertentu dari seluruh chunk sebagai satu DataFrame (index 0..n-1)"""
+        return concat_results(chunk[list(columns)] for chunk in self.iter_chunks())
+
+    def take(self, positions):
+        """Baris di posisi tertentu (urutan dipertahankan); hanya chunk yang memuat posisi itu yang dibaca"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return self.head(0)
+        chunk_ids = np.searchsorted(self._starts, positions, side='right') - 1
+        parts, order = [], []
+        for chunk_id in np.unique(chunk_ids):
+            selected = np.flatnonzero(chunk_ids == chunk_id)
+            chunk = pd.read_pickle(self.chunk_files[chunk_id])
+            parts.append(chunk.iloc[positions[selected] - self._starts[chunk_id]])
+            order.append(selected)
+        rows = concat_results(parts).iloc[np.argsort(np.concatenate(order))]
+        return rows.set_axis(pd.Index(positions))
+
+    def to_frame(self):
+        """Gabungkan seluruh chunk menjadi satu DataFrame hasil"""
+        return concat_results(self.iter_chunks())
+
+    def cleanup(self):
+        """Hapus file hasil dari disk"""
+        self._finalizer()
+
+
+def default_worker_count():
+    """Jumlah worker default: env BATCH_PREDICTION_WORKERS atau jumlah core CPU"""
+    env_value = os.environ.get('BATCH_PREDICTION_WORKERS')
+    if env_value:
+        return max(int(env_value), 1)
+    return os.cpu_count() or 1
+
+
+# Model milik proses worker, dimuat sekali oleh initializer pool
+_worker_model = None
+
+
+def _init_scoring_worker(model_path):
+    """Initializer worker: muat model satu kali saat proses dimulai"""
+    global _worker_model
+    with open(model_path, 'rb') as f:
+        _worker_model = pickle.load(f)
+
+
+def _score_shard(args):
+    """Scoring satu shard di dalam proses worker; mengembalikan (hasil, agregat shard)"""
+    shard, prodi_mapping = args
+    summary = BatchSummary()
+    return predict_batch_frame(shard, _worker_model, prodi_mapping, summary=summary), summary
+
+
+class ParallelBatchScorer:
+    """Scoring batch paralel dengan pool proses yang memuat model sekali per worker
+
+    Batch dipecah menjadi shard berurutan; executor.map menjaga urutan hasil
+    sehingga output identik dengan predict_batch_frame pada satu proses.
+    """
+
+    def __init__(self, model_path, n_workers=None, shard_size=None):
+        self.model_path = model_path
+        self.n_workers = n_workers or default_worker_count()
+        self.shard_size = shard_size
+        # spawn: aman dipakai dari proses Streamlit yang multi-thread
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_scoring_worker,
+            initargs=(model_path,)
+        )
+
+    def _shard_bounds(self, n_rows):
+        """Batas shard: default 4 shard per worker agar beban merata"""
+        size = self.shard_size or max(-(-n_rows // (self.n_workers * 4)), 1000)
+        return [(start, start + size) for start in range(0, max(n_rows, 1), size)]
+
+    def score(self, df, prodi_mapping, summary=None):
+        """Prediksi seluruh batch secara paralel, urutan baris dipertahankan
+
+        Agregat tiap shard dihitung di worker dan digabung ke summary (jika diberikan).
+        """
+        columns = [col for col in BATCH_INPUT_COLUMNS if col in df.columns]
+        data = df[columns]
+        mapping = dict(prodi_mapping)
+        shards = ((data.iloc[start:stop], mapping) for start, stop in self._shard_bounds(len(data)))
+        results = []
+        for shard_results, shard_summary in self._executor.map(_score_shard, shards):
+            results.append(shard_results)
+            if summary is not None:
+                summary.merge(shard_summary)
+        return concat_results(results)
+
+    def shutdown(self, cancel_futures=True):
+        """Hentikan seluruh proses worker
+
+        Dengan cancel_futures=False shard yang sudah diantre tetap diselesaikan
+        sebelum worker berhenti (scorer sedang dipakai sesi lain).
+        """
+        self._executor.shutdown(wait=False, cancel_futures=cancel_futures)
+
+
+class SharedBatchScorer:
+    """Satu ParallelBatchScorer aktif per proses server
+
+    Scorer dibuat ulang saat kunci (jumlah worker, versi/file model) berubah;
+    scorer lama dihentikan saat diganti sehingga tidak ada pool proses (yang
+    masing-masing memuat model) tertinggal.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._scorer = None
+
+    def get(self, model_path, n_workers, key):
+        with self._lock:
+            if self._scorer is None or key != self._key:
+                if self._scorer is not None:
+                    # Batch sesi lain yang sedang memakai scorer lama dibiarkan selesai
+                    self._scorer.shutdown(cancel_futures=False)
+                self._scorer = ParallelBatchScorer(model_path, n_workers=n_workers)
+                self._key = key
+            return self._scorer
+
+    def shutdown(self):
+        with self._lock:
+            if self._scorer is not None:
+                self._scorer.shutdown()
+                self._scorer = None
+                self._key = None
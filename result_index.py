@@ -0,0 +1,98 @@
+"""Indeks filter, urutan, dan halaman untuk hasil batch prediksi (DataFrame atau BatchResultStore)"""
+import numpy as np
+import pandas as pd
+
+# Status baris yang bisa difilter: hasil valid, per label prediksi, atau baris error
+STATUS_KEYS = ['valid', 'LULUS', 'TIDAK LULUS', 'error']
+
+
+class BatchResultIndex:
+    """Posisi baris per (status, Prodi) dan urutan per kolom, dibuat sekali per hasil batch
+
+    Filter dan halaman cukup memilih array posisi yang sudah ada lalu mengambil
+    baris satu halaman dengan iloc, tanpa menyalin atau memindai seluruh hasil.
+    Urutan kolom dihitung saat pertama diminta lalu disimpan. Untuk hasil
+    streaming (BatchResultStore) hanya kolom filter/urutan yang dibaca ke
+    memori; baris halaman diambil dari chunk di disk.
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.n_rows = len(results)
+
+        columns = self._read_columns(['Error', 'Prediksi', 'Prodi'])
+        error = columns['Error'].notna().to_numpy()
+        prediksi = columns['Prediksi'].to_numpy(dtype=object)
+        masks = {
+            'valid': ~error,
+            'LULUS': ~error & (prediksi == 'LULUS'),
+            'TIDAK LULUS': ~error & (prediksi == 'TIDAK LULUS'),
+            'error': error,
+        }
+
+        prodi_codes, prodi_values = pd.factorize(columns['Prodi'])
+        self._prodi_code = {value: code for code, value in enumerate(prodi_values)}
+        self._positions = {}
+        for status, mask in masks.items():
+            positions = np.flatnonzero(mask)
+            self._positions[status, None] = positions
+            # Sort stabil per kode prodi: posisi di setiap grup tetap urut naik
+            codes = prodi_codes[positions]
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(prodi_values) + 1))
+            for code in range(len(prodi_values)):
+                self._positions[status, code] = positions[order[bounds[code]:bounds[code + 1]]]
+
+        # Pilihan filter Prodi: prodi dari baris valid, urut kemunculan
+        valid_codes = prodi_codes[masks['valid']]
+        self.prodi_options = [prodi_values[code] for code in pd.unique(valid_codes[valid_codes >= 0])]
+        self._orders = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    def _read_columns(self, columns):
+        if isinstance(self.results, pd.DataFrame):
+            return self.results[columns]
+        return self.results.read_columns(columns)
+
+    def count(self, status, prodi=None):
+        return len(self.positions(status, prodi))
+
+    def positions(self, status, prodi=None):
+        """Posisi baris (urut naik) untuk status di STATUS_KEYS dan Prodi tertentu (None = semua)"""
+        if prodi is None:
+            return self._positions[status, None]
+        code = self._prodi_code.get(prodi)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return self._positions[status, code]
+
+    def _order(self, column, ascending):
+        """Urutan seluruh baris menurut kolom (stabil, nilai kosong di akhir seperti sort_values)"""
+        key = (column, ascending)
+        if key not in self._orders:
+            codes, _ = pd.factorize(self._read_columns([column])[column], sort=True)
+            codes = codes.astype(np.int64)
+            missing = codes < 0
+            if not ascending:
+                codes = codes.max(initial=0) - codes
+            codes[missing] = np.iinfo(np.int64).max
+            self._orders[key] = np.argsort(codes, kind='stable')
+        return self._orders[key]
+
+    def sorted_positions(self, positions, column=None, ascending=True):
+        """Posisi terpilih dalam urutan kolom; tanpa kolom urutan asli dipertahankan"""
+        if column is None:
+            return positions if ascending else positions[::-1]
+        order = self._order(column, ascending)
+        selected = np.zeros(self.n_rows, dtype=bool)
+        selected[positions] = True
+        return order[selected[order]]
+
+    def page(self, positions, page, page_size):
+        """Baris DataFrame untuk satu halaman (page mulai dari 1)"""
+        start = (page - 1) * page_size
+        if isinstance(self.results, pd.DataFrame):
+            return self.results.iloc[positions[start:start + page_size]]
+        return self.results.take(positions[start:start + page_size])
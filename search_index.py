@@ -0,0 +1,172 @@
+"""Indeks pencarian trigram untuk kotak "Cari berdasarkan Nama/NIM" di Kelola Excel
+
+Teks per baris (nama + NIM yang dinormalisasi) dipecah menjadi trigram dan
+disimpan sebagai posting list per trigram (array key terurut + array baris).
+Pencarian substring cukup mengiris posting list trigram query, mengambil
+irisannya, lalu memverifikasi kandidat; tidak ada pemindaian atau astype(str)
+atas seluruh kolom di setiap ketikan.
+"""
+import numpy as np
+import pandas as pd
+
+from user_directory import normalize_id, normalize_name
+
+# Teks lebih panjang dari ini tidak masuk array trigram (lebar array = teks terpanjang)
+# dan dicek langsung seperti baris yang diedit
+MAX_INDEXED_LENGTH = 64
+# Irisan posting list berhenti jika kandidat sudah sebanyak ini atau kurang
+MIN_INTERSECT_ROWS = 256
+# Pemisah nama dan NIM agar trigram tidak melintasi kedua kolom
+SEPARATOR = '\x1f'
+
+
+def search_text(nama=None, nim=None):
+    """Teks pencarian satu baris: nama dan NIM dinormalisasi (nilai kosong jadi '')"""
+    parts = []
+    for value, normalize in ((nama, normalize_name), (nim, normalize_id)):
+        parts.append('' if value is None or pd.isna(value) else normalize(value))
+    return SEPARATOR.join(parts)
+
+
+def search_texts(nama, nim):
+    """search_text untuk seluruh kolom sekaligus (Series, atau None untuk kolom yang tidak ada; minimal satu Series)"""
+    parts = []
+    for values, lower in ((nama, True), (nim, False)):
+        if values is None:
+            parts.append('')
+            continue
+        text = values.astype(str).str.strip()
+        if lower:
+            text = text.str.lower()
+        parts.append(text.where(values.notna(), ''))
+    return (parts[0] + SEPARATOR + parts[1]).tolist()
+
+
+def normalize_query(query):
+    """Query hanya dijadikan huruf kecil; spasi tetap ikut dicari seperti str.contains"""
+    return str(query).lower().replace(SEPARATOR, '')
+
+
+def _trigram_codes(codepoints):
+    """Kode int64 untuk setiap trigram dari array codepoint (..., panjang)"""
+    codepoints = codepoints.astype(np.int64)
+    return (codepoints[..., :-2] << 42) | (codepoints[..., 1:-1] << 21) | codepoints[..., 2:]
+
+
+class SearchIndex:
+    """Indeks trigram dengan ID baris tetap; baris bisa ditambah, diganti, dan dihapus
+
+    ID 0..n-1 adalah baris saat indeks dibuat. Baris baru mendapat ID lanjutan.
+    Baris yang diganti/ditambah setelah indeks dibuat (dan teks yang terlalu
+    panjang) disimpan di overlay kecil yang dicek langsung saat pencarian.
+    """
+
+    def __init__(self, texts):
+        self._texts = list(texts)
+        self._overlay = {}
+        self._removed = set()
+
+        indexed = []
+        for row_id, text in enumerate(self._texts):
+            if len(text) > MAX_INDEXED_LENGTH or '\x00' in text:
+                self._overlay[row_id] = text
+                indexed.append('')
+            else:
+                indexed.append(text)
+        # Teks terindeks sebagai Series string (Arrow di pandas 3) untuk verifikasi kandidat
+        self._series = pd.Series(indexed, dtype=str)
+        array = np.array(indexed or [''], dtype=str)
+        codepoints = array.view(np.uint32).reshape(len(array), -1)[:len(indexed)]
+        self._keys, self._starts, self._rows = self._build(codepoints)
+
+    @staticmethod
+    def _build(codepoints):
+        n_rows, width = codepoints.shape
+        if width < 3 or not n_rows:
+            return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32)
+        grams = _trigram_codes(codepoints)
+        # Trigram yang menyentuh padding (codepoint 0) di ujung teks bukan trigram asli
+        valid = codepoints[:, 2:] != 0
+        rows = np.broadcast_to(np.arange(n_rows, dtype=np.int32)[:, None], grams.shape)[valid]
+        grams = grams[valid]
+
+        # Urut per trigram; sort stabil menjaga baris tetap urut naik di setiap posting list
+        order = np.argsort(grams, kind='stable')
+        grams, rows = grams[order], rows[order]
+        keep = np.ones(len(grams), dtype=bool)
+        keep[1:] = (grams[1:] != grams[:-1]) | (rows[1:] != rows[:-1])
+        grams, rows = grams[keep], rows[keep]
+        starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]])
+        return grams[starts], np.append(starts, len(grams)), rows
+
+    def __len__(self):
+        return len(self._texts) - len(self._removed)
+
+    def add(self, texts):
+        """Tambah baris baru; mengembalikan array ID barunya"""
+        start = len(self._texts)
+        for text in texts:
+            self._overlay[len(self._texts)] = text
+            self._texts.append(text)
+        return np.arange(start, len(self._texts), dtype=np.int64)
+
+    def update(self, row_id, text):
+        """Ganti teks satu baris (mis. nama/NIM diedit)"""
+        self._texts[row_id] = text
+        self._overlay[row_id] = text
+
+    def remove(self, row_ids):
+        for row_id in row_ids:
+            self._removed.add(int(row_id))
+            self._overlay.pop(int(row_id), None)
+
+    def _postings(self, gram):
+        pos = np.searchsorted(self._keys, gram)
+        if pos == len(self._keys) or self._keys[pos] != gram:
+            return None
+        return self._rows[self._starts[pos]:self._starts[pos + 1]]
+
+    def _contains(self, rows, query):
+        """Baris terindeks (array posisi) yang teksnya mengandung query"""
+        texts = self._series if rows is None else self._series.iloc[rows]
+        found = texts.str.contains(query, regex=False).to_numpy(dtype=bool)
+        return np.flatnonzero(found) if rows is None else rows[found]
+
+    def _indexed_candidates(self, query):
+        grams = np.unique(_trigram_codes(np.array([ord(ch) for ch in query], dtype=np.int64)))
+        postings = []
+        for gram in grams:
+            rows = self._postings(gram)
+            if rows is None:
+                return np.empty(0, dtype=np.int64)
+            postings.append(rows)
+        # Irisan mulai dari posting list terpendek (lewat mask, tanpa sort); berhenti jika
+        # kandidat sudah sedikit karena sisanya tetap diverifikasi
+        postings.sort(key=len)
+        candidates = postings[0]
+        for rows in postings[1:]:
+            if len(candidates) <= MIN_INTERSECT_ROWS:
+                break
+            mask = np.zeros(len(self._series), dtype=bool)
+            mask[rows] = True
+            candidates = candidates[mask[candidates]]
+        return candidates
+
+    def search(self, query):
+        """ID baris (urut naik) yang teksnya mengandung query (substring, tanpa beda huruf besar/kecil)"""
+        query = normalize_query(query)
+        if not query:
+            ids = np.arange(len(self._texts), dtype=np.int64)
+            return ids[~np.isin(ids, list(self._removed))] if self._removed else ids
+
+        # Query pendek tidak punya trigram: semua baris terindeks jadi kandidat (None)
+        candidates = self._indexed_candidates(query) if len(query) >= 3 else None
+        # Trigram cocok belum tentu berurutan; kandidat diverifikasi dengan teks yang terindeks
+        matched = self._contains(candidates, query).astype(np.int64)
+        skip = self._removed | self._overlay.keys()
+        if skip:
+            matched = matched[~np.isin(matched, list(skip))]
+        extra = [row_id for row_id, text in self._overlay.items() if query in text]
+        if extra:
+            matched = np.sort(np.concatenate([matched, np.array(extra, dtype=np.int64)]))
+        return matched
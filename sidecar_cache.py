@@ -0,0 +1,152 @@
+"""Cache kolom (.npy) di samping file Excel agar tidak perlu parsing XLSX berulang
+
+Setiap sheet disimpan sebagai satu file .npy per kolom plus meta.json yang
+mencatat mtime, ukuran, dan hash sha256 file sumber. Load berikutnya
+memetakan file .npy ke memori (mmap) alih-alih membaca ulang XLSX dengan openpyxl.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+SIDECAR_DIR = '.sidecar_cache'
+SIDECAR_FORMAT_VERSION = 1
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hash sha256 isi file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sidecar_location(source_path, cache_dir=SIDECAR_DIR):
+    """Direktori sidecar untuk file sumber tertentu"""
+    name = os.path.basename(source_path)
+    # Hash path absolut agar file bernama sama di folder berbeda tidak bertabrakan
+    tag = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(cache_dir, f'{name}.{tag}')
+
+
+def _encode_column(series):
+    """Ubah satu kolom menjadi (jenis, array data, array mask atau None)"""
+    values = series.to_numpy()
+    if values.dtype.kind in 'biuf':
+        return 'numeric', np.ascontiguousarray(values), None
+    if values.dtype.kind == 'M':
+        return 'datetime', values.view('int64'), None
+
+    mask = series.isna().to_numpy()
+    non_null = values[~mask]
+    if all(isinstance(value, str) for value in non_null):
+        text = np.where(mask, '', values).astype(str)
+        return 'string', text, mask
+    # Kolom campuran (angka dan teks) disimpan apa adanya dengan pickle
+    return 'object', values.astype(object), None
+
+
+def write_sidecar(df, directory, source_meta):
+    """Tulis DataFrame sebagai sidecar kolom secara atomik"""
+    parent = os.path.dirname(directory) or '.'
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.tmp_', dir=parent)
+
+    try:
+        columns = []
+        for i, name in enumerate(df.columns):
+            kind, data, mask = _encode_column(df[name])
+            np.save(os.path.join(tmp_dir, f'{i}.npy'), data, allow_pickle=(kind == 'object'))
+            if mask is not None:
+                np.save(os.path.join(tmp_dir, f'{i}.mask.npy'), mask)
+            columns.append({'name': str(name), 'kind': kind, 'dtype': str(df[name].dtype)})
+
+        meta = dict(source_meta, format=SIDECAR_FORMAT_VERSION, rows=len(df), columns=columns)
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(tmp_dir, directory)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def read_sidecar_meta(directory):
+    """Baca meta.json sidecar, None jika belum ada atau formatnya lama"""
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('format') == SIDECAR_FORMAT_VERSION else None
+
+
+def read_sidecar(directory, meta=None):
+    """Muat DataFrame dari sidecar dengan memory-map file .npy"""
+    meta = meta or read_sidecar_meta(directory)
+    data = {}
+    for i, column in enumerate(meta['columns']):
+        path = os.path.join(directory, f'{i}.npy')
+        kind = column['kind']
+        if kind == 'numeric':
+            # mmap copy-on-write: tidak ada salinan saat load, edit tidak menyentuh file
+            data[column['name']] = np.load(path, mmap_mode='c')
+        elif kind == 'datetime':
+            data[column['name']] = np.load(path, mmap_mode='c').view(column['dtype'])
+        elif kind == 'string':
+            values = np.load(path, mmap_mode='r').astype(object)
+            values[np.load(os.path.join(directory, f'{i}.mask.npy'))] = None
+            data[column['name']] = pd.Series(values, dtype=column['dtype'])
+        else:
+            data[column['name']] = np.load(path, allow_pickle=True)
+
+    return pd.DataFrame(data, copy=False)
+
+
+def read_excel_cached(path, cache_dir=SIDECAR_DIR, **read_kwargs):
+    """Baca file Excel lewat sidecar kolom jika masih sesuai dengan file sumber
+
+    Sidecar dianggap valid bila mtime dan ukuran file sama, atau bila mtime
+    berubah tetapi hash isinya sama. Selain itu file diparsing ulang dengan
+    pd.read_excel dan sidecar diperbarui.
+    """
+    stat = os.stat(path)
+    directory = sidecar_location(path, cache_dir)
+    meta = read_sidecar_meta(directory)
+    options = json.dumps(read_kwargs, sort_keys=True, default=str)
+
+    if meta is not None and meta.get('options') == options:
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return read_sidecar(directory, meta)
+
+        digest = file_sha256(path)
+        if meta['sha256'] == digest:
+            # Isi sama (mis. file disalin ulang), cukup perbarui mtime di meta
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            with open(os.path.join(directory, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+            return read_sidecar(directory, meta)
+    else:
+        digest = file_sha256(path)
+
+    df = pd.read_excel(path, **read_kwargs)
+    source_meta = {
+        'source': os.path.abspath(path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+        'options': options,
+    }
+    try:
+        write_sidecar(df, directory, source_meta)
+    except OSError:
+        # Direktori cache tidak bisa ditulis: tetap kembalikan hasil parsing
+        pass
+    return df
@@ -0,0 +1,175 @@
+"""Inferensi RandomForest berbasis array node datar (tanpa stack sklearn)
+
+Seluruh pohon pada forest diekspor ke array NumPy datar (feature, threshold,
+child kiri/kanan, nilai leaf) lalu ditelusuri bersamaan untuk satu batch.
+Hasil probabilitas identik bit-per-bit dengan RandomForestClassifier.predict_proba.
+"""
+import numpy as np
+import pandas as pd
+
+
+class CompiledForest:
+    """RandomForest yang sudah dikompilasi ke array node untuk traversal vectorized
+
+    Antarmuka meniru estimator sklearn (predict, predict_proba, classes_,
+    feature_names_in_) sehingga bisa dipakai di tempat model aslinya.
+    """
+
+    block_size = 8192
+
+    def __init__(self, feature, threshold, left, right, missing_left, leaf_value,
+                 roots, max_depth, n_estimators, classes, feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_estimators = n_estimators
+        self.classes_ = classes
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Ekspor pohon-pohon RandomForestClassifier ke array node datar"""
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Hanya forest dengan satu output yang didukung")
+
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(offset, offset + n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Leaf menunjuk ke dirinya sendiri sehingga traversal cukup max_depth langkah
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            missing.append(
+                np.asarray(tree.missing_go_to_left, dtype=bool)
+                if hasattr(tree, 'missing_go_to_left') else np.zeros(n_nodes, dtype=bool)
+            )
+            values.append(_leaf_probabilities(tree.value[:, 0, :estimator.n_classes_]))
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            leaf_value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            n_estimators=len(model.estimators_),
+            classes=model.classes_,
+            feature_names=getattr(model, 'feature_names_in_', None)
+        )
+
+    def _as_matrix(self, X):
+        """Konversi input ke matriks float32 (sama seperti validasi sklearn)"""
+        if isinstance(X, pd.DataFrame) and hasattr(self, 'feature_names_in_') \
+                and list(X.columns) != list(self.feature_names_in_):
+            X = X[list(self.feature_names_in_)]
+        return np.atleast_2d(np.asarray(X, dtype=np.float32))
+
+    def apply(self, X):
+        """Indeks node leaf global untuk setiap pohon dan sampel, shape (n_trees, n_samples)"""
+        X = self._as_matrix(X)
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], n_samples, axis=1)
+        has_nan = np.isnan(X).any()
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.missing_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X):
+        """Probabilitas kelas, dijumlahkan berurutan per pohon seperti sklearn"""
+        X = self._as_matrix(X)
+        proba = np.empty((X.shape[0], self.leaf_value.shape[1]), dtype=np.float64)
+
+        # Diproses per blok baris agar array (n_trees, n_samples) tetap kecil
+        for start in range(0, X.shape[0], self.block_size):
+            stop = start + self.block_size
+            leaf_proba = self.leaf_value[self.apply(X[start:stop])]
+            # cumsum menjumlahkan pohon secara berurutan (bukan pairwise) agar hasil bit-exact
+            proba[start:stop] = np.cumsum(leaf_proba, axis=0)[-1]
+
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        """Label kelas dengan probabilitas tertinggi"""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def _leaf_probabilities(value):
+    """Nilai leaf sebagai probabilitas, mengikuti versi sklearn yang terpasang
+
+    sklearn >= 1.4 sudah menyimpan fraksi di tree_.value; versi lama menyimpan
+    jumlah sampel sehingga perlu dinormalisasi seperti predict_proba sklearn.
+    """
+    value = np.array(value, dtype=np.float64)
+    normalizer = value.sum(axis=1, keepdims=True)
+    if np.allclose(normalizer[normalizer > 0], 1.0):
+        return value
+    normalizer[normalizer == 0.0] = 1.0
+    return value / normalizer
+
+
+def make_probe_matrix(forest, n_random=2000, seed=0):
+    """Matriks uji yang mencakup nilai tepat di threshold dan nilai acak di sekitarnya"""
+    rng = np.random.default_rng(seed)
+    n_features = len(forest.feature_names_in_) if hasattr(forest, 'feature_names_in_') \
+        else int(forest.feature.max()) + 1
+    split_nodes = forest.left != np.arange(len(forest.left))
+
+    probe = np.zeros((n_random, n_features), dtype=np.float32)
+    exact_rows = []
+    for f in range(n_features):
+        thr = forest.threshold[split_nodes & (forest.feature == f)]
+        if len(thr) == 0:
+            continue
+        low, high = thr.min() - 1.0, thr.max() + 1.0
+        probe[:, f] = rng.uniform(low, high, size=n_random)
+        exact_rows.append((f, thr.astype(np.float32)))
+
+    # Baris dengan satu fitur tepat di threshold (kasus batas <=)
+    extras = []
+    for f, thr in exact_rows:
+        rows = probe[rng.integers(0, n_random, size=len(thr))].copy()
+        rows[:, f] = thr
+        extras.append(rows)
+    return np.vstack([probe] + extras) if extras else probe
+
+
+def compile_forest(model, verify=True):
+    """Kompilasi model sklearn dan pastikan probabilitasnya bit-exact
+
+    Raise ValueError jika hasil berbeda dari model.predict_proba.
+    """
+    forest = CompiledForest.from_sklearn(model)
+    if verify:
+        probe = make_probe_matrix(forest)
+        expected = model.predict_proba(pd.DataFrame(probe, columns=forest.feature_names_in_)
+                                       if hasattr(forest, 'feature_names_in_') else probe)
+        if not np.array_equal(forest.predict_proba(probe), expected):
+            raise ValueError("Hasil CompiledForest tidak identik dengan sklearn predict_proba")
+    return forest
@@ -0,0 +1,122 @@
+"""Cache DataFrame hasil parsing file upload berdasarkan hash isi file (sekali per upload)"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_digest(file):
+    """Hash sha256 isi file upload (UploadedFile/BytesIO/path)"""
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            data = f.read()
+    elif hasattr(file, 'getvalue'):
+        data = file.getvalue()
+    else:
+        file.seek(0)
+        data = file.read()
+        file.seek(0)
+    return hashlib.sha256(data).hexdigest()
+
+
+def upload_identity(file):
+    """(file_id, ukuran) UploadedFile Streamlit; None untuk file tanpa file_id (path/BytesIO)
+
+    file_id dibuat baru untuk setiap upload, jadi identitas yang sama berarti isi yang sama.
+    """
+    file_id = getattr(file, 'file_id', None)
+    if file_id is None:
+        return None
+    return file_id, getattr(file, 'size', None)
+
+
+def frame_nbytes(df):
+    """Perkiraan memori DataFrame termasuk isi string"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class UploadCache:
+    """Cache LRU DataFrame upload, dipakai bersama antar rerun dan antar pengguna
+
+    Kunci berupa hash isi file ditambah kunci pembaca (format/schema), sehingga
+    file yang sama dengan nama berbeda tetap terbaca dari cache. Hash disimpan per
+    file_id upload sehingga rerun dengan upload yang sama tidak meng-hash ulang isi
+    file. DataFrame yang dikembalikan dibagikan: pemanggil tidak boleh mengubahnya
+    di tempat.
+    """
+
+    def __init__(self, max_entries=8, max_bytes=512 * 2**20, max_digests=256):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_digests = max_digests
+        self._entries = OrderedDict()
+        self._digests = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.parses_avoided = 0
+        self.evictions = 0
+        self.digests = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def digest(self, file):
+        """Hash isi file; untuk UploadedFile hanya dihitung saat file_id/ukuran baru"""
+        identity = upload_identity(file)
+        if identity is not None:
+            with self._lock:
+                digest = self._digests.get(identity)
+                if digest is not None:
+                    self._digests.move_to_end(identity)
+                    return digest
+
+        digest = content_digest(file)
+        with self._lock:
+            self.digests += 1
+            if identity is not None:
+                self._digests[identity] = digest
+                while len(self._digests) > self.max_digests:
+                    self._digests.popitem(last=False)
+        return digest
+
+    def get_or_parse(self, file, parse, reader_key=None):
+        """DataFrame dari cache atau hasil parse(file); mengembalikan (df, dari_cache)"""
+        key = (self.digest(file), reader_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.parses_avoided += 1
+                return entry[0], True
+
+        # Parsing di luar lock agar upload lain tidak ikut menunggu
+        df = parse(file)
+        nbytes = frame_nbytes(df)
+        with self._lock:
+            self.parses += 1
+            if nbytes <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (df, nbytes)
+                self._bytes += nbytes
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_bytes
+                    self.evictions += 1
+        return df, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counter cache untuk ditampilkan di UI"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'parses': self.parses,
+                'parses_avoided': self.parses_avoided,
+                'evictions': self.evictions,
+                'digests': self.digests,
+            }
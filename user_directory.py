@@ -0,0 +1,62 @@
+"""Indeks data pengguna untuk login dan pencarian data mahasiswa"""
+import os
+
+
+def file_version(path):
+    """Versi file (mtime, ukuran) sebagai kunci cache; None jika file tidak ada"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def normalize_name(nama):
+    """Normalisasi nama untuk pencocokan login"""
+    return str(nama).strip().lower()
+
+
+def normalize_id(id_user):
+    """Normalisasi NIM/NIDN/Kode Prodi untuk pencocokan login"""
+    return str(id_user).strip()
+
+
+class UserDirectory:
+    """Indeks pengguna berdasarkan (nama, ID) dan berdasarkan ID saja
+
+    Dibangun sekali per versi tabel pengguna (file login atau tabel database)
+    sehingga login dan pencarian data mahasiswa tidak lagi memindai seluruh
+    DataFrame atau database di setiap rerun. Satu instance dipakai
+    bersama oleh semua sesi, jadi df diperlakukan read-only; lookup mengembalikan
+    dict baru per pemanggilan.
+    """
+
+    def __init__(self, df, id_column):
+        self.df = df
+        self.id_column = id_column
+        self.by_name_id = {}
+        self.by_id = {}
+
+        if "Nama Lengkap" not in df.columns or id_column not in df.columns:
+            return
+
+        # Sama seperti pencarian lama: ID dibandingkan sebagai string (astype(str))
+        ids = df[id_column].astype(str).tolist()
+        for pos, (nama, id_value) in enumerate(zip(df["Nama Lengkap"].tolist(), ids)):
+            self.by_id.setdefault(id_value, pos)
+            if isinstance(nama, str):
+                self.by_name_id.setdefault((normalize_name(nama), id_value), pos)
+
+    def __len__(self):
+        return len(self.df)
+
+    def _record(self, pos):
+        return None if pos is None else self.df.iloc[pos].to_dict()
+
+    def lookup(self, nama, id_user):
+        """Data pengguna (dict) yang cocok dengan nama dan ID, atau None"""
+        return self._record(self.by_name_id.get((normalize_name(nama), normalize_id(id_user))))
+
+    def get_by_id(self, id_user):
+        """Data pengguna (dict) berdasarkan ID saja, atau None"""
+        return self._record(self.by_id.get(normalize_id(id_user)))